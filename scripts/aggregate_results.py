@@ -1,128 +1,190 @@
 #!/usr/bin/env python3
 """
-Aggregate benchmark result JSONs into a single CSV.
+Aggregate benchmark result JSONs into a single CSV, or into a Parquet dataset.
 
 By default scans /mnt/nfs/home/hmngo/work1/hmngo/vdb_results but you can override with:
   python scripts/aggregate_results.py --root /path/to/results --output combined.csv
 
-Each row includes db, task_label, concurrency level, and all metrics for that concurrency.
+CSV: each row includes db, task_label, concurrency level, and all metrics for that concurrency.
 One row is emitted per (config, concurrency) pair.
+
+Parquet: when --output ends with .parquet or --format parquet is given, the output is a directory of
+part files, one row per case result with typed columns for all metrics, including the per-concurrency
+and streaming stage lists. Files are parsed in parallel and written chunk by chunk, and re-running
+only appends the result files that are not in the dataset yet. A dataset keeps the --db and --case-id
+filters it was built with, appending with other filters needs --rebuild. Query it with e.g.
+  polars.scan_parquet("all_results.parquet/*.parquet")
+
+Both formats can be filtered by --db, --case-id and the date in the file name (--since/--until).
 """
 
 import argparse
 import csv
 import json
-from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
 from pathlib import Path
 
+import polars as pl
+
+MANIFEST = "_files.json"
+
+CSV_FIELDS = [
+    "db",
+    "task_label",
+    "concurrency",
+    "qps",
+    "latency_p99",
+    "latency_p95",
+    "latency_p90",
+    "latency_avg",
+    "recall",
+    # Also include load/build times (same for all concurrencies within a config)
+    "load_duration",
+    "insert_duration",
+    "optimize_duration",
+    # Serial search metrics (for reference)
+    "serial_latency_p99",
+    "serial_latency_p95",
+    "serial_recall",
+]
+
+CASE_SCHEMA = {
+    "file": pl.Utf8,
+    "date": pl.Utf8,
+    "run_id": pl.Utf8,
+    "task_label": pl.Utf8,
+    "db": pl.Utf8,
+    "db_label": pl.Utf8,
+    "index": pl.Utf8,
+    "case_id": pl.Int64,
+    "label": pl.Utf8,
+    "k": pl.Int64,
+    "db_config": pl.Utf8,  # json
+    "db_case_config": pl.Utf8,  # json
+    "custom_case": pl.Utf8,  # json
+}
+
+POLARS_TYPES = {
+    int: pl.Int64,
+    float: pl.Float64,
+    str: pl.Utf8,
+    list[int]: pl.List(pl.Int64),
+    list[float]: pl.List(pl.Float64),
+    list[list[int]]: pl.List(pl.List(pl.Int64)),
+    list[list[float]]: pl.List(pl.List(pl.Float64)),
+}
+
+
+def metric_schema() -> dict:
+    """typed columns of all the metrics, inferred from the data if vectordb_bench isn't installed"""
+    try:
+        from vectordb_bench.metric import Metric
+    except ImportError:
+        print("vectordb_bench is not importable, metric column types are inferred from the data")
+        return {}
+    return {f.name: POLARS_TYPES[f.type] for f in fields(Metric) if f.type in POLARS_TYPES}
+
 
 def parse_args():
-    p = argparse.ArgumentParser(description="Aggregate VectorDBBench JSON results into a CSV.")
+    p = argparse.ArgumentParser(description="Aggregate VectorDBBench JSON results into a CSV or Parquet dataset.")
     p.add_argument("--root", default="/mnt/nfs/home/hmngo/work1/hmngo/vdb_results", help="Root directory of result JSONs")
-    p.add_argument("--output", default="all_results.csv", help="Output CSV path")
+    p.add_argument("--output", default="all_results.csv", help="Output CSV path, or Parquet dataset directory")
+    p.add_argument("--format", choices=["csv", "parquet"], help="Output format, by default from the output suffix")
+    p.add_argument("--db", action="append", default=[], help="Only include these DBs, case-insensitive, repeatable")
+    p.add_argument("--case-id", action="append", type=int, default=[], help="Only include these case ids, repeatable")
+    p.add_argument("--since", help="Only include result files dated on or after YYYYMMDD")
+    p.add_argument("--until", help="Only include result files dated on or before YYYYMMDD")
+    p.add_argument("--workers", type=int, default=8, help="Processes parsing the result files")
+    p.add_argument("--chunk-size", type=int, default=1000, help="Result files per Parquet part file")
+    p.add_argument("--rebuild", action="store_true", help="Rewrite the Parquet dataset instead of appending")
     return p.parse_args()
 
 
 def parse_file_path(path: Path):
-    name = path.stem  # result_20251118_qdrant-k8s-benchmark_qdrantlocal
-    parts = name.split("_", 2)
-    task_label = parts[1] if len(parts) > 1 else ""
-    db = parts[2] if len(parts) > 2 else path.parent.name
+    name = path.stem  # result_20251118_qdrant-k8s-benchmark_qdrantlocal, the task label may contain "_"
+    parts = name.split("_")
+    task_label = "_".join(parts[2:-1])
+    db = parts[-1] if len(parts) > 2 else path.parent.name
     return task_label, db
 
 
-def main():
-    args = parse_args()
-    root = Path(args.root)
-    files = glob(str(root / "**" / "result_*.json"), recursive=True)
-    if not files:
-        print(f"No result_*.json files found under {root}")
-        return
+def file_date(path: Path) -> str:
+    parts = path.stem.split("_")
+    return parts[1] if len(parts) > 1 else ""
+
+
+def select_files(root: Path, args) -> list[Path]:
+    files = sorted(root.rglob("result_*.json"))
+    if args.since:
+        files = [f for f in files if file_date(f) >= args.since]
+    if args.until:
+        files = [f for f in files if file_date(f) <= args.until]
+    return files
+
+
+def keep_result(res: dict, file_db: str, args) -> bool:
+    task_config = res.get("task_config") or {}
+    if args.db:
+        dbs = {d.lower() for d in args.db}
+        if str(task_config.get("db", "")).lower() not in dbs and file_db.lower() not in dbs:
+            return False
+    if args.case_id:
+        case_id = (task_config.get("case_config") or {}).get("case_id")
+        if case_id not in args.case_id:
+            return False
+    return True
 
-    fields = [
-        "db",
-        "task_label",
-        "concurrency",
-        "qps",
-        "latency_p99",
-        "latency_p95",
-        "latency_p90",
-        "latency_avg",
-        "recall",
-        # Also include load/build times (same for all concurrencies within a config)
-        "load_duration",
-        "insert_duration",
-        "optimize_duration",
-        # Serial search metrics (for reference)
-        "serial_latency_p99",
-        "serial_latency_p95",
-        "serial_recall",
-    ]
 
+def load_results(path: Path) -> tuple[dict, list[dict]]:
+    try:
+        with path.open() as fh:
+            data = json.load(fh)
+    except Exception as e:
+        print(f"Skip {path}: {e}")
+        return {}, []
+    return data, data.get("results") or []
+
+
+def csv_rows(path: Path, args) -> list[dict]:
+    task_label, db = parse_file_path(path)
+    _, results = load_results(path)
     rows = []
-    for f in files:
-        path = Path(f)
-        task_label, db = parse_file_path(path)
-        try:
-            with path.open() as fh:
-                data = json.load(fh)
-        except Exception as e:
-            print(f"Skip {path}: {e}")
+    for res in results:
+        if not keep_result(res, db, args):
             continue
-        results = data.get("results") or []
-        for res in results:
-            metrics = res.get("metrics", {})
-
-            # Get per-concurrency lists
-            conc_num_list = metrics.get("conc_num_list", [])
-            conc_qps_list = metrics.get("conc_qps_list", [])
-            conc_latency_p99_list = metrics.get("conc_latency_p99_list", [])
-            conc_latency_p95_list = metrics.get("conc_latency_p95_list", [])
-            conc_latency_p90_list = metrics.get("conc_latency_p90_list", [])
-            conc_latency_avg_list = metrics.get("conc_latency_avg_list", [])
-            conc_recall_list = metrics.get("conc_recall_list", [])
-
-            # Common fields (same for all concurrencies in this config)
-            load_duration = metrics.get("load_duration") or metrics.get("load_dur")
-            insert_duration = metrics.get("insert_duration")
-            optimize_duration = metrics.get("optimize_duration")
-            serial_latency_p99 = metrics.get("serial_latency_p99") or metrics.get("latency_p99")
-            serial_latency_p95 = metrics.get("serial_latency_p95") or metrics.get("latency_p95")
-            serial_recall = metrics.get("recall")
-
-            # Emit one row per concurrency level
-            if conc_num_list:
-                for i, conc in enumerate(conc_num_list):
-                    row = {
-                        "db": db,
-                        "task_label": task_label,
-                        "concurrency": conc,
-                        "qps": conc_qps_list[i] if i < len(conc_qps_list) else None,
-                        "latency_p99": conc_latency_p99_list[i] if i < len(conc_latency_p99_list) else None,
-                        "latency_p95": conc_latency_p95_list[i] if i < len(conc_latency_p95_list) else None,
-                        "latency_p90": conc_latency_p90_list[i] if i < len(conc_latency_p90_list) else None,
-                        "latency_avg": conc_latency_avg_list[i] if i < len(conc_latency_avg_list) else None,
-                        "recall": conc_recall_list[i] if i < len(conc_recall_list) else None,
-                        "load_duration": load_duration,
-                        "insert_duration": insert_duration,
-                        "optimize_duration": optimize_duration,
-                        "serial_latency_p99": serial_latency_p99,
-                        "serial_latency_p95": serial_latency_p95,
-                        "serial_recall": serial_recall,
-                    }
-                    rows.append(row)
-            else:
-                # Fallback: no concurrency data, emit single row with summary
+        metrics = res.get("metrics", {})
+
+        # Get per-concurrency lists
+        conc_num_list = metrics.get("conc_num_list", [])
+        conc_qps_list = metrics.get("conc_qps_list", [])
+        conc_latency_p99_list = metrics.get("conc_latency_p99_list", [])
+        conc_latency_p95_list = metrics.get("conc_latency_p95_list", [])
+        conc_latency_p90_list = metrics.get("conc_latency_p90_list", [])
+        conc_latency_avg_list = metrics.get("conc_latency_avg_list", [])
+        conc_recall_list = metrics.get("conc_recall_list", [])
+
+        # Common fields (same for all concurrencies in this config)
+        load_duration = metrics.get("load_duration") or metrics.get("load_dur")
+        insert_duration = metrics.get("insert_duration")
+        optimize_duration = metrics.get("optimize_duration")
+        serial_latency_p99 = metrics.get("serial_latency_p99") or metrics.get("latency_p99")
+        serial_latency_p95 = metrics.get("serial_latency_p95") or metrics.get("latency_p95")
+        serial_recall = metrics.get("recall")
+
+        # Emit one row per concurrency level
+        if conc_num_list:
+            for i, conc in enumerate(conc_num_list):
                 row = {
                     "db": db,
                     "task_label": task_label,
-                    "concurrency": None,
-                    "qps": metrics.get("qps"),
-                    "latency_p99": serial_latency_p99,
-                    "latency_p95": serial_latency_p95,
-                    "latency_p90": None,
-                    "latency_avg": None,
-                    "recall": serial_recall,
+                    "concurrency": conc,
+                    "qps": conc_qps_list[i] if i < len(conc_qps_list) else None,
+                    "latency_p99": conc_latency_p99_list[i] if i < len(conc_latency_p99_list) else None,
+                    "latency_p95": conc_latency_p95_list[i] if i < len(conc_latency_p95_list) else None,
+                    "latency_p90": conc_latency_p90_list[i] if i < len(conc_latency_p90_list) else None,
+                    "latency_avg": conc_latency_avg_list[i] if i < len(conc_latency_avg_list) else None,
+                    "recall": conc_recall_list[i] if i < len(conc_recall_list) else None,
                     "load_duration": load_duration,
                     "insert_duration": insert_duration,
                     "optimize_duration": optimize_duration,
@@ -131,13 +193,147 @@ def main():
                     "serial_recall": serial_recall,
                 }
                 rows.append(row)
+        else:
+            # Fallback: no concurrency data, emit single row with summary
+            row = {
+                "db": db,
+                "task_label": task_label,
+                "concurrency": None,
+                "qps": metrics.get("qps"),
+                "latency_p99": serial_latency_p99,
+                "latency_p95": serial_latency_p95,
+                "latency_p90": None,
+                "latency_avg": None,
+                "recall": serial_recall,
+                "load_duration": load_duration,
+                "insert_duration": insert_duration,
+                "optimize_duration": optimize_duration,
+                "serial_latency_p99": serial_latency_p99,
+                "serial_latency_p95": serial_latency_p95,
+                "serial_recall": serial_recall,
+            }
+            rows.append(row)
+    return rows
+
 
-    with open(args.output, "w", newline="") as out:
-        writer = csv.DictWriter(out, fieldnames=fields)
+def case_rows(path: Path, args) -> list[dict]:
+    """one row per case result, metrics keep the units of the result files"""
+    _, file_db = parse_file_path(path)
+    data, results = load_results(path)
+    rows = []
+    for res in results:
+        if not keep_result(res, file_db, args):
+            continue
+        task_config = res.get("task_config") or {}
+        db_config = task_config.get("db_config") or {}
+        db_case_config = task_config.get("db_case_config") or {}
+        case_config = task_config.get("case_config") or {}
+        rows.append(
+            {
+                "file": str(path),
+                "date": file_date(path),
+                "run_id": data.get("run_id"),
+                "task_label": data.get("task_label", data.get("run_id")),
+                "db": task_config.get("db", file_db),
+                "db_label": db_config.get("db_label"),
+                "index": db_case_config.get("index"),
+                "case_id": case_config.get("case_id"),
+                "label": res.get("label"),
+                "k": case_config.get("k"),
+                "db_config": json.dumps(db_config, sort_keys=True),
+                "db_case_config": json.dumps(db_case_config, sort_keys=True),
+                "custom_case": json.dumps(case_config.get("custom_case"), sort_keys=True),
+                **(res.get("metrics") or {}),
+            }
+        )
+    return rows
+
+
+def write_csv(files: list[Path], args):
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, open(args.output, "w", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
         writer.writeheader()
-        writer.writerows(rows)
+        for rows in executor.map(csv_rows, files, [args] * len(files), chunksize=16):
+            writer.writerows(rows)
+            total += len(rows)
+
+    print(f"Wrote {total} rows to {args.output}")
+
+
+def to_frame(rows: list[dict], schema: dict) -> pl.DataFrame:
+    if not schema:
+        return pl.DataFrame(rows, infer_schema_length=None)
+    full_schema = {**CASE_SCHEMA, **schema}
+    return pl.DataFrame([{k: r.get(k) for k in full_schema} for r in rows], schema=full_schema)
+
+
+def row_filters(args) -> dict:
+    """the filters deciding which rows of a result file are written, the dataset only holds one set of them"""
+    return {"db": sorted({d.lower() for d in args.db}), "case_id": sorted(set(args.case_id))}
+
+
+def write_parquet(files: list[Path], args):
+    out_dir = Path(args.output)
+    manifest_path = out_dir / MANIFEST
+    if args.rebuild and out_dir.exists():
+        for part in out_dir.glob("part-*.parquet"):
+            part.unlink()
+        manifest_path.unlink(missing_ok=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # the files whose rows passing the filters are all in the dataset, by their mtime
+    filters = row_filters(args)
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {"filters": filters, "files": {}}
+    if manifest["filters"] != filters:
+        msg = (
+            f"{out_dir} holds the rows of filters {manifest['filters']}, not {filters}. "
+            "Use the same --db and --case-id, or --rebuild"
+        )
+        raise SystemExit(msg)
+    appended = manifest["files"]
+    changed = [f for f in files if str(f) in appended and appended[str(f)] != f.stat().st_mtime]
+    if changed:
+        print(f"{len(changed)} result files changed since they were appended, use --rebuild to update them")
+    new_files = [f for f in files if str(f) not in appended]
+    if not new_files:
+        print(f"No new result files under {args.root}")
+        return
+
+    schema = metric_schema()
+    next_part = len(list(out_dir.glob("part-*.parquet")))
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for start in range(0, len(new_files), args.chunk_size):
+            chunk = new_files[start : start + args.chunk_size]
+            rows = [r for rs in executor.map(case_rows, chunk, [args] * len(chunk), chunksize=16) for r in rs]
+            if rows:
+                part = out_dir / f"part-{next_part:05d}.parquet"
+                to_frame(rows, schema).write_parquet(part)
+                next_part += 1
+                total += len(rows)
+
+            # record the chunk only once its part is written, so an interrupted run appends it again
+            appended.update({str(f): f.stat().st_mtime for f in chunk})
+            manifest_path.write_text(json.dumps(manifest))
+            print(f"Appended {start + len(chunk)}/{len(new_files)} files")
+
+    print(f"Wrote {total} rows of {len(new_files)} new files to {out_dir}")
+
+
+def main():
+    args = parse_args()
+    root = Path(args.root)
+    files = select_files(root, args)
+    if not files:
+        print(f"No result_*.json files found under {root}")
+        return
 
-    print(f"Wrote {len(rows)} rows to {args.output}")
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    if fmt == "parquet":
+        write_parquet(files, args)
+    else:
+        write_csv(files, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Client CPU per query of the Milvus searches the way the client used to send them, `Collection.search` with the
+search params rebuilt per query and the ids read off the Hits, against the IdSearch of
+vectordb_bench.backend.clients.milvus.search, which only swaps the vector of a prepared request and copies the ids:
+  python scripts/bench_milvus_search_decode.py --dim 768 --k 100
+  python scripts/bench_milvus_search_decode.py --uri http://localhost:19530 --collection VDBBench
+
+Without --uri no server is needed: the requests are prepared and a response of k hits is decoded, without sending.
+With --uri both search a loaded collection of --dim vectors, the CPU time of the process is counted.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pymilvus import Collection, connections
+from pymilvus.client.prepare import Prepare
+from pymilvus.client.search_result import SearchResult
+from pymilvus.grpc_gen import schema_pb2
+
+from vectordb_bench.backend.clients.api import MetricType
+from vectordb_bench.backend.clients.milvus.config import HNSWConfig
+from vectordb_bench.backend.clients.milvus.search import IdSearch, decode_ids
+
+COLLECTION = "VDBBench"
+VECTOR_FIELD = "vector"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark the client side of Milvus searches.")
+    p.add_argument("--uri", default=None, help="Search this server, instead of only encoding and decoding")
+    p.add_argument("--collection", default=COLLECTION)
+    p.add_argument("--dim", type=int, default=768)
+    p.add_argument("--k", type=int, default=100)
+    p.add_argument("--queries", type=int, default=10_000)
+    p.add_argument("--expr", default="", help="Filter of the searches, like 'id >= 1000'")
+    return p.parse_args()
+
+
+def response(k: int) -> schema_pb2.SearchResultData:
+    """what the server returns for one query of top k, without output fields"""
+    results = schema_pb2.SearchResultData(num_queries=1, top_k=k, topks=[k], primary_field_name="pk")
+    results.scores.extend(np.sort(np.random.default_rng(0).random(k)).tolist())
+    results.ids.int_id.data.extend(range(k))
+    return results
+
+
+def offline(args, case_config: HNSWConfig):
+    results = response(args.k)
+
+    def sdk(query: list[float]) -> list[int]:
+        Prepare.search_requests_with_expr(
+            collection_name=args.collection,
+            anns_field=VECTOR_FIELD,
+            param=case_config.search_param(),
+            limit=args.k,
+            data=[query],
+            expr=args.expr,
+            guarantee_timestamp=1,
+        )
+        return [hit.id for hit in SearchResult(results)[0]]
+
+    id_search = IdSearch(args.collection, VECTOR_FIELD, case_config.search_param(), args.expr)
+
+    def ids(query: list[float]) -> list[int]:
+        id_search.request(query, args.k)
+        return decode_ids(results)
+
+    return {"Collection.search": sdk, "IdSearch": ids}
+
+
+def online(args, case_config: HNSWConfig):
+    connections.connect(uri=args.uri)
+    col = Collection(args.collection)
+    id_search = IdSearch(args.collection, VECTOR_FIELD, case_config.search_param(), args.expr)
+
+    def sdk(query: list[float]) -> list[int]:
+        res = col.search(
+            data=[query],
+            anns_field=VECTOR_FIELD,
+            param=case_config.search_param(),
+            limit=args.k,
+            expr=args.expr,
+        )
+        return [hit.id for hit in res[0]]
+
+    return {"Collection.search": sdk, "IdSearch": lambda query: id_search(query, args.k)}
+
+
+def main():
+    args = parse_args()
+    case_config = HNSWConfig(M=16, efConstruction=128, ef=args.k, metric_type=MetricType.COSINE)
+    # like the clients, which get the queries as lists of floats
+    queries = np.random.default_rng(0).standard_normal((args.queries, args.dim)).tolist()
+    modes = offline(args, case_config) if args.uri is None else online(args, case_config)
+
+    for name, search in modes.items():
+        search(queries[0])  # warm up, and prepare the requests of IdSearch
+        cpu, wall = time.process_time(), time.perf_counter()
+        for query in queries:
+            search(query)
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+        print(
+            f"{name:18} {args.queries} queries of top {args.k}, dim {args.dim}: "
+            f"{cpu / args.queries * 1e6:,.1f}us CPU per query, {wall / args.queries * 1e6:,.1f}us wall"
+        )
+
+
+if __name__ == "__main__":
+    main()
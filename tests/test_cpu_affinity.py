@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from vectordb_bench.backend.cpu_affinity import (
+    CPUPinning,
+    available_cpus,
+    parse_cpu_list,
+    plan_affinity,
+    split_cpus,
+)
+
+
+class TestCPUAffinity:
+    @pytest.mark.parametrize(
+        "cpu_list, expected",
+        [
+            ("", []),
+            ("3", [3]),
+            ("0-3", [0, 1, 2, 3]),
+            ("0-1,8,10-11\n", [0, 1, 8, 10, 11]),
+        ],
+    )
+    def test_parse_cpu_list(self, cpu_list, expected):
+        assert parse_cpu_list(cpu_list) == expected
+
+    def test_no_pinning(self):
+        assert plan_affinity(3, CPUPinning.NONE) == [[], [], []]
+
+    def test_round_robin(self):
+        cpus = available_cpus()
+        layout = plan_affinity(len(cpus) + 1, CPUPinning.ROUND_ROBIN)
+        assert [c[0] for c in layout] == [*cpus, cpus[0]]
+
+    @pytest.mark.skipif(len(available_cpus()) < 2, reason="needs 2 cpus")
+    def test_reserved(self):
+        reserved = available_cpus()[:1]
+        for pinning in (CPUPinning.ROUND_ROBIN, CPUPinning.NUMA):
+            layout = plan_affinity(4, pinning, reserved)
+            assert all(cpus and reserved[0] not in cpus for cpus in layout)
+
+    def test_all_reserved(self):
+        with pytest.raises(ValueError):
+            plan_affinity(1, CPUPinning.ROUND_ROBIN, available_cpus())
+
+    def test_split_cpus(self):
+        cpus = available_cpus()
+        slices = split_cpus(2)
+        assert all(len(s) == max(1, len(cpus) // 2) for s in slices)
+        if len(cpus) >= 2:
+            assert not set(slices[0]) & set(slices[1])
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="linux only")
+    def test_numa_within_affinity(self):
+        allowed = set(available_cpus())
+        for cpus in plan_affinity(4, CPUPinning.NUMA):
+            assert set(cpus) <= allowed
@@ -0,0 +1,128 @@
+import logging
+import socket
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from vectordb_bench.backend.runner import (
+    DistributedSearchCoordinator,
+    MultiProcessingSearchRunner,
+    distributed_runner,
+    serve_agent,
+)
+from vectordb_bench.backend.runner.distributed_runner import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+TOKEN = "test-token"  # noqa: S105
+
+
+class SleepDB:
+    """picklable fake VectorDB, every search takes 2ms"""
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def prepare_filter(self, filters):
+        pass
+
+    def search_embedding(self, query, k=100):
+        time.sleep(0.002)
+        return list(range(k))
+
+
+def prepare(payload: dict) -> MultiProcessingSearchRunner:
+    test_data = np.random.random((10, 4)).tolist()
+    return MultiProcessingSearchRunner(SleepDB(), test_data, [list(range(10))] * 10, k=payload["k"])
+
+
+class TestDistributedRunner:
+    def test_histogram(self):
+        latencies = np.random.default_rng(0).uniform(0.001, 0.1, 10_000)
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.add(latencies[:4000])
+        b.add(latencies[4000:])
+        a.merge(LatencyHistogram.from_dict(b.to_dict()))
+
+        assert a.count == len(latencies)
+        assert abs(a.mean() - latencies.mean()) < 1e-9
+        for p in (50, 90, 99):
+            expected = np.percentile(latencies, p)
+            assert expected <= a.percentile(p) <= expected * 1.03
+
+    def test_loopback_agents(self):
+        coordinator = DistributedSearchCoordinator(
+            payload={"k": 10},
+            num_agents=2,
+            concurrencies=[1, 3],
+            duration=1,
+            bind="127.0.0.1:0",
+            token=TOKEN,
+            concurrency_timeout=60,
+        )
+        _, port = coordinator.listen()
+        agents = [
+            threading.Thread(
+                target=serve_agent,
+                args=(f"127.0.0.1:{port}",),
+                kwargs={"prepare": prepare, "token": TOKEN},
+            )
+            for _ in range(2)
+        ]
+        for t in agents:
+            t.start()
+
+        first_qps, *_ = coordinator.run(keep_agents=True)
+        assert first_qps > 0
+        assert all(t.is_alive() for t in agents)
+
+        max_qps, conc_num_list, conc_qps_list, p99_list, *_, recall_list = coordinator.run()
+        for t in agents:
+            t.join(timeout=30)
+
+        log.info(f"distributed search: qps={conc_qps_list}, p99={p99_list}")
+        assert conc_num_list == [1, 3]
+        assert max_qps == max(conc_qps_list) > 0
+        assert all(p99 >= 0.002 for p99 in p99_list)
+        assert recall_list == [1.0, 1.0]
+        assert not any(t.is_alive() for t in agents)
+
+    def test_token_required(self):
+        with pytest.raises(ValueError, match="DISTRIBUTED_TOKEN"):
+            DistributedSearchCoordinator(payload={"k": 10}, num_agents=1, bind="127.0.0.1:0", token="")
+
+    def test_bad_connections(self, monkeypatch):
+        monkeypatch.setattr(distributed_runner, "HANDSHAKE_TIMEOUT", 0.5)
+        coordinator = DistributedSearchCoordinator(
+            payload={"k": 10},
+            num_agents=1,
+            concurrencies=[1],
+            duration=1,
+            bind="127.0.0.1:0",
+            token=TOKEN,
+            concurrency_timeout=60,
+        )
+        _, port = coordinator.listen()
+        # a silent client, a huge length prefix and garbage, before the agent
+        silent = socket.create_connection(("127.0.0.1", port))
+        huge = socket.create_connection(("127.0.0.1", port))
+        huge.sendall(struct.pack(">I", 2**31))
+        garbage = socket.create_connection(("127.0.0.1", port))
+        garbage.sendall(struct.pack(">I", 3) + b"\xff[1")
+        agent = threading.Thread(
+            target=serve_agent,
+            args=(f"127.0.0.1:{port}",),
+            kwargs={"prepare": prepare, "token": TOKEN},
+        )
+        agent.start()
+
+        max_qps, *_ = coordinator.run()
+        agent.join(timeout=30)
+        assert max_qps > 0
+        for sock in (silent, huge, garbage):
+            sock.close()
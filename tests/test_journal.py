@@ -0,0 +1,76 @@
+from vectordb_bench.backend.clients import DB, IndexType
+from vectordb_bench.backend.journal import RunJournal
+from vectordb_bench.metric import Metric
+from vectordb_bench.models import CaseConfig, CaseResult, CaseType, ResultLabel, TaskConfig
+
+
+def make_task(case_id: CaseType = CaseType.Performance768D1M, uri: str = "http://localhost:19530") -> TaskConfig:
+    return TaskConfig(
+        db=DB.Milvus,
+        db_config=DB.Milvus.config_cls(uri=uri),
+        db_case_config=DB.Milvus.case_config_cls(index_type=IndexType.HNSW)(M=16, efConstruction=128, ef=100),
+        case_config=CaseConfig(case_id=case_id),
+    )
+
+
+class TestRunJournal:
+    def test_finished(self, tmp_path):
+        journal = RunJournal("run", tmp_path)
+        ok, failed = make_task(), make_task(CaseType.Performance768D1M1P)
+        for task, label in ((ok, ResultLabel.NORMAL), (failed, ResultLabel.FAILED)):
+            journal.start(task, drop_old=True)
+            journal.finish(CaseResult(metrics=Metric(qps=10.0, load_duration=5.0), task_config=task, label=label))
+
+        finished = journal.finished([ok, failed])
+        assert list(finished) == [RunJournal.case_key(ok)]
+        assert finished[RunJournal.case_key(ok)].metrics.qps == 10.0
+        # the restored task config is the same case
+        restored = finished[RunJournal.case_key(ok)].task_config
+        assert RunJournal.case_key(restored) == RunJournal.case_key(ok)
+
+    def test_loaded(self, tmp_path):
+        journal = RunJournal("run", tmp_path)
+        assert journal.loaded(make_task()) is None
+
+        task = make_task()
+        journal.start(task, drop_old=True)
+        journal.finish(CaseResult(metrics=Metric(load_duration=5.0), task_config=task))
+        journal.start(make_task(CaseType.Performance768D1M1P), drop_old=False)
+        assert journal.loaded(task).metrics.load_duration == 5.0
+
+        # loading on another database doesn't touch this one
+        other_db = make_task(uri="http://other:19530")
+        journal.start(other_db, drop_old=True)
+        assert journal.loaded(task).metrics.load_duration == 5.0
+        assert journal.loaded(other_db) is None
+
+        # interrupted while loading another collection
+        journal.start(make_task(CaseType.Performance768D100K), drop_old=True)
+        assert journal.loaded(task) is None
+
+    def test_resume_with_password(self, tmp_path):
+        journal = RunJournal("run", tmp_path)
+        task = TaskConfig(
+            db=DB.PgVector,
+            db_config=DB.PgVector.config_cls(password="secret"),
+            db_case_config=DB.PgVector.case_config_cls(index_type=IndexType.HNSW)(m=16, ef_construction=128),
+            case_config=CaseConfig(case_id=CaseType.Performance768D1M),
+        )
+        journal.start(task, drop_old=True)
+        journal.finish(CaseResult(metrics=Metric(qps=10.0, load_duration=5.0), task_config=task))
+        assert "secret" not in journal.path.read_text()
+
+        # the credentials left out of the journal come from the task configs of the resumed run
+        finished = journal.finished([task])
+        restored = finished[RunJournal.case_key(task)].task_config
+        assert restored.db_config.password.get_secret_value() == "secret"
+        assert journal.loaded(task).task_config.db_config.to_dict() == task.db_config.to_dict()
+
+    def test_truncated_line(self, tmp_path):
+        journal = RunJournal("run", tmp_path)
+        task = make_task()
+        journal.start(task, drop_old=True)
+        journal.finish(CaseResult(metrics=Metric(), task_config=task))
+        with journal.path.open("a") as f:
+            f.write('{"event": "fin')
+        assert len(journal.finished([task])) == 1
@@ -0,0 +1,85 @@
+import io
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from pymilvus import BulkInsertState
+
+from vectordb_bench.backend.clients.milvus import bulk_import
+from vectordb_bench.backend.clients.milvus.bulk_import import BulkImporter, encode_parquet, parse_storage_url
+
+
+class FakeStorage:
+    """a stand-in for the MinIO client of the Milvus server"""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, bucket: str, key: str, data: io.BytesIO, length: int):
+        self.objects[f"{bucket}/{key}"] = data.read(length)
+
+    def list_objects(self, bucket: str, prefix: str, recursive: bool = False):
+        names = [k.removeprefix(f"{bucket}/") for k in self.objects if k.startswith(f"{bucket}/{prefix}")]
+        if not recursive:
+            names = [n for n in names if "/" not in n.removeprefix(prefix)]
+        return [SimpleNamespace(object_name=n) for n in names]
+
+    def remove_object(self, bucket: str, key: str):
+        del self.objects[f"{bucket}/{key}"]
+
+
+class TestBulkImport:
+    def test_parse_storage_url(self):
+        assert parse_storage_url("https://ak:sk@minio:9000/a-bucket") == {
+            "endpoint": "minio:9000",
+            "access_key": "ak",
+            "secret_key": "sk",
+            "secure": True,
+            "bucket": "a-bucket",
+        }
+        with pytest.raises(ValueError, match="bulk import storage"):
+            parse_storage_url("minio:9000")
+
+    def test_encode_parquet(self):
+        vectors = np.random.default_rng(0).random((3, 4))
+        table = pq.read_table(io.BytesIO(encode_parquet({"pk": [1, 2, 3], "vector": vectors, "label": list("abc")})))
+        assert table.column("pk").to_pylist() == [1, 2, 3]
+        assert np.allclose(table.column("vector").to_pylist(), vectors.astype(np.float32))
+        assert table.column("label").to_pylist() == ["a", "b", "c"]
+
+    def test_stage_and_wait(self, monkeypatch: pytest.MonkeyPatch):
+        storage = FakeStorage()
+        submitted = []
+
+        def do_bulk_insert(collection_name: str, files: list[str]) -> int:  # noqa: ARG001
+            submitted.append(files)
+            return 100 + len(submitted)
+
+        def get_bulk_insert_state(task_id: int):  # noqa: ARG001
+            return SimpleNamespace(
+                state=BulkInsertState.ImportCompleted, row_count=4, create_timestamp=int(time.time()) - 2
+            )
+
+        monkeypatch.setattr(bulk_import.utility, "do_bulk_insert", do_bulk_insert)
+        monkeypatch.setattr(bulk_import.utility, "get_bulk_insert_state", get_bulk_insert_state)
+        monkeypatch.setattr(BulkImporter, "_client", lambda _: storage)
+
+        # 2 batches of 2 vectors of 4 float32 make a file
+        importer = BulkImporter(parse_storage_url("http://ak:sk@minio:9000/a-bucket"), "c", file_bytes=64)
+        for start in range(0, 8, 2):
+            ids = list(range(start, start + 2))
+            importer.add({"pk": ids, "id": ids, "vector": np.ones((2, 4))})
+        importer.flush()
+
+        assert len(submitted) == 2
+        staged = pq.read_table(io.BytesIO(storage.objects[f"a-bucket/{submitted[1][0]}"]))
+        assert staged.column("pk").to_pylist() == [4, 5, 6, 7]
+        assert sorted(importer.task_ids()) == [101, 102]
+
+        stats = importer.wait(poll_interval=0)
+        assert stats["import_rows"] == 8
+        assert stats["import_duration"] >= 2
+        # the staged files and task markers are deleted once imported
+        assert storage.objects == {}
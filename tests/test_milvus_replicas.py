@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from vectordb_bench.backend.clients.milvus.config import MilvusConfig
+from vectordb_bench.backend.clients.milvus.replicas import parse_search_counts, replica_search_counts
+from vectordb_bench.backend.runner.mp_runner import replica_qps
+
+METRICS = """
+# HELP milvus_querynode_sq_count count of search and query
+# TYPE milvus_querynode_sq_count counter
+milvus_querynode_sq_count{node_id="7",query_type="search",request_scope="All",status="success"} 1200
+milvus_querynode_sq_count{node_id="7",query_type="search",request_scope="All",status="fail"} 3
+milvus_querynode_sq_count{node_id="7",query_type="query",request_scope="All",status="success"} 50
+milvus_querynode_sq_count{node_id="8",query_type="search",request_scope="All",status="success"} 800
+milvus_querynode_sq_latency_bucket{node_id="8",query_type="search",le="1"} 800
+"""
+
+
+class TestReplicas:
+    def test_parse_search_counts(self):
+        assert parse_search_counts(METRICS) == {7: 1200.0, 8: 800.0}
+
+    def test_replica_search_counts(self):
+        groups = [
+            SimpleNamespace(id=1, resource_group="rg1", group_nodes=(7, 9)),
+            SimpleNamespace(id=2, resource_group="rg2", group_nodes=(8,)),
+        ]
+        counts = replica_search_counts(groups, {7: 1200.0, 8: 800.0, 9: 100.0})
+        assert counts == {"rg1/1": 1300.0, "rg2/2": 800.0}
+        # every shard of a replica counts each search
+        counts = replica_search_counts(groups, {7: 1200.0, 8: 800.0, 9: 100.0}, num_shards=2)
+        assert counts == {"rg1/1": 650.0, "rg2/2": 400.0}
+
+    def test_replica_qps(self):
+        assert replica_qps({"rg1/1": 100.0, "rg2/2": 50.0}, {"rg1/1": 400.0, "rg2/2": 350.0}, 10) == {
+            "rg1/1": 30.0,
+            "rg2/2": 30.0,
+        }
+        assert replica_qps({"rg1/1": 100.0}, {}, 10) == {"rg1/1": 0.0}
+
+    def test_config_lists(self):
+        config = MilvusConfig(resource_groups="rg1, rg2", metrics_urls="http://qn-0:9091/metrics,")
+        assert config.resource_groups == ["rg1", "rg2"]
+        assert config.metrics_urls == ["http://qn-0:9091/metrics"]
+        assert MilvusConfig(resource_groups=["rg1"], metrics_urls="").metrics_urls is None
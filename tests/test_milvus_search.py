@@ -0,0 +1,76 @@
+from pymilvus.client import ts_utils
+from pymilvus.client.prepare import Prepare
+from pymilvus.grpc_gen import schema_pb2
+
+from vectordb_bench.backend.clients import MetricType
+from vectordb_bench.backend.clients.milvus.config import HNSWConfig
+from vectordb_bench.backend.clients.milvus.milvus import Milvus
+from vectordb_bench.backend.clients.milvus.search import EVENTUALLY_TS, IdSearch, decode_ids
+from vectordb_bench.backend.filter import non_filter
+
+PARAM = {"metric_type": "L2", "params": {"ef": 64}}
+
+
+class TestIdSearch:
+    def test_request(self):
+        search = IdSearch("c", "vector", PARAM, "id >= 5")
+        for query in ([0.5, 1.0, 2.0], [0.25, -1.0, 3.0]):
+            expected = Prepare.search_requests_with_expr(
+                collection_name="c",
+                anns_field="vector",
+                param=PARAM,
+                limit=10,
+                data=[query],
+                expr="id >= 5",
+                output_fields=[],
+                guarantee_timestamp=EVENTUALLY_TS,
+            )
+            assert search.request(query, 10) == expected
+
+    def test_guarantee_ts(self, monkeypatch):
+        monkeypatch.setattr(IdSearch, "_ts_key", ("localhost:19530", ""))
+        search = IdSearch("ts", "vector", PARAM, "")
+        assert search.guarantee_ts() == EVENTUALLY_TS
+
+        # after a write of the process, like the deletes and upserts of the mixed workload
+        ts_utils.update_collection_ts("ts", 449_000_000_000_000_000, "localhost:19530", "")
+        assert search.guarantee_ts() == 449_000_000_000_000_000
+        assert search.request([0.5, 1.0], 10, search.guarantee_ts()).guarantee_timestamp == 449_000_000_000_000_000
+        assert search.request([0.5, 2.0], 10, search.guarantee_ts()).guarantee_timestamp == 449_000_000_000_000_000
+
+    def test_decode_ids(self):
+        results = schema_pb2.SearchResultData(num_queries=1, top_k=3, topks=[3], scores=[0.1, 0.2, 0.3])
+        results.ids.int_id.data.extend([7, 3, 5])
+        assert decode_ids(results) == [7, 3, 5]
+
+
+def make_client() -> Milvus:
+    db = Milvus.__new__(Milvus)
+    db.name = "Milvus"
+    db.collection_name = "c"
+    db.case_config = HNSWConfig(M=16, efConstruction=128, ef=64, metric_type=MetricType.L2)
+    db._vector_field = "vector"
+    return db
+
+
+class TestPrepareFilter:
+    def test_id_search(self, monkeypatch):
+        monkeypatch.setattr(IdSearch, "stub", object())
+        monkeypatch.setattr(IdSearch, "guarantee_ts", lambda _: EVENTUALLY_TS)
+        db = make_client()
+        db.prepare_filter(non_filter)
+        assert isinstance(db._id_search, IdSearch)
+
+    def test_fallback_on_sdk_change(self, monkeypatch):
+        monkeypatch.setattr(IdSearch, "stub", object())
+        monkeypatch.setattr(IdSearch, "guarantee_ts", lambda _: EVENTUALLY_TS)
+
+        def search_requests_with_expr(**_):
+            msg = "search_requests_with_expr() got an unexpected keyword argument 'expr'"
+            raise TypeError(msg)
+
+        # a signature of the SDK internals that no longer matches, searches go through Collection.search
+        monkeypatch.setattr(Prepare, "search_requests_with_expr", search_requests_with_expr)
+        db = make_client()
+        db.prepare_filter(non_filter)
+        assert db._id_search is None
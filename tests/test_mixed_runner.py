@@ -0,0 +1,105 @@
+import queue
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from vectordb_bench.backend.runner.mixed_runner import (
+    OP_DELETE,
+    OP_INSERT,
+    OP_SEARCH,
+    OP_UPSERT,
+    MixedWorkloadRunner,
+)
+
+NUM_ROWS = 100
+
+
+class ChurnDB:
+    """in-memory fake VectorDB, the search returns the smallest ids of the rows it still has"""
+
+    def __init__(self, ids: list[int]):
+        self.live = set(ids)
+        self.rows = {OP_INSERT: 0, OP_DELETE: 0, OP_UPSERT: 0}
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def prepare_filter(self, filters: object):
+        pass
+
+    def insert_embeddings(self, embeddings: list, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        assert not self.live.intersection(metadata), "only deleted rows are inserted again"
+        self.live.update(metadata)
+        self.rows[OP_INSERT] += len(metadata)
+        return len(metadata), None
+
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        assert self.live.issuperset(metadata), "only live rows are deleted"
+        self.live.difference_update(metadata)
+        self.rows[OP_DELETE] += len(metadata)
+        return len(metadata), None
+
+    def upsert_embeddings(self, embeddings: list, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        assert self.live.issuperset(metadata), "only live rows are upserted"
+        self.rows[OP_UPSERT] += len(metadata)
+        return len(metadata), None
+
+    def search_embedding(self, query: list[float], k: int = 100) -> list[int]:
+        return sorted(self.live)[:k]
+
+
+class FakeDataset:
+    data = type("Data", (), {"train_id_field": "id", "train_vector_field": "emb"})
+    test_data = np.random.default_rng(0).random((5, 4)).tolist()
+    gt_data = [list(range(NUM_ROWS))] * 5
+
+    def __iter__(self):
+        emb = list(np.random.default_rng(1).random((NUM_ROWS, 4)))
+        yield pd.DataFrame({"id": range(NUM_ROWS), "emb": emb})
+
+
+class Started:
+    """stands for the condition the workers wait on to start together"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def wait(self):
+        pass
+
+
+def make_runner(db: ChurnDB) -> MixedWorkloadRunner:
+    return MixedWorkloadRunner(
+        db, FakeDataset(), 0.3, 0.3, 0.2, 0.2, churn_ratio=1.0, write_batch_size=5, k=10, concurrencies=[1], duration=1
+    )
+
+
+class TestMixedWorkloadRunner:
+    def test_churn_bookkeeping(self):
+        db = ChurnDB(list(range(NUM_ROWS)))
+        runner = make_runner(db)
+        assert sorted(runner.pool_ids.tolist()) == list(range(NUM_ROWS))
+
+        counts, latencies, failed_cnt, deleted = runner.mixed_search(
+            runner.test_data, runner.pool_ids, runner.pool_embs, runner.deleted.copy(), queue.Queue(), Started()
+        )
+        assert failed_cnt == 0
+        assert counts[OP_SEARCH] == len(latencies) > 0
+        assert {op: counts[op] for op in db.rows} == db.rows
+        # the deleted mask is the rows the database no longer has
+        assert set(runner.pool_ids[deleted].tolist()) == set(range(NUM_ROWS)) - db.live
+        assert counts[OP_DELETE] - counts[OP_INSERT] == deleted.sum()
+
+    def test_live_recall(self):
+        # the database still returns the deleted rows 0 and 1
+        db = ChurnDB(list(range(NUM_ROWS)))
+        runner = make_runner(db)
+        recall, deleted_hit_rate = runner.search_live(runner.test_data, runner.ground_truth, {0, 1})
+        # the live neighbors are 2..11, of which the search returns 2..9
+        assert recall == 0.8
+        assert deleted_hit_rate == 0.2
@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from vectordb_bench.backend.runner import MultiProcessingSearchRunner
+
+
+class CountingDB:
+    """picklable fake VectorDB with one replica, every search takes 1ms"""
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def prepare_filter(self, filters):
+        pass
+
+    def search_embedding(self, query, k=100):
+        time.sleep(0.001)
+        return list(range(k))
+
+    @classmethod
+    def replica_counts_supported(cls):
+        return True
+
+    def replica_search_counts(self):
+        return {"rg/1": time.time()}
+
+
+class TestMultiProcessingSearchRunner:
+    def test_run_again(self):
+        test_data = np.random.default_rng(0).random((10, 4)).tolist()
+        runner = MultiProcessingSearchRunner(
+            CountingDB(), test_data, [list(range(10))] * 10, k=10, concurrencies=[1, 2], duration=1
+        )
+        for _ in range(2):
+            runner.run()
+            # the lists of each concurrency are of the latest run only
+            assert len(runner.conc_cpu_util_list) == 2
+            assert len(runner.conc_replica_qps_list) == 2
@@ -0,0 +1,104 @@
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+pytest.importorskip("pgvector")
+
+from pgvector.psycopg.vector import register_vector_info  # noqa: E402
+from psycopg import postgres  # noqa: E402
+from psycopg._copy_base import BinaryFormatter  # noqa: E402
+from psycopg.adapt import AdaptersMap, Dumper, Transformer  # noqa: E402
+from psycopg.pq import Format  # noqa: E402
+from psycopg.types import TypeInfo  # noqa: E402
+
+from pgvector import Bit, HalfVector  # noqa: E402
+
+from vectordb_bench.backend.clients.pg_copy import (  # noqa: E402
+    bit_layout,
+    encode_rows,
+    halfvec_layout,
+    vector_layout,
+    write_binary_copy,
+)
+
+
+class Sink:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += bytes(data)
+
+
+def make_context():
+    """adapters of a connection with pgvector registered, without a server"""
+    ctx = SimpleNamespace(adapters=AdaptersMap(postgres.adapters), connection=None)
+    register_vector_info(ctx, TypeInfo("vector", 90001, 90002))
+    return ctx
+
+
+def write_rows(ctx, types: list[str], rows: list[tuple]) -> bytes:
+    """what `copy.set_types` and `copy.write_row` per row send"""
+    f = BinaryFormatter(Transformer(ctx))
+    f.transformer.set_dumper_types([ctx.adapters.types.get_oid(t) for t in types], f.format)
+    return b"".join(bytes(f.write_row(row)) for row in rows) + bytes(f.end())
+
+
+class TestPgCopy:
+    def test_same_as_write_row(self):
+        ctx = make_context()
+        ids, vectors = np.arange(5) * 7, np.random.default_rng(0).random((5, 8))
+        layout = vector_layout(ctx, "vector", 8)
+        assert layout.header == struct.pack(">HH", 8, 0)
+
+        sink = Sink()
+        write_binary_copy(sink, ids, vectors, layout, chunk_bytes=100)
+        assert sink.data == write_rows(ctx, ["bigint", "vector"], list(zip(ids, vectors, strict=True)))
+
+        labels = ["a", "label_2", "", "ccc", "é"]
+        sink = Sink()
+        write_binary_copy(sink, ids, vectors, layout, labels)
+        expected = write_rows(ctx, ["bigint", "vector", "varchar"], list(zip(ids, vectors, labels, strict=True)))
+        assert sink.data == expected
+
+    def test_little_endian_layout(self):
+        """like pgvecto.rs, a little-endian uint16 dimension followed by little-endian floats"""
+
+        class LittleEndianDumper(Dumper):
+            format = Format.BINARY
+            oid = 90011
+
+            def dump(self, obj):
+                v = np.asarray(obj, dtype="<f4")
+                return struct.pack("<H", len(v)) + v.tobytes()
+
+        ctx = make_context()
+        TypeInfo("vector", 90011, 90012).register(ctx)
+        ctx.adapters.register_dumper("numpy.ndarray", LittleEndianDumper)
+
+        layout = vector_layout(ctx, "vector", 4)
+        assert layout.header == struct.pack("<H", 4)
+        assert layout.dtype == np.dtype("<f4")
+
+        sink = Sink()
+        ids, vectors = np.arange(3), np.random.default_rng(0).random((3, 4))
+        write_binary_copy(sink, ids, vectors, layout)
+        assert sink.data == write_rows(ctx, ["bigint", "vector"], list(zip(ids, vectors, strict=True)))
+
+    def test_quantized_layouts(self):
+        embeddings = np.random.default_rng(0).standard_normal((4, 13))
+        value_offset = 2 + 4 + 8 + 4  # field count, id length, id, vector length
+
+        def values(data: bytes, width: int) -> list[bytes]:
+            return [data[i * width + value_offset : (i + 1) * width] for i in range(len(embeddings))]
+
+        half = embeddings.astype(np.float16)
+        data = bytes(encode_rows(np.arange(4), half, halfvec_layout(13)))
+        assert values(data, len(data) // 4) == [HalfVector(v).to_binary() for v in half]
+
+        bits = np.packbits(embeddings > 0, axis=1)
+        data = bytes(encode_rows(np.arange(4), bits, bit_layout(13)))
+        assert values(data, len(data) // 4) == [Bit(v > 0).to_binary() for v in embeddings]
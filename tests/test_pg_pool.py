@@ -0,0 +1,55 @@
+import threading
+from contextlib import contextmanager
+
+from vectordb_bench.backend.clients.pg_pool import PgSessionPool
+
+
+class FakeCursor:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+
+class FakePool:
+    def __init__(self):
+        self.lent = 0
+
+    @contextmanager
+    def connection(self):
+        self.lent += 1
+        yield FakeConnection()
+
+
+class FakeClient(PgSessionPool):
+    name = "Fake"
+
+    def __init__(self):
+        self.conn, self.cursor = FakeConnection(), FakeCursor()
+        self._pool = FakePool()
+
+
+class TestPgSessionPool:
+    def test_session(self):
+        db = FakeClient()
+        clients = []
+
+        def insert():
+            with db.session() as client:
+                clients.append(client)
+
+        threads = [threading.Thread(target=insert) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert db._pool.lent == 4
+        assert len({id(c.conn) for c in clients}) == 4
+        assert all(c.conn is not db.conn and c.cursor.closed for c in clients)
+        assert not db.cursor.closed
@@ -0,0 +1,22 @@
+from vectordb_bench.backend.clients.pg_progress import IndexBuildMonitor
+
+
+class TestIndexBuildMonitor:
+    def test_phases(self):
+        monitor = IndexBuildMonitor({}, pid=1, interval=1)
+        monitor._record(0.0, "initializing")
+        monitor._record(1.0, "building index: loading tuples", 100)
+        monitor._record(3.0, "building index: loading tuples", 2000)
+        monitor._record(5.0, "building index: loading tuples", 4000)
+        monitor._record(6.0, None)
+
+        assert monitor.summary() == {
+            "phases": {"initializing": 1.0, "building index: loading tuples": 5.0},
+            "tuples_per_sec": 800.0,
+        }
+
+    def test_unreachable(self):
+        # nothing listens on port 1, the build goes on without progress
+        with IndexBuildMonitor({"host": "127.0.0.1", "port": 1, "connect_timeout": 1}, pid=1) as monitor:
+            pass
+        assert monitor.summary() == {"phases": {}, "tuples_per_sec": 0.0}
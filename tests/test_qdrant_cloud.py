@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from vectordb_bench.backend.clients.qdrant_cloud.config import QdrantIndexConfig
+from vectordb_bench.backend.clients.qdrant_cloud.qdrant_cloud import QdrantCloud
+
+
+class FakeClient:
+    """records the payload indexes and the payloads of the collection"""
+
+    def __init__(self):
+        self.indexes = []
+        self.payloads = []
+
+    def create_collection(self, **kwargs):
+        pass
+
+    def create_payload_index(self, **kwargs):
+        self.indexes.append(kwargs["field_name"])
+
+    def upsert(self, **kwargs):
+        self.payloads.extend(kwargs["points"].payloads)
+
+
+def make_client(with_scalar_labels: bool = False, with_int_filter: bool = False, **case_config) -> QdrantCloud:
+    db = QdrantCloud.__new__(QdrantCloud)
+    db.db_case_config = QdrantIndexConfig(**case_config)
+    db.collection_name = "c"
+    db.with_scalar_labels = with_scalar_labels
+    db.with_int_filter = with_int_filter
+    db._primary_field = "pk"
+    db._scalar_label_field = "label"
+    db.qdrant_client = FakeClient()
+    return db
+
+
+class TestQdrantCloud:
+    @pytest.mark.parametrize(
+        ("with_scalar_labels", "with_int_filter", "case_config", "indexes"),
+        [
+            (False, False, {}, []),
+            (False, True, {}, ["pk"]),
+            (False, True, {"create_payload_int_index": False}, []),
+            (True, False, {}, ["label"]),
+            (True, False, {"create_payload_keyword_index": False}, []),
+        ],
+    )
+    def test_payload_indexes(self, with_scalar_labels: bool, with_int_filter: bool, case_config: dict, indexes: list):
+        db = make_client(with_scalar_labels, with_int_filter, **case_config)
+        db._create_collection(2, db.qdrant_client)
+        assert db.qdrant_client.indexes == indexes
+
+    def test_payloads(self):
+        db = make_client(with_scalar_labels=True)
+        db.insert_embeddings([[0.1, 0.2]] * 2, [3, 4], labels_data=["label_1p", "label_5p"])
+        assert db.qdrant_client.payloads == [{"pk": 3, "label": "label_1p"}, {"pk": 4, "label": "label_5p"}]
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from qdrant_client.http.models import FieldCondition, MatchValue, Range
+
+from vectordb_bench.backend.clients.qdrant_filter import build_query_filter
+from vectordb_bench.backend.filter import Filter, IntFilter, LabelFilter, non_filter
+
+
+class TestQdrantFilter:
+    def test_non_filter(self):
+        assert build_query_filter(non_filter, "pk", "label") is None
+
+    def test_int_filter(self):
+        query_filter = build_query_filter(IntFilter(filter_rate=0.99, int_value=990_000), "pk", "label")
+        assert query_filter.must == [FieldCondition(key="pk", range=Range(gte=990_000))]
+
+    def test_label_filter(self):
+        query_filter = build_query_filter(LabelFilter(label_percentage=0.05), "pk", "label")
+        assert query_filter.must == [FieldCondition(key="label", match=MatchValue(value="label_5p"))]
+
+    def test_unsupported_filter(self):
+        class OtherFilter(Filter):
+            type: str = "Other"
+
+        with pytest.raises(ValueError, match="Not support Filter"):
+            build_query_filter(OtherFilter(), "pk", "label")
@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from vectordb_bench.backend.clients.qdrant_local.config import QdrantLocalIndexConfig
+from vectordb_bench.backend.clients.qdrant_local.qdrant_local import INDEXING_THRESHOLD, QdrantLocal
+
+
+class FakeClient:
+    """records the calls made to the collection"""
+
+    def __init__(self):
+        self.calls = []
+        self.payloads = []
+
+    def update_collection(self, collection_name: str, optimizer_config: object):
+        self.calls.append(("threshold", optimizer_config.indexing_threshold))
+
+    def upload_collection(self, **kwargs):
+        self.calls.append(("upload", kwargs["wait"], kwargs["parallel"]))
+
+    def upsert(self, **kwargs):
+        self.calls.append(("upsert", kwargs["wait"], len(kwargs["points"].ids)))
+        self.payloads.extend(kwargs["points"].payloads)
+
+    def create_collection(self, **kwargs):
+        self.calls.append(("collection", kwargs["collection_name"]))
+
+    def create_payload_index(self, **kwargs):
+        self.calls.append(("index", kwargs["field_name"]))
+
+    def delete(self, **kwargs):
+        self.calls.append(("delete", kwargs["wait"]))
+
+
+def make_client(defer_indexing: bool = True, with_scalar_labels: bool = False) -> QdrantLocal:
+    db = QdrantLocal.__new__(QdrantLocal)
+    db.case_config = QdrantLocalIndexConfig(m=16, ef_construct=128, defer_indexing=defer_indexing)
+    db.collection_name = "c"
+    db.upload_parallel = 4
+    db.with_scalar_labels = with_scalar_labels
+    db._loading = False
+    db._primary_field = "pk"
+    db._scalar_label_field = "label"
+    db.client = FakeClient()
+    return db
+
+
+class TestQdrantLocal:
+    def test_insert_outside_dataset_load(self):
+        db = make_client(defer_indexing=True)
+        # like the inserts of streaming cases, searchable once inserted
+        assert db.insert_embeddings([[0.1, 0.2]] * 150, list(range(150))) == (150, None)
+        assert db.client.calls == [("upsert", True, 100), ("upsert", True, 50)]
+
+    def test_dataset_load(self):
+        db = make_client(defer_indexing=True)
+        with db.dataset_load():
+            assert db.insert_embeddings([[0.1, 0.2]] * 100, list(range(100))) == (100, None)
+            assert db.insert_embeddings([[0.1, 0.2]] * 200, list(range(100, 300))) == (200, None)
+        assert db.client.calls == [
+            ("threshold", 0),
+            ("upload", False, 1),
+            ("upload", False, 4),
+            # once for every shard, before the index is built
+            ("delete", True),
+            ("threshold", INDEXING_THRESHOLD),
+        ]
+
+    def test_index_while_loading(self):
+        db = make_client(defer_indexing=False)
+        with db.dataset_load():
+            db.insert_embeddings([[0.1, 0.2]], [1])
+        assert db.client.calls == [("upload", False, 1), ("delete", True)]
+
+    def test_payloads(self):
+        db = make_client()
+        db.insert_embeddings([[0.1, 0.2]] * 2, [3, 4])
+        assert db.client.payloads == [{"pk": 3}, {"pk": 4}]
+
+        db = make_client(with_scalar_labels=True)
+        db.insert_embeddings([[0.1, 0.2]] * 2, [3, 4], labels_data=["label_1p", "label_5p"])
+        assert db.client.payloads == [{"pk": 3, "label": "label_1p"}, {"pk": 4, "label": "label_5p"}]
+
+    def test_create_collection(self):
+        db = make_client()
+        db._create_collection(2, db.client)
+        assert db.client.calls == [("collection", "c"), ("index", "pk")]
+
+        db = make_client(with_scalar_labels=True)
+        db._create_collection(2, db.client)
+        assert db.client.calls == [("collection", "c"), ("index", "pk"), ("index", "label")]
@@ -0,0 +1,161 @@
+import json
+from contextlib import contextmanager
+
+from vectordb_bench.backend.query_plan import (
+    mariadb_plan_summary,
+    pg_plan_summary,
+    summarize_plans,
+    tidb_plan_summary,
+)
+from vectordb_bench.backend.runner.serial_runner import SerialSearchRunner
+
+PG_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Actual Rows": 10,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": 420,
+            "Shared Read Blocks": 12,
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Index Name": "pgvector_index",
+                    "Actual Rows": 40,
+                    "Actual Loops": 1,
+                    "Rows Removed by Filter": 30,
+                    "Shared Hit Blocks": 420,
+                    "Shared Read Blocks": 12,
+                }
+            ],
+        },
+        "Planning Time": 0.1,
+        "Execution Time": 2.5,
+    }
+]
+
+MARIADB_PLAN = {
+    "query_block": {
+        "select_id": 1,
+        "r_loops": 1,
+        "r_total_time_ms": 3.2,
+        "nested_loop": [
+            {
+                "table": {
+                    "table_name": "vec_collection",
+                    "access_type": "index",
+                    "key": "v",
+                    "r_loops": 1,
+                    "r_rows": 200,
+                    "r_filtered": 25,
+                    "r_engine_stats": {"pages_accessed": 150, "pages_read_count": 10},
+                }
+            }
+        ],
+    }
+}
+
+TIDB_ROWS = [
+    ("Projection_7", "10.00", "10", "root", "", "time:4.5ms, loops:2", "test.t.id", "1 KB", "N/A"),
+    ("└─TopN_9", "10.00", "10", "root", "", "time:4.4ms, loops:2", "distance, offset:0, count:10", "", ""),
+    ("  └─Selection_11", "10.00", "12", "cop[tiflash]", "", "time:3ms", "ge(test.t.id, 100)", "", ""),
+    (
+        "    └─TableFullScan_10",
+        "10.00",
+        "20",
+        "cop[tiflash]",
+        "table:t",
+        "time:2ms",
+        "annIndex:L2(embedding..idx), top k:10",
+        "",
+        "",
+    ),
+]
+
+
+class TestQueryPlan:
+    def test_pg(self):
+        assert pg_plan_summary(PG_PLAN) == {
+            "scan_type": "Index Scan",
+            "execution_ms": 2.5,
+            "shared_hit_blocks": 420,
+            "shared_read_blocks": 12,
+            "heap_fetches": 0,
+            "rows_examined": 40,
+            "rows_removed_by_filter": 30,
+        }
+
+    def test_mariadb(self):
+        assert mariadb_plan_summary(json.dumps(MARIADB_PLAN)) == {
+            "scan_type": "index",
+            "execution_ms": 3.2,
+            "rows_examined": 200,
+            "rows_removed_by_filter": 150,
+            "shared_hit_blocks": 140,
+            "shared_read_blocks": 10,
+        }
+
+    def test_tidb(self):
+        assert tidb_plan_summary(TIDB_ROWS) == {
+            "scan_type": "TableFullScan (annIndex)",
+            "rows_examined": 20,
+            "rows_removed_by_filter": 8,
+            "execution_ms": 4.5,
+        }
+
+    def test_summarize(self):
+        stats, scan_types = summarize_plans(
+            [pg_plan_summary(PG_PLAN), mariadb_plan_summary(MARIADB_PLAN), tidb_plan_summary(TIDB_ROWS)]
+        )
+        assert stats["samples"] == 3
+        assert stats["execution_ms_avg"] == round((2.5 + 3.2 + 4.5) / 3, 4)
+        assert stats["heap_fetches_avg"] == 0
+        assert scan_types == {"Index Scan": 1, "index": 1, "TableFullScan (annIndex)": 1}
+        assert summarize_plans([]) == ({}, {})
+
+
+class ExplainDB:
+    """fake VectorDB logging its searches and explained searches in order"""
+
+    name = "ExplainDB"
+
+    def __init__(self):
+        self.calls = []
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def prepare_filter(self, filters: object):
+        pass
+
+    @classmethod
+    def explain_supported(cls) -> bool:
+        return True
+
+    def search_embedding(self, query: list[float], k: int = 100) -> list[int]:
+        self.calls.append(("search", query[0]))
+        return list(range(k))
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict:
+        self.calls.append(("explain", query[0]))
+        return {"scan_type": "Index Scan", "execution_ms": 1.0}
+
+
+class TestSerialSearchExplain:
+    def test_explain_before_search(self):
+        db = ExplainDB()
+        test_data = [[float(i), 0.0] for i in range(200)]
+        runner = SerialSearchRunner(
+            db, test_data, [list(range(10))] * 200, k=10, warmup_duration=0, warmup_queries=0, explain_sample_rate=0.1
+        )
+        (recall, _, _, _), plans = runner.search((test_data, runner.ground_truth))
+        assert recall == 1.0
+
+        explained = [q for call, q in db.calls if call == "explain"]
+        assert len(plans) == len(explained) > 0
+        # each sampled query is explained on the cache as its search would find it, right before it
+        for q in explained:
+            i = db.calls.index(("explain", q))
+            assert db.calls[i + 1] == ("search", q)
+        assert [q for call, q in db.calls if call == "search"] == [q for q, _ in test_data]
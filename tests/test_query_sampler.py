@@ -0,0 +1,47 @@
+import itertools
+import logging
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from vectordb_bench.backend.query_sampler import QueryDistribution, QuerySampler
+
+log = logging.getLogger(__name__)
+
+
+class TestQuerySampler:
+    def take(self, sampler: QuerySampler, num: int, count: int = 20_000) -> list[int]:
+        return list(itertools.islice(sampler.indices(num), count))
+
+    def test_sequential(self):
+        indices = self.take(QuerySampler(), 10, 25)
+        assert all(b == (a + 1) % 10 for a, b in itertools.pairwise(indices))
+
+    @pytest.mark.parametrize("distribution", [d for d in QueryDistribution if d != QueryDistribution.TRACE])
+    def test_in_range(self, distribution):
+        indices = self.take(QuerySampler(distribution), 100)
+        assert min(indices) >= 0
+        assert max(indices) < 100
+
+    def test_zipf_skew(self):
+        counts = Counter(self.take(QuerySampler(QueryDistribution.ZIPF, zipf_skew=1.5), 1000))
+        top = counts.most_common(10)
+        log.info(f"zipf top queries: {top}")
+        assert sum(c for _, c in top) > 0.5 * sum(counts.values())
+
+    def test_hot_set_shared_by_processes(self):
+        sampler = QuerySampler(QueryDistribution.HOT_SET, hot_set_ratio=0.01, hot_set_prob=0.9)
+        hot_a = {i for i, _ in Counter(self.take(sampler, 1000)).most_common(10)}
+        hot_b = {i for i, _ in Counter(self.take(sampler, 1000)).most_common(10)}
+        assert hot_a == hot_b
+
+    def test_trace(self, tmp_path):
+        trace_file = tmp_path / "trace.npy"
+        np.save(trace_file, np.array([3, 1, 4, 1, 5]))
+        indices = self.take(QuerySampler(QueryDistribution.TRACE, trace_file=str(trace_file)), 10, 10)
+        assert set(indices) == {1, 3, 4, 5}
+
+    def test_trace_requires_file(self):
+        with pytest.raises(ValueError):
+            QuerySampler(QueryDistribution.TRACE)
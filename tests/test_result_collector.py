@@ -0,0 +1,30 @@
+import shutil
+
+from vectordb_bench import config
+from vectordb_bench.backend.result_collector import ResultCollector
+
+RESULT_FILE = config.RESULTS_LOCAL_DIR / "Milvus" / "result_20230727_standard_milvus.json"
+
+
+class TestResultCollector:
+    def test_cache(self, tmp_path):
+        result_dir = tmp_path / "results"
+        result_dir.mkdir()
+        copied = result_dir / RESULT_FILE.name
+        shutil.copy(RESULT_FILE, copied)
+
+        first = ResultCollector.collect(result_dir)
+        second = ResultCollector.collect(result_dir)
+        assert first[0].results[0] is second[0].results[0]
+        expected = ResultCollector.collect_files(result_dir)
+        assert [c.metrics for c in first[0].results] == [c.metrics for c in expected[0].results]
+
+        # merging the files of a run doesn't change the cached results
+        shutil.copy(RESULT_FILE, result_dir / "result_20230727_other_milvus.json")
+        merged = ResultCollector.collect(result_dir)
+        assert len(merged[0].results) == 2 * len(first[0].results)
+        assert len(ResultCollector.collect(result_dir)[0].results) == 2 * len(first[0].results)
+
+        copied.write_text(copied.read_text().replace('"qps":', '"qps": 1.0, "_qps":', 1))
+        changed = ResultCollector.collect(result_dir)
+        assert not any(r is first[0].results[0] for r in changed[0].results)
@@ -0,0 +1,89 @@
+from vectordb_bench.backend.clients import DB, IndexType
+from vectordb_bench.backend.result_compare import Thresholds, compare_results
+from vectordb_bench.metric import Metric
+from vectordb_bench.models import CaseConfig, CaseResult, CaseType, ResultLabel, TaskConfig
+
+
+def make_result(
+    metrics: Metric, ef: int = 100, label: ResultLabel = ResultLabel.NORMAL, db_label: str = ""
+) -> CaseResult:
+    task = TaskConfig(
+        db=DB.Milvus,
+        db_config=DB.Milvus.config_cls(uri="http://localhost:19530", db_label=db_label),
+        db_case_config=DB.Milvus.case_config_cls(index_type=IndexType.HNSW)(M=16, efConstruction=128, ef=ef),
+        case_config=CaseConfig(case_id=CaseType.Performance768D1M),
+    )
+    return CaseResult(metrics=metrics, task_config=task, label=label)
+
+
+class TestResultCompare:
+    def test_regression_beyond_threshold(self):
+        baseline = [make_result(Metric(qps=1000.0, recall=0.95, load_duration=100.0))]
+        target = [make_result(Metric(qps=900.0, recall=0.95, load_duration=105.0))]
+        comparisons, unmatched = compare_results(baseline, target, Thresholds())
+        assert unmatched == []
+        assert len(comparisons) == 1
+        deltas = {d.metric: d for d in comparisons[0].deltas}
+        assert deltas["qps"].change == -10.0
+        assert deltas["qps"].significant is None
+        assert deltas["qps"].regression
+        assert not deltas["load_duration"].regression
+        assert not deltas["recall"].regression
+        assert comparisons[0].regression
+
+        # an improvement is never a regression
+        comparisons, _ = compare_results(target, baseline, Thresholds())
+        assert not comparisons[0].regression
+
+    def test_target_drops_to_zero(self):
+        baseline = [make_result(Metric(qps=1000.0, recall=0.95))]
+        target = [make_result(Metric(qps=0.0, recall=0.0))]
+        comparisons, _ = compare_results(baseline, target, Thresholds())
+        deltas = {d.metric: d for d in comparisons[0].deltas}
+        assert deltas["qps"].change == -100.0
+        assert deltas["qps"].regression
+        assert deltas["recall"].regression
+        # metrics the baseline didn't measure are not compared
+        assert "load_duration" not in deltas
+
+    def test_noise_is_not_regression(self):
+        baseline = make_result(Metric(qps=1000.0, repeat_qps_list=[1100.0, 900.0, 1000.0]))
+        noisy = make_result(Metric(qps=930.0, repeat_qps_list=[1050.0, 850.0, 890.0]))
+        comparisons, _ = compare_results([baseline], [noisy], Thresholds())
+        assert comparisons[0].deltas[0].significant is False
+        assert not comparisons[0].regression
+
+        stable = make_result(Metric(qps=930.0, repeat_qps_list=[931.0, 929.0, 930.0]))
+        baseline = make_result(Metric(qps=1000.0, repeat_qps_list=[1001.0, 999.0, 1000.0]))
+        comparisons, _ = compare_results([baseline], [stable], Thresholds())
+        assert comparisons[0].deltas[0].significant
+        assert comparisons[0].regression
+
+    def test_match_by_config(self):
+        baseline = [make_result(Metric(qps=1000.0)), make_result(Metric(qps=10.0), label=ResultLabel.FAILED)]
+        target = [make_result(Metric(qps=500.0), ef=200)]
+        comparisons, unmatched = compare_results(baseline, target, Thresholds())
+        # the successful baseline case is missing in the target
+        assert len(comparisons) == 1
+        assert comparisons[0].target_label is None
+        assert comparisons[0].regression
+        assert len(unmatched) == 2
+
+    def test_failed_target(self):
+        baseline = [make_result(Metric(qps=1000.0))]
+        target = [make_result(Metric(), label=ResultLabel.FAILED)]
+        comparisons, unmatched = compare_results(baseline, target, Thresholds())
+        assert unmatched == []
+        assert comparisons[0].target_label == ResultLabel.FAILED
+        assert comparisons[0].regression
+
+    def test_match_across_versions_in_db_label(self):
+        baseline = [make_result(Metric(qps=1000.0), db_label="2c8g-disk-v2.2.12")]
+        target = [make_result(Metric(qps=1000.0), db_label="2c8g-disk-v2.3.0")]
+        comparisons, unmatched = compare_results(baseline, target, Thresholds())
+        assert unmatched == []
+        assert not comparisons[0].regression
+
+        target = [make_result(Metric(qps=1000.0), db_label="2c8g-hnsw-v2.3.0")]
+        comparisons, _ = compare_results(baseline, target, Thresholds())
+        assert comparisons[0].target_label is None
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from vectordb_bench.backend.runner import serial_runner
+from vectordb_bench.backend.runner.serial_runner import SerialInsertRunner
+
+NUM_ROWS = 10
+
+
+class FullDB:
+    """fake VectorDB that raises once it holds `capacity` rows"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ids = []
+        self.embeddings = []
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def insert_embeddings(self, embeddings: list, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        if len(self.ids) >= self.capacity:
+            msg = "out of memory"
+            raise RuntimeError(msg)
+        self.ids.extend(metadata)
+        self.embeddings.extend(embeddings)
+        return len(metadata), None
+
+
+class FakeDataset:
+    data = type("Data", (), {"train_id_field": "id", "train_vector_field": "emb"})
+
+    def __iter__(self):
+        # ids with a gap, the next round starts after the largest one
+        emb = list(np.random.default_rng(0).random((NUM_ROWS, 4)))
+        yield pd.DataFrame({"id": [*range(NUM_ROWS - 1), 20], "emb": emb})
+
+
+class TestSerialInsertRunner:
+    def test_run_endlessness(self, monkeypatch: object):
+        monkeypatch.setattr(serial_runner, "NUM_PER_BATCH", 4)
+        db = FullDB(capacity=25)
+        runner = SerialInsertRunner(db, FakeDataset(), normalize=False, timeout=60, perturbation=0.1)
+        m = runner.run_endlessness()
+
+        # 2 full rounds, the 3rd fails after 2 batches of 4
+        assert m.max_load_count == 20
+        assert m.cap_load_count_list == [10, 20, 28]
+        assert len(m.cap_elapsed_time_list) == len(m.cap_insert_throughput_list) == 3
+
+        ids = np.array(db.ids)
+        assert len(set(db.ids)) == len(db.ids)
+        assert ids[NUM_ROWS : NUM_ROWS * 2].tolist() == [*range(21, 30), 41]
+        assert ids[NUM_ROWS * 2 :].tolist() == list(range(42, 50))
+
+        first, second = np.array(db.embeddings[:NUM_ROWS]), np.array(db.embeddings[NUM_ROWS : NUM_ROWS * 2])
+        # the first round is the dataset itself, the next ones perturbed with the same lengths
+        assert np.allclose(first, np.stack(next(iter(FakeDataset()))["emb"]))
+        assert not np.allclose(first, second)
+        assert np.allclose(np.linalg.norm(first, axis=1), np.linalg.norm(second, axis=1), rtol=1e-5)
+
+    def test_perturbation_is_deterministic(self):
+        runner = SerialInsertRunner(FullDB(capacity=100), FakeDataset(), normalize=False, perturbation=0.1)
+        emb = np.random.default_rng(0).random((NUM_ROWS, 4), dtype=np.float32)
+        a = runner._perturb(emb, np.random.default_rng(1))
+        b = runner._perturb(emb, np.random.default_rng(1))
+        assert np.array_equal(a, b)
+        assert not np.allclose(a, emb)
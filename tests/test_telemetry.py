@@ -0,0 +1,43 @@
+import time
+
+from vectordb_bench.backend.telemetry import ResourceSampler
+from vectordb_bench.metric import Metric
+
+
+def busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestResourceSampler:
+    def test_attach(self):
+        m = Metric()
+        with ResourceSampler(interval=0.05, enabled=True) as sampler:
+            busy(0.3)
+        sampler.attach(m, "search_serial")
+
+        stats = m.client_stats["search_serial"]
+        assert stats["samples"] >= 3
+        assert stats["cpu_max"] > 0
+        assert stats["rss_max_mb"] > 0
+        series = m.client_series["search_serial"]
+        assert len(series["cpu"]) == len(series["rss_mb"]) == stats["samples"]
+
+    def test_short_stage_and_disabled(self):
+        m = Metric()
+        with ResourceSampler(interval=10, enabled=True) as sampler:
+            pass
+        sampler.attach(m, "load")
+        assert m.client_stats["load"]["samples"] == 1
+
+        with ResourceSampler(enabled=False) as sampler:
+            busy(0.05)
+        sampler.attach(m, "search_concurrent")
+        assert "search_concurrent" not in m.client_stats
+
+    def test_saturated(self):
+        sampler = ResourceSampler(interval=0.05, enabled=True, cpu_warn_threshold=0)
+        with sampler:
+            busy(0.2)
+        assert sampler.saturated_samples() > 0
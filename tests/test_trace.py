@@ -0,0 +1,55 @@
+import logging
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from vectordb_bench.backend.filter import LabelFilter, NewIntFilter, non_filter
+from vectordb_bench.backend.runner import TraceReplayRunner
+from vectordb_bench.backend.trace import QueryTrace, TraceRecorder, filter_from_json, filter_to_json
+
+log = logging.getLogger(__name__)
+
+
+class SleepDB:
+    """picklable fake VectorDB, every search takes 1ms"""
+
+    @contextmanager
+    def init(self):
+        yield
+
+    def prepare_filter(self, filters):
+        pass
+
+    def search_embedding(self, query, k=100):
+        time.sleep(0.001)
+        return list(range(k))
+
+
+class TestTrace:
+    def test_filter_json(self):
+        for f in [NewIntFilter(filter_rate=0.01, int_value=10), LabelFilter(label_percentage=0.05)]:
+            assert filter_from_json(filter_to_json(f)) == f
+        assert filter_to_json(non_filter) is None
+        assert filter_from_json(None) == non_filter
+
+    def test_save_load(self, tmp_path):
+        recorder = TraceRecorder()
+        for i in range(5):
+            recorder.record([float(i)] * 4, k=10, filters=LabelFilter(label_percentage=0.1), timestamp=100.0 + i)
+        recorder.save(tmp_path / "trace.parquet")
+
+        trace = QueryTrace.load(tmp_path / "trace.parquet")
+        assert len(trace) == 5
+        assert trace.duration == 4.0
+        assert trace.embs.dtype == np.float32
+        assert filter_from_json(trace.filters[0]) == LabelFilter(label_percentage=0.1)
+
+    def test_replay(self):
+        trace = QueryTrace.from_test_data(np.random.random((10, 4)), qps=200, num_queries=100, k=10, seed=1)
+        m, per_request = TraceReplayRunner(SleepDB(), trace, speedup=2, num_workers=2).run()
+        log.info(f"replay metric: {m}")
+        assert len(per_request) == 100
+        assert per_request["success"].all()
+        assert m.trace_failed_rate == 0
+        assert m.trace_latency_p99 >= 0.001
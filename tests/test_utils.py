@@ -2,7 +2,7 @@ import pytest
 import logging
 
 from vectordb_bench.backend import utils
-from vectordb_bench.metric import calc_recall
+from vectordb_bench.metric import bootstrap_ci, calc_recall, summarize_samples
 
 log = logging.getLogger(__name__)
 
@@ -37,6 +37,18 @@ class TestUtils:
         log.info(f"recall: {res}, expected: {expected}")
         assert res == expected
 
+    def test_summarize_samples(self):
+        samples = [100.0, 104.0, 98.0, 102.0, 101.0]
+        stats = summarize_samples(samples)
+        log.info(f"stats: {stats}")
+        assert stats["n"] == 5
+        assert stats["mean"] == 101.0
+        assert stats["ci_low"] <= stats["mean"] <= stats["ci_high"]
+        assert min(samples) <= stats["ci_low"] and stats["ci_high"] <= max(samples)
+
+        assert bootstrap_ci([3.0]) == (3.0, 3.0)
+        assert summarize_samples([3.0])["std"] == 0.0
+
 
 class TestGetFiles:
     @pytest.mark.parametrize("train_count", [
@@ -20,6 +20,10 @@ class config:
     DATASET_LOCAL_DIR = env.path("DATASET_LOCAL_DIR", "/tmp/vectordb_bench/dataset")
     NUM_PER_BATCH = env.int("NUM_PER_BATCH", 100)
     TIME_PER_BATCH = 1  # 1s. for streaming insertion.
+    # connections the pg clients pool for the threads of streaming insertion, 0 for one per cpu
+    PG_POOL_MAX_SIZE = env.int("PG_POOL_MAX_SIZE", 0)
+    # seconds between polls of pg_stat_progress_create_index while pgvector builds its index, see IndexBuildMonitor
+    PG_INDEX_PROGRESS_INTERVAL = env.float("PG_INDEX_PROGRESS_INTERVAL", 5.0)
     MAX_INSERT_RETRY = 5
     MAX_SEARCH_RETRY = 5
 
@@ -34,6 +38,32 @@ class config:
 
     CONCURRENCY_TIMEOUT = 3600
 
+    # distributed concurrent search, the coordinator listens on DISTRIBUTED_BIND_HOST:DISTRIBUTED_PORT
+    # and only accepts agents with DISTRIBUTED_TOKEN, which must be set
+    DISTRIBUTED_BIND_HOST = env.str("DISTRIBUTED_BIND_HOST", "127.0.0.1")
+    DISTRIBUTED_PORT = env.int("DISTRIBUTED_PORT", 7799)
+    DISTRIBUTED_TOKEN = env.str("DISTRIBUTED_TOKEN", "")
+
+    # cases on different databases run in parallel, each on its own slice of CPUS_PER_CASE cpus
+    # 0 cpus per case splits all available cpus evenly
+    CASE_PARALLELISM = env.int("CASE_PARALLELISM", 1)
+    CPUS_PER_CASE = env.int("CPUS_PER_CASE", 0)
+
+    # warm-up searches before each search stage, excluded from the metrics. 0 to disable
+    WARMUP_DURATION = env.int("WARMUP_DURATION", 0)
+    WARMUP_QUERIES = env.int("WARMUP_QUERIES", 0)
+
+    # search stages of performance cases are repeated over one load for mean, stddev and confidence intervals
+    SEARCH_REPEATS = env.int("SEARCH_REPEATS", 1)
+
+    # fraction of serial searches of SQL-backed clients run under EXPLAIN ANALYZE instead, see VectorDB.explain_search
+    EXPLAIN_SAMPLE_RATE = env.float("EXPLAIN_SAMPLE_RATE", 0.0)
+
+    # per-interval cpu, rss, context switches and network bytes of the client during each stage, see ResourceSampler
+    CLIENT_TELEMETRY = env.bool("CLIENT_TELEMETRY", True)
+    CLIENT_TELEMETRY_INTERVAL = env.float("CLIENT_TELEMETRY_INTERVAL", 1.0)
+    CLIENT_CPU_WARN_THRESHOLD = env.float("CLIENT_CPU_WARN_THRESHOLD", 90.0)  # % of the cpus the client may use
+
     RESULTS_LOCAL_DIR = env.path(
         "RESULTS_LOCAL_DIR",
         pathlib.Path(__file__).parent.joinpath("results"),
@@ -47,6 +77,8 @@ class config:
     CUSTOM_CONFIG_DIR = pathlib.Path(__file__).parent.joinpath("custom/custom_case.json")
 
     CAPACITY_TIMEOUT_IN_SECONDS = 24 * 3600  # 24h
+    # relative gaussian noise added to the repeated vectors of capacity cases, 0 to insert exact copies
+    CAPACITY_PERTURBATION = env.float("CAPACITY_PERTURBATION", 0.0)
     LOAD_TIMEOUT_DEFAULT = 24 * 3600  # 24h
     LOAD_TIMEOUT_768D_100K = 24 * 3600  # 24h
     LOAD_TIMEOUT_768D_1M = 24 * 3600  # 24h
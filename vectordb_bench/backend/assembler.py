@@ -5,7 +5,7 @@ from vectordb_bench.backend.data_source import DatasetSource
 from vectordb_bench.backend.filter import FilterOp
 from vectordb_bench.models import TaskConfig
 
-from .cases import CaseLabel
+from .cases import CaseLabel, MixedWorkloadPerformanceCase
 from .task_runner import CaseRunner, RunningStatus, TaskRunner
 
 log = logging.getLogger(__name__)
@@ -18,6 +18,13 @@ class FilterNotSupportedError(ValueError):
         super().__init__(f"{filter_type} Filter test is not supported by {db_name}.")
 
 
+class DeleteNotSupportedError(ValueError):
+    """Raised when a mixed-workload case targets a vector database without delete support."""
+
+    def __init__(self, db_name: str):
+        super().__init__(f"Mixed workload test is not supported by {db_name}, delete_embeddings is not implemented.")
+
+
 class Assembler:
     @classmethod
     def assemble(cls, run_id: str, task: TaskConfig, source: DatasetSource) -> CaseRunner:
@@ -49,6 +56,10 @@ class Assembler:
         perf_runners = [r for r in runners if r.ca.label == CaseLabel.Performance]
         streaming_runners = [r for r in runners if r.ca.label == CaseLabel.Streaming]
 
+        for r in streaming_runners:
+            if isinstance(r.ca, MixedWorkloadPerformanceCase) and not r.config.db.init_cls.delete_supported():
+                raise DeleteNotSupportedError(r.config.db.value)
+
         # group by db
         db2runner: dict[DB, list[CaseRunner]] = {}
         for r in perf_runners:
@@ -1,5 +1,6 @@
 import json
 import logging
+import pathlib
 from enum import Enum, auto
 
 from vectordb_bench import config
@@ -52,6 +53,8 @@ class CaseType(Enum):
     PerformanceCustomDataset = 101
 
     StreamingPerformanceCase = 200
+    MixedWorkloadPerformanceCase = 201
+    TraceReplayPerformanceCase = 202
 
     LabelFilterPerformanceCase = 300
 
@@ -111,6 +114,10 @@ class Case(BaseModel):
     def with_scalar_labels(self) -> bool:
         return self.filters.type == FilterOp.StrEqual
 
+    @property
+    def with_int_filter(self) -> bool:
+        return self.filters.type == FilterOp.NumGE
+
     def check_scalar_labels(self) -> None:
         if self.with_scalar_labels and not self.dataset.data.with_scalar_labels:
             msg = f"Case init failed: no scalar_labels data in current dataset ({self.dataset.data.full_name})"
@@ -126,6 +133,7 @@ class CapacityCase(Case):
     filter_rate: float | None = None
     load_timeout: float | int = config.CAPACITY_TIMEOUT_IN_SECONDS
     optimize_timeout: float | int | None = None
+    perturbation: float = config.CAPACITY_PERTURBATION
 
 
 class PerformanceCase(Case):
@@ -486,6 +494,117 @@ class StreamingPerformanceCase(Case):
         )
 
 
+class MixedWorkloadPerformanceCase(Case):
+    """Load the whole dataset, then churn a part of it with inserts, deletes and upserts while searching.
+
+    Fields:
+        insert_ratio, delete_ratio, upsert_ratio, search_ratio(float): share of each operation
+            issued by every worker, normalized to sum to 1.
+        churn_ratio(float): fraction of the dataset that may be deleted, re-inserted or upserted.
+        write_batch_size(int): rows per insert / delete / upsert request.
+        churn_duration(int): seconds of mixed workload for each concurrency.
+    """
+
+    case_id: CaseType = CaseType.MixedWorkloadPerformanceCase
+    label: CaseLabel = CaseLabel.Streaming
+    dataset_with_size_type: DatasetWithSizeType
+    insert_ratio: float
+    delete_ratio: float
+    upsert_ratio: float
+    search_ratio: float
+    churn_ratio: float = 0.1
+    write_batch_size: int = config.NUM_PER_BATCH
+    churn_duration: int = config.CONCURRENCY_DURATION
+    concurrencies: list[int]
+
+    def __init__(
+        self,
+        dataset_with_size_type: DatasetWithSizeType | str = DatasetWithSizeType.CohereSmall.value,
+        insert_ratio: float = 0.05,
+        delete_ratio: float = 0.05,
+        upsert_ratio: float = 0.1,
+        search_ratio: float = 0.8,
+        concurrencies: list[int] | str = (5, 10),
+        **kwargs,
+    ):
+        ratios = [insert_ratio, delete_ratio, upsert_ratio, search_ratio]
+        if min(ratios) < 0 or sum(ratios) <= 0:
+            msg = f"[mixed_workload_case init] invalid operation ratios: {ratios}"
+            raise ValueError(msg)
+        insert_ratio, delete_ratio, upsert_ratio, search_ratio = [r / sum(ratios) for r in ratios]
+
+        if not isinstance(dataset_with_size_type, DatasetWithSizeType):
+            dataset_with_size_type = DatasetWithSizeType(dataset_with_size_type)
+        dataset = dataset_with_size_type.get_manager()
+        name = (
+            f"Mixed-Workload - {dataset_with_size_type.value}, "
+            f"I/D/U/S={insert_ratio:.2f}/{delete_ratio:.2f}/{upsert_ratio:.2f}/{search_ratio:.2f}"
+        )
+        description = (
+            "This case tests the search performance and recall of vector database while a part of the data "
+            f"is continuously deleted, re-inserted and upserted. (dataset: {dataset_with_size_type.value})"
+        )
+        if isinstance(concurrencies, str):
+            concurrencies = json.loads(concurrencies)
+
+        super().__init__(
+            name=name,
+            description=description,
+            dataset=dataset,
+            dataset_with_size_type=dataset_with_size_type,
+            load_timeout=dataset_with_size_type.get_load_timeout(),
+            optimize_timeout=dataset_with_size_type.get_optimize_timeout(),
+            insert_ratio=insert_ratio,
+            delete_ratio=delete_ratio,
+            upsert_ratio=upsert_ratio,
+            search_ratio=search_ratio,
+            concurrencies=concurrencies,
+            **kwargs,
+        )
+
+
+class TraceReplayPerformanceCase(PerformanceCase):
+    """Load a dataset, then replay a recorded query trace against it instead of the test data.
+
+    Fields:
+        trace_file(str): query trace parquet, see vectordb_bench.backend.trace
+        trace_speedup(float): replay the trace `trace_speedup` times faster than recorded.
+        trace_workers(int): processes sending the queries, should be enough to keep up with the schedule.
+    """
+
+    case_id: CaseType = CaseType.TraceReplayPerformanceCase
+    dataset_with_size_type: DatasetWithSizeType
+    trace_file: str
+    trace_speedup: float = 1.0
+    trace_workers: int = 8
+
+    def __init__(
+        self,
+        trace_file: str,
+        dataset_with_size_type: DatasetWithSizeType | str = DatasetWithSizeType.CohereSmall.value,
+        trace_speedup: float = 1.0,
+        **kwargs,
+    ):
+        if not isinstance(dataset_with_size_type, DatasetWithSizeType):
+            dataset_with_size_type = DatasetWithSizeType(dataset_with_size_type)
+        name = f"Trace-Replay - {dataset_with_size_type.value}, {pathlib.Path(trace_file).name} x{trace_speedup}"
+        description = (
+            "This case replays a recorded query trace with its original timing (scaled by the speedup) "
+            f"against the loaded dataset. (dataset: {dataset_with_size_type.value}, trace: {trace_file})"
+        )
+        super().__init__(
+            name=name,
+            description=description,
+            dataset=dataset_with_size_type.get_manager(),
+            dataset_with_size_type=dataset_with_size_type,
+            load_timeout=dataset_with_size_type.get_load_timeout(),
+            optimize_timeout=dataset_with_size_type.get_optimize_timeout(),
+            trace_file=trace_file,
+            trace_speedup=trace_speedup,
+            **kwargs,
+        )
+
+
 class NewIntFilterPerformanceCase(PerformanceCase):
     case_id: CaseType = CaseType.NewIntFilterPerformanceCase
     dataset_with_size_type: DatasetWithSizeType
@@ -585,6 +704,8 @@ type2case = {
     CaseType.Performance1536D50K: Performance1536D50K,
     CaseType.PerformanceCustomDataset: PerformanceCustomDataset,
     CaseType.StreamingPerformanceCase: StreamingPerformanceCase,
+    CaseType.MixedWorkloadPerformanceCase: MixedWorkloadPerformanceCase,
+    CaseType.TraceReplayPerformanceCase: TraceReplayPerformanceCase,
     CaseType.NewIntFilterPerformanceCase: NewIntFilterPerformanceCase,
     CaseType.LabelFilterPerformanceCase: LabelFilterPerformanceCase,
 }
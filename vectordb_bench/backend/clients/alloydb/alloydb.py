@@ -10,13 +10,16 @@ import psycopg
 from pgvector.psycopg import register_vector
 from psycopg import Connection, Cursor, sql
 
+from ...query_plan import PG_EXPLAIN, pg_plan_summary
 from ..api import VectorDB
+from ..pg_copy import vector_layout, write_binary_copy
+from ..pg_pool import PgSessionPool
 from .config import AlloyDBConfigDict, AlloyDBIndexConfig
 
 log = logging.getLogger(__name__)
 
 
-class AlloyDB(VectorDB):
+class AlloyDB(PgSessionPool, VectorDB):
     """Use psycopg instructions"""
 
     conn: psycopg.Connection[Any] | None = None
@@ -113,18 +116,8 @@ class AlloyDB(VectorDB):
 
         self.conn, self.cursor = self._create_connection(**self.db_config)
 
-        # index configuration may have commands defined that we should set during each client session
-        session_options: Sequence[dict[str, Any]] = self.case_config.session_param()["session_options"]
-
-        if len(session_options) > 0:
-            for setting in session_options:
-                command = sql.SQL("SET {setting_name} " + "= {val};").format(
-                    setting_name=sql.Identifier(setting["parameter"]["setting_name"]),
-                    val=sql.Identifier(str(setting["parameter"]["val"])),
-                )
-                log.debug(command.as_string(self.cursor))
-                self.cursor.execute(command)
-            self.conn.commit()
+        self._set_session_options(self.cursor)
+        self.conn.commit()
 
         self._filtered_search = self._generate_search_query(filtered=True)
         self._unfiltered_search = self._generate_search_query()
@@ -132,11 +125,29 @@ class AlloyDB(VectorDB):
         try:
             yield
         finally:
+            self.close_pool()
             self.cursor.close()
             self.conn.close()
             self.cursor = None
             self.conn = None
 
+    def _connect_kwargs(self) -> dict[str, Any]:
+        return self.db_config
+
+    _register_types = staticmethod(register_vector)
+
+    def _set_session_options(self, cursor: Cursor):
+        # index configuration may have commands defined that we should set during each client session
+        session_options: Sequence[dict[str, Any]] = self.case_config.session_param()["session_options"]
+
+        for setting in session_options:
+            command = sql.SQL("SET {setting_name} " + "= {val};").format(
+                setting_name=sql.Identifier(setting["parameter"]["setting_name"]),
+                val=sql.Identifier(str(setting["parameter"]["val"])),
+            )
+            log.debug(command.as_string(cursor))
+            cursor.execute(command)
+
     def _drop_table(self):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
@@ -309,9 +320,8 @@ class AlloyDB(VectorDB):
                     table_name=sql.Identifier(self.table_name),
                 ),
             ) as copy:
-                copy.set_types(["bigint", "vector"])
-                for i, row in enumerate(metadata_arr):
-                    copy.write_row((row, embeddings_arr[i]))
+                layout = vector_layout(self.cursor, "vector", embeddings_arr.shape[1])
+                write_binary_copy(copy, metadata_arr, embeddings_arr, layout)
             self.conn.commit()
 
             if kwargs.get("last_batch"):
@@ -345,3 +355,11 @@ class AlloyDB(VectorDB):
             result = self.cursor.execute(self._unfiltered_search, (q, k), prepare=True, binary=True)
 
         return [int(i[0]) for i in result.fetchall()]
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        q = np.asarray(query)
+        self.cursor.execute(sql.SQL(PG_EXPLAIN) + self._unfiltered_search, (q, k))
+        return pg_plan_summary(self.cursor.fetchone()[0])
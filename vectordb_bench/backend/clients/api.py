@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Generator
 from contextlib import contextmanager
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, SecretStr, validator
 
@@ -190,6 +192,35 @@ class VectorDB(ABC):
         """
         raise NotImplementedError
 
+    @contextmanager
+    def session(self) -> Generator["VectorDB", None, None]:
+        """A client for one of the threads of a multi-threaded runner, inside `init()`.
+
+        The client itself by default. Clients whose connections can't be shared between threads
+        yield a copy of themselves with a connection of their own.
+
+        Examples:
+            >>> with self.init():
+            >>>     # in each thread
+            >>>     with self.session() as client:
+            >>>         client.insert_embeddings()
+        """
+        yield self
+
+    @contextmanager
+    def dataset_load(self) -> Generator[None, None, None]:
+        """Around the inserts of the whole dataset before `optimize`, like in performance cases, inside `init()`.
+
+        Nothing by default. Clients that load faster with some work deferred until `optimize`, like building
+        the index, turn it off here and back on when the load ends, so that other inserts, like the ones of
+        streaming cases, are left alone.
+
+        Examples:
+            >>> with self.init(), self.dataset_load():
+            >>>     self.insert_embeddings()
+        """
+        yield
+
     def need_normalize_cosine(self) -> bool:
         """Wheather this database need to normalize dataset to support COSINE"""
         return False
@@ -215,6 +246,80 @@ class VectorDB(ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def delete_supported(cls) -> bool:
+        """Ensure that the client implements deletion before running mixed-workload cases."""
+        return cls.delete_embeddings is not VectorDB.delete_embeddings
+
+    def delete_embeddings(
+        self,
+        metadata: list[int],
+        **kwargs,
+    ) -> tuple[int, Exception]:
+        """Delete the embeddings with the given ids from the vector database.
+
+        Optional, only required by the mixed-workload (churn) cases.
+
+        Args:
+            metadata(list[int]): ids of the embeddings to delete, the same ids used in insert_embeddings.
+            **kwargs(Any): vector database specific parameters.
+
+        Returns:
+            int: deleted data count
+        """
+        raise NotImplementedError
+
+    def upsert_embeddings(
+        self,
+        embeddings: list[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[int, Exception]:
+        """Insert or replace the embeddings with the given ids.
+
+        Optional, only required by the mixed-workload (churn) cases. The default implementation
+        deletes the ids first and inserts them again, clients with a native upsert should override it.
+
+        Returns:
+            int: upserted data count
+        """
+        _, error = self.delete_embeddings(metadata, **kwargs)
+        if error is not None:
+            return 0, error
+        return self.insert_embeddings(embeddings, metadata, labels_data=labels_data, **kwargs)
+
+    @classmethod
+    def count_supported(cls) -> bool:
+        """Whether the client can count the embeddings of its collection, see `count_embeddings`"""
+        return cls.count_embeddings is not VectorDB.count_embeddings
+
+    def count_embeddings(self) -> int:
+        """Number of embeddings in the collection, after `init`.
+
+        Optional, used to check that the collection loaded before an interrupted run is still
+        in the database before a resumed run skips loading it again.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def evict_supported(cls) -> bool:
+        """Whether the client can evict its collection from the caches of the database, see `evict_cache`"""
+        return cls.evict_cache is not VectorDB.evict_cache
+
+    def evict_cache(self):
+        """Evict the collection from the memory of the database, after `init`, for the cold-cache pass of
+        performance cases, like by releasing the collection and loading it again.
+
+        Optional, returns once the collection is searchable again.
+        """
+        raise NotImplementedError
+
+    def inserts_wait_for_optimize(self) -> bool:
+        """Whether inserted embeddings only become searchable once `optimize` returns, like the rows staged
+        by a bulk import, which only the load of performance cases waits for."""
+        return False
+
     @abstractmethod
     def search_embedding(
         self,
@@ -233,8 +338,38 @@ class VectorDB(ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def explain_supported(cls) -> bool:
+        """Whether the client can sample the plans of its searches, see `explain_search`"""
+        return cls.explain_search is not VectorDB.explain_search
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        """Run the search of `search_embedding(query, k)` under the engine's EXPLAIN ANALYZE,
+        like `EXPLAIN (ANALYZE, BUFFERS)` of Postgres, for the plan sampling of serial search.
+
+        Returns:
+            dict: the plan summarized by a parser of `backend.query_plan`, like
+                {"scan_type": "Index Scan", "execution_ms": 1.2, "shared_hit_blocks": 330, ...}
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def replica_counts_supported(cls) -> bool:
+        """Whether the client can count the searches served by each replica, see `replica_search_counts`"""
+        return cls.replica_search_counts is not VectorDB.replica_search_counts
+
+    def replica_search_counts(self) -> dict[str, float]:
+        """Searches served by each replica of the collection so far, by the engine's own counters, for the
+        QPS of each replica in the concurrent search. Called between the concurrencies, after `init`.
+
+        Returns:
+            dict: a cumulative count of each replica, like {"rg1/1": 120000.0, "rg2/2": 118000.0},
+                empty if the engine isn't set up to report them
+        """
+        raise NotImplementedError
+
     @abstractmethod
-    def optimize(self, data_size: int | None = None):
+    def optimize(self, data_size: int | None = None) -> dict[str, Any] | None:
         """optimize will be called between insertion and search in performance cases.
 
         Should be blocked until the vectorDB is ready to be tested on
@@ -242,5 +377,11 @@ class VectorDB(ABC):
 
         Time(insert the dataset) + Time(optimize) will be recorded as "load_duration" metric
         Optimize's execution time is limited, the limited time is based on cases.
+
+        Returns:
+            dict, optional: stats of the index build, recorded as the "index_build_*" metrics, like
+                {"phases": {"building index: loading tuples": 3600.0}, "tuples_per_sec": 2777.78},
+                and of the bulk import of the loaded data, as the "bulk_import_*" metrics, like
+                {"import_duration": 600.0, "import_rows_per_sec": 16666.67}
         """
         raise NotImplementedError
@@ -149,6 +149,20 @@ class ElasticCloud(VectorDB):
             log.warning(f"Failed to insert data: {self.indice} error: {e!s}")
             return (0, e)
 
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        """Documents are indexed with generated _id, so delete them by the id column."""
+        assert self.client is not None, "should self.init() first"
+        try:
+            res = self.client.delete_by_query(
+                index=self.indice,
+                query={"terms": {self.id_col_name: list(metadata)}},
+                conflicts="proceed",
+            )
+            return (res["deleted"], None)
+        except Exception as e:
+            log.warning(f"Failed to delete data: {self.indice} error: {e!s}")
+            return (0, e)
+
     def prepare_filter(self, filters: Filter):
         self.routing_key = None
         if filters.type == FilterOp.NonFilter:
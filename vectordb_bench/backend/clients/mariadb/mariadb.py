@@ -1,9 +1,11 @@
 import logging
 from contextlib import contextmanager
+from typing import Any
 
 import mariadb
 import numpy as np
 
+from ...query_plan import MARIADB_EXPLAIN, mariadb_plan_summary
 from ..api import VectorDB
 from .config import MariaDBConfigDict, MariaDBIndexConfig
 
@@ -206,3 +208,10 @@ class MariaDB(VectorDB):
             self.cursor.execute(self.select_sql, (self.vector_to_hex(query), k))
 
         return [id for (id,) in self.cursor.fetchall()]  # noqa: A001
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        self.cursor.execute(MARIADB_EXPLAIN + self.select_sql, (self.vector_to_hex(query), k))
+        return mariadb_plan_summary(self.cursor.fetchone()[0])
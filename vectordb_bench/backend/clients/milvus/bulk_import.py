@@ -0,0 +1,169 @@
+"""Load path of Milvus through bulk import, instead of inserting rows over gRPC"""
+
+import io
+import logging
+import time
+import uuid
+from typing import Any
+from urllib.parse import urlparse
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pymilvus import BulkInsertState, utility
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL = 5  # seconds between polls of the import tasks
+FILE_BYTES = 256 * 1024 * 1024  # vectors buffered into each staged file
+TASKS_DIR = "tasks"  # markers of the submitted tasks, named by their ids
+
+
+def parse_storage_url(url: str) -> dict[str, Any]:
+    """`http://<access_key>:<secret_key>@<host>:<port>/<bucket>`, https for a secure connection.
+
+    The bucket is the one the Milvus server reads its data from, `minio.bucketName` of milvus.yaml.
+    """
+    parsed = urlparse(url)
+    bucket = parsed.path.strip("/")
+    if parsed.scheme not in ("http", "https") or not parsed.hostname or not bucket:
+        msg = f"bulk import storage must be like http://<access_key>:<secret_key>@<host>:<port>/<bucket>, got {url}"
+        raise ValueError(msg)
+    return {
+        "endpoint": parsed.netloc.rpartition("@")[2],
+        "access_key": parsed.username,
+        "secret_key": parsed.password,
+        "secure": parsed.scheme == "https",
+        "bucket": bucket,
+    }
+
+
+def encode_parquet(columns: dict[str, Any]) -> bytes:
+    """a file of the columns in the Parquet format of Milvus bulk import, vectors as lists of float32"""
+    arrays = {}
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray) and values.ndim == 2:
+            flat = pa.array(values.astype(np.float32).ravel())
+            arrays[name] = pa.FixedSizeListArray.from_arrays(flat, values.shape[1]).cast(pa.list_(pa.float32()))
+        else:
+            arrays[name] = pa.array(values)
+    buf = io.BytesIO()
+    pq.write_table(pa.table(arrays), buf)
+    return buf.getvalue()
+
+
+class BulkImporter:
+    """Stages batches as Parquet files in the object storage of the Milvus server and imports them.
+
+    `add` buffers the small batches of the insert runners, about `file_bytes` of vectors are staged at once:
+    uploaded as one file whose import task is submitted without waiting for it. The tasks run on the server
+    while the next files are staged, `wait` polls them until all are done and deletes the staged files. Each
+    importer writes under a prefix of its own and records the ids of its tasks there, so that `wait` finds them
+    from another process.
+
+    Not thread-safe, it is meant for the serial load of the dataset.
+
+    Examples:
+        >>> importer = BulkImporter(parse_storage_url(url), "VDBBench")
+        >>> importer.add({"pk": ids, "id": ids, "vector": embeddings})
+        >>> importer.flush()
+        >>> importer.wait()
+    """
+
+    def __init__(self, storage: dict[str, Any], collection_name: str, file_bytes: int = FILE_BYTES):
+        self.storage = storage
+        self.collection_name = collection_name
+        self.file_bytes = file_bytes
+        self.prefix = f"vdbbench/{collection_name}/{uuid.uuid4().hex}"
+        self._buffer: list[dict[str, Any]] = []
+        self._buffered_bytes = 0
+
+    def _client(self):
+        from minio import Minio
+
+        return Minio(
+            self.storage["endpoint"],
+            access_key=self.storage["access_key"],
+            secret_key=self.storage["secret_key"],
+            secure=self.storage["secure"],
+        )
+
+    def _put(self, client: Any, key: str, data: bytes):
+        client.put_object(self.storage["bucket"], key, io.BytesIO(data), len(data))
+
+    def add(self, columns: dict[str, Any]):
+        """buffer a batch, with its vectors in column "vector", stage the buffer once it is large enough"""
+        vectors = np.asarray(columns["vector"], dtype=np.float32)
+        self._buffer.append({**columns, "vector": vectors})
+        self._buffered_bytes += vectors.nbytes
+        if self._buffered_bytes >= self.file_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        columns = {}
+        for name in self._buffer[0]:
+            chunks = [batch[name] for batch in self._buffer]
+            columns[name] = np.concatenate(chunks) if name == "vector" else [v for c in chunks for v in c]
+        self._buffer, self._buffered_bytes = [], 0
+        self.stage(columns)
+
+    def stage(self, columns: dict[str, Any]) -> int:
+        """upload a batch and submit its import, returns the id of the task"""
+        client = self._client()
+        key = f"{self.prefix}/{uuid.uuid4().hex}.parquet"
+        self._put(client, key, encode_parquet(columns))
+        task_id = utility.do_bulk_insert(collection_name=self.collection_name, files=[key])
+        self._put(client, f"{self.prefix}/{TASKS_DIR}/{task_id}", b"")
+        log.debug(f"Submitted bulk import task {task_id} of {key}")
+        return task_id
+
+    def task_ids(self) -> list[int]:
+        objects = self._client().list_objects(self.storage["bucket"], prefix=f"{self.prefix}/{TASKS_DIR}/")
+        return [int(o.object_name.rpartition("/")[2]) for o in objects]
+
+    def wait(self, poll_interval: float = POLL_INTERVAL) -> dict[str, float]:
+        """Wait for all the staged imports, returns how many rows were imported and how fast.
+
+        The import duration is from the creation of the first task, by the server clock, to the last poll.
+        """
+        pending = set(self.task_ids())
+        if not pending:
+            return {}
+        log.info(f"Waiting for {len(pending)} bulk import tasks of {self.collection_name}")
+        first_created, rows = None, 0
+        while pending:
+            for task_id in sorted(pending):
+                state = utility.get_bulk_insert_state(task_id=task_id)
+                if state.state in (BulkInsertState.ImportFailed, BulkInsertState.ImportFailedAndCleaned):
+                    msg = (
+                        f"bulk import task {task_id} failed: {state.failed_reason}, "
+                        f"the staged files are left under {self.storage['bucket']}/{self.prefix}"
+                    )
+                    raise RuntimeError(msg)
+                if state.state == BulkInsertState.ImportCompleted:
+                    pending.discard(task_id)
+                    rows += state.row_count
+                    created = state.create_timestamp
+                    first_created = created if first_created is None else min(first_created, created)
+            if pending:
+                time.sleep(poll_interval)
+
+        duration = max(time.time() - first_created, 1e-6)
+        stats = {
+            "import_rows": rows,
+            "import_duration": round(duration, 4),
+            "import_rows_per_sec": round(rows / duration, 4),
+        }
+        log.info(f"Bulk imported {rows} rows into {self.collection_name}: {stats}")
+        self.cleanup()
+        return stats
+
+    def cleanup(self):
+        """delete the staged files and task markers of this importer, once their imports are done"""
+        client = self._client()
+        objects = list(client.list_objects(self.storage["bucket"], prefix=f"{self.prefix}/", recursive=True))
+        for o in objects:
+            client.remove_object(self.storage["bucket"], o.object_name)
+        log.debug(f"Deleted {len(objects)} staged objects under {self.prefix}")
@@ -10,6 +10,7 @@ from vectordb_bench.cli.cli import (
     HNSWFlavor3,
     IVFFlatTypedDictN,
     cli,
+    click_arg_split,
     click_parameter_decorators_from_typed_dict,
     run,
 )
@@ -52,6 +53,38 @@ class MilvusTypedDict(TypedDict):
             show_default=True,
         ),
     ]
+    resource_groups: Annotated[
+        list[str],
+        click.option(
+            "--resource-groups",
+            type=str,
+            help="Comma-separated resource groups to load the replicas in",
+            required=False,
+            callback=click_arg_split,
+        ),
+    ]
+    metrics_urls: Annotated[
+        list[str],
+        click.option(
+            "--metrics-urls",
+            type=str,
+            help="Comma-separated metrics endpoints of the query nodes, like http://querynode-0:9091/metrics, "
+            "to report the QPS of each replica in the concurrent search",
+            required=False,
+            callback=click_arg_split,
+        ),
+    ]
+    bulk_import_storage: Annotated[
+        str | None,
+        click.option(
+            "--bulk-import-storage",
+            type=str,
+            help="Load the dataset through bulk import, staged in the object storage of the Milvus server, "
+            "like http://<access_key>:<secret_key>@<host>:9000/<bucket>, instead of inserting rows. "
+            "Performance cases only",
+            required=False,
+        ),
+    ]
 
 
 class MilvusAutoIndexTypedDict(CommonTypedDict, MilvusTypedDict): ...
@@ -71,6 +104,11 @@ def MilvusAutoIndex(**parameters: Unpack[MilvusAutoIndexTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=AutoIndexConfig(),
         **parameters,
@@ -91,6 +129,11 @@ def MilvusFlat(**parameters: Unpack[MilvusAutoIndexTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=FLATConfig(),
         **parameters,
@@ -128,6 +171,11 @@ def MilvusHNSW(**parameters: Unpack[MilvusHNSWTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=HNSWConfig(
             M=parameters["m"],
@@ -194,6 +242,11 @@ def MilvusHNSWPQ(**parameters: Unpack[MilvusHNSWPQTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=HNSWPQConfig(
             M=parameters["m"],
@@ -239,6 +292,11 @@ def MilvusHNSWPRQ(**parameters: Unpack[MilvusHNSWPRQTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=HNSWPRQConfig(
             M=parameters["m"],
@@ -281,6 +339,11 @@ def MilvusHNSWSQ(**parameters: Unpack[MilvusHNSWSQTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=HNSWSQConfig(
             M=parameters["m"],
@@ -313,6 +376,11 @@ def MilvusIVFFlat(**parameters: Unpack[MilvusIVFFlatTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=IVFFlatConfig(
             nlist=parameters["nlist"],
@@ -336,6 +404,11 @@ def MilvusIVFSQ8(**parameters: Unpack[MilvusIVFFlatTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=IVFSQ8Config(
             nlist=parameters["nlist"],
@@ -398,6 +471,11 @@ def MilvusIVFRabitQ(**parameters: Unpack[MilvusIVFRABITQTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=IVFRABITQConfig(
             nlist=parameters["nlist"],
@@ -429,6 +507,11 @@ def MilvusDISKANN(**parameters: Unpack[MilvusDISKANNTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=DISKANNConfig(
             search_list=parameters["search_list"],
@@ -459,6 +542,11 @@ def MilvusGPUIVFFlat(**parameters: Unpack[MilvusGPUIVFTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=GPUIVFFlatConfig(
             nlist=parameters["nlist"],
@@ -495,6 +583,11 @@ def MilvusGPUBruteForce(**parameters: Unpack[MilvusGPUBruteForceTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=GPUBruteForceConfig(
             metric_type=parameters["metric_type"],
@@ -528,6 +621,11 @@ def MilvusGPUIVFPQ(**parameters: Unpack[MilvusGPUIVFPQTypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=GPUIVFPQConfig(
             nlist=parameters["nlist"],
@@ -569,6 +667,11 @@ def MilvusGPUCAGRA(**parameters: Unpack[MilvusGPUCAGRATypedDict]):
             password=SecretStr(parameters["password"]) if parameters["password"] else None,
             num_shards=int(parameters["num_shards"]),
             replica_number=int(parameters["replica_number"]),
+            resource_groups=parameters["resource_groups"] or None,
+            metrics_urls=parameters["metrics_urls"] or None,
+            bulk_import_storage=(
+                SecretStr(parameters["bulk_import_storage"]) if parameters["bulk_import_storage"] else None
+            ),
         ),
         db_case_config=GPUCAGRAConfig(
             intermediate_graph_degree=parameters["intermediate_graph_degree"],
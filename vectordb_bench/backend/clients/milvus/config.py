@@ -9,6 +9,11 @@ class MilvusConfig(DBConfig):
     password: SecretStr | None = None
     num_shards: int = 1
     replica_number: int = 1
+    resource_groups: list[str] | None = None  # to load the replicas in, by default the server's default group
+    # metrics endpoints of the query nodes, like http://querynode-0:9091/metrics, for the QPS of each replica
+    metrics_urls: list[str] | None = None
+    # load through bulk import from this object storage, see bulk_import.parse_storage_url, instead of row inserts
+    bulk_import_storage: SecretStr | None = None
 
     def to_dict(self) -> dict:
         return {
@@ -17,14 +22,24 @@ class MilvusConfig(DBConfig):
             "password": self.password.get_secret_value() if self.password else None,
             "num_shards": self.num_shards,
             "replica_number": self.replica_number,
+            "resource_groups": self.resource_groups,
+            "metrics_urls": self.metrics_urls,
+            "bulk_import_storage": self.bulk_import_storage.get_secret_value() if self.bulk_import_storage else None,
         }
 
+    @validator("resource_groups", "metrics_urls", pre=True)
+    def split_comma_separated(cls, v: any):
+        """a comma-separated string, like from the text input of the frontend, into a list, None if empty"""
+        if isinstance(v, str):
+            v = [c.strip() for c in v.split(",") if c.strip()]
+        return v or None
+
     @validator("*")
     def not_empty_field(cls, v: any, field: any):
         if (
             field.name in cls.common_short_configs()
             or field.name in cls.common_long_configs()
-            or field.name in ["user", "password"]
+            or field.name in ["user", "password", "bulk_import_storage"]
         ):
             return v
         if isinstance(v, str | SecretStr) and len(v) == 0:
@@ -38,6 +53,7 @@ class MilvusIndexConfig(BaseModel):
     index: IndexType
     metric_type: MetricType | None = None
     use_partition_key: bool = True  # for label-filter
+    partition_key_isolation: bool = False  # an index per partition key, for label-filter with the partition key
 
     @property
     def is_gpu_index(self) -> bool:
@@ -10,7 +10,9 @@ from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, Milvus
 from vectordb_bench.backend.filter import Filter, FilterOp
 
 from ..api import VectorDB
+from .bulk_import import BulkImporter, parse_storage_url
 from .config import MilvusIndexConfig
+from .replicas import replica_search_counts, scrape_search_counts
 
 log = logging.getLogger(__name__)
 
@@ -37,9 +39,14 @@ class Milvus(VectorDB):
     ):
         """Initialize wrapper around the milvus vector database."""
         self.name = name
-        self.db_config = db_config
+        self.db_config = dict(db_config)
         self.case_config = db_case_config
         self.collection_name = collection_name
+        bulk_import_storage = self.db_config.pop("bulk_import_storage", None)
+        self.bulk_importer = (
+            BulkImporter(parse_storage_url(bulk_import_storage), collection_name) if bulk_import_storage else None
+        )
+        self.metrics_urls = self.db_config.pop("metrics_urls", None) or []
         self.batch_size = int(MILVUS_LOAD_REQS_SIZE / (dim * 4))
         self.with_scalar_labels = with_scalar_labels
 
@@ -83,16 +90,22 @@ class Milvus(VectorDB):
 
             log.info(f"{self.name} create collection: {self.collection_name}")
 
+            properties = {}
+            if self.with_scalar_labels and db_case_config.use_partition_key and db_case_config.partition_key_isolation:
+                # an index per label, searched alone by the label filters
+                properties["partitionkey.isolation"] = True
+
             # Create the collection
             col = Collection(
                 name=self.collection_name,
                 schema=CollectionSchema(fields),
                 consistency_level="Session",
                 num_shards=self.db_config.get("num_shards", 1),
+                properties=properties,
             )
 
             self.create_index()
-            col.load(replica_number=self.db_config.get("replica_number", 1))
+            self._load(col)
 
         connections.disconnect("default")
 
@@ -139,16 +152,33 @@ class Milvus(VectorDB):
         self.col = Collection(self.collection_name)
 
         yield
+        if self.bulk_importer is not None:
+            self.bulk_importer.flush()
         connections.disconnect("default")
 
-    def _optimize(self):
+    def _load(self, col: Collection, refresh: bool = False):
+        """load the collection in the replicas and resource groups of the config"""
+        kwargs = {"refresh": True} if refresh else {}
+        if self.db_config.get("resource_groups"):
+            kwargs["_resource_groups"] = self.db_config["resource_groups"]
+        col.load(replica_number=self.db_config.get("replica_number"), **kwargs)
+
+    def evict_cache(self):
+        """release the collection from the query nodes and load it again from the object storage"""
+        assert self.col is not None
+        self.col.release()
+        self._load(self.col)
+
+    def _optimize(self) -> dict | None:
         log.info(f"{self.name} optimizing before search")
+        import_stats = self.bulk_importer.wait() if self.bulk_importer is not None else None
         self._post_insert()
         try:
-            self.col.load(refresh=True)
+            self._load(self.col, refresh=True)
         except Exception as e:
             log.warning(f"{self.name} optimize error: {e}")
             raise e from None
+        return import_stats
 
     def _post_insert(self):
         try:
@@ -187,9 +217,9 @@ class Milvus(VectorDB):
             log.warning(f"{self.name} optimize error: {e}")
             raise e from None
 
-    def optimize(self, data_size: int | None = None):
+    def optimize(self, data_size: int | None = None) -> dict | None:
         assert self.col, "Please call self.init() before"
-        self._optimize()
+        return self._optimize()
 
     def need_normalize_cosine(self) -> bool:
         """Wheather this database need to normalize dataset to support COSINE"""
@@ -210,6 +240,9 @@ class Milvus(VectorDB):
         # use the first insert_embeddings to init collection
         assert self.col is not None
         assert len(embeddings) == len(metadata)
+        if self.bulk_importer is not None:
+            return self._stage_embeddings(embeddings, metadata, labels_data)
+
         insert_count = 0
         try:
             for batch_start_offset in range(0, len(embeddings), self.batch_size):
@@ -228,6 +261,72 @@ class Milvus(VectorDB):
             return insert_count, e
         return insert_count, None
 
+    def inserts_wait_for_optimize(self) -> bool:
+        return self.bulk_importer is not None
+
+    def _stage_embeddings(
+        self,
+        embeddings: Iterable[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+    ) -> tuple[int, Exception]:
+        """bulk import mode, the rows are imported by the end of init() and waited for by optimize()"""
+        columns = {self._primary_field: metadata, self._scalar_id_field: metadata, self._vector_field: embeddings}
+        if self.with_scalar_labels:
+            columns[self._scalar_label_field] = labels_data
+        try:
+            self.bulk_importer.add(columns)
+        except Exception as e:
+            log.info(f"Failed to stage data for bulk import: {e}")
+            return 0, e
+        return len(metadata), None
+
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        """Delete embeddings by primary key. should call self.init() first"""
+        assert self.col is not None
+        delete_count = 0
+        try:
+            for batch_start_offset in range(0, len(metadata), self.batch_size):
+                ids = metadata[batch_start_offset : batch_start_offset + self.batch_size]
+                res = self.col.delete(expr=f"{self._primary_field} in {list(ids)}")
+                delete_count += res.delete_count
+        except MilvusException as e:
+            log.info(f"Failed to delete data: {e}")
+            return delete_count, e
+        return delete_count, None
+
+    def upsert_embeddings(
+        self,
+        embeddings: Iterable[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[int, Exception]:
+        """Upsert embeddings into Milvus. should call self.init() first"""
+        assert self.col is not None
+        assert len(embeddings) == len(metadata)
+        upsert_count = 0
+        try:
+            for batch_start_offset in range(0, len(embeddings), self.batch_size):
+                batch_end_offset = min(batch_start_offset + self.batch_size, len(embeddings))
+                upsert_data = [
+                    metadata[batch_start_offset:batch_end_offset],
+                    metadata[batch_start_offset:batch_end_offset],
+                    embeddings[batch_start_offset:batch_end_offset],
+                ]
+                if self.with_scalar_labels:
+                    upsert_data.append(labels_data[batch_start_offset:batch_end_offset])
+                res = self.col.upsert(upsert_data)
+                upsert_count += res.upsert_count
+        except MilvusException as e:
+            log.info(f"Failed to upsert data: {e}")
+            return upsert_count, e
+        return upsert_count, None
+
+    def count_embeddings(self) -> int:
+        assert self.col is not None
+        return self.col.num_entities
+
     def prepare_filter(self, filters: Filter):
         if filters.type == FilterOp.NonFilter:
             self.expr = ""
@@ -239,6 +338,19 @@ class Milvus(VectorDB):
             msg = f"Not support Filter for Milvus - {filters}"
             raise ValueError(msg)
 
+        self._search_param = self.case_config.search_param()
+        try:
+            from .search import IdSearch
+
+            self._id_search = IdSearch(self.collection_name, self._vector_field, self._search_param, self.expr)
+            self._id_search.stub  # noqa: B018
+            self._id_search.guarantee_ts()
+            # the first search prepares its request through the SDK, the vector is swapped in on later ones
+            self._id_search.request([0.0], 1)
+        except (ImportError, AttributeError, TypeError) as e:
+            log.warning(f"{self.name} searches through Collection.search, the SDK lacks the internals of IdSearch: {e}")
+            self._id_search = None
+
     def search_embedding(
         self,
         query: list[float],
@@ -248,14 +360,24 @@ class Milvus(VectorDB):
         """Perform a search on a query embedding and return results."""
         assert self.col is not None
 
-        # Perform the search.
+        if self._id_search is not None:
+            return self._id_search(query, k, timeout)
+
         res = self.col.search(
             data=[query],
             anns_field=self._vector_field,
-            param=self.case_config.search_param(),
+            param=self._search_param,
             limit=k,
             expr=self.expr,
+            output_fields=[],
+            timeout=timeout,
+        )
+        return list(res[0].ids)
+
+    def replica_search_counts(self) -> dict[str, float]:
+        """by the search counters of the query nodes, scraped from the `metrics_urls` of the config"""
+        if not self.metrics_urls:
+            return {}
+        return replica_search_counts(
+            self.col.get_replicas().groups, scrape_search_counts(self.metrics_urls), self.col.num_shards
         )
-
-        # Organize results.
-        return [result.id for result in res[0]]
@@ -0,0 +1,51 @@
+"""Searches served by each replica of a Milvus collection, from the Prometheus metrics of the query nodes.
+
+A search is routed to one replica, whose shard leaders fan it out to the query nodes of the replica. The search
+counter of the query nodes, summed over the nodes of each replica, counts what each replica served: a multiple of
+the searches, by the shards of the collection, which is the same for every replica. The counts are divided by the
+shards, so that they add up to the searches of the collection.
+"""
+
+import logging
+import re
+import urllib.request
+from collections import defaultdict
+from collections.abc import Iterable
+
+log = logging.getLogger(__name__)
+
+SEARCH_COUNTER = "milvus_querynode_sq_count"
+METRICS_TIMEOUT = 10  # seconds
+
+_SAMPLE = re.compile(rf"^{SEARCH_COUNTER}(?:_total)?\{{(?P<labels>[^}}]*)\}}\s+(?P<value>\S+)")
+_LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+def parse_search_counts(text: str) -> dict[int, float]:
+    """successful searches of each query node, by node id, in a page of Prometheus metrics"""
+    counts = defaultdict(float)
+    for line in text.splitlines():
+        sample = _SAMPLE.match(line)
+        if sample is None:
+            continue
+        labels = dict(_LABEL.findall(sample.group("labels")))
+        if labels.get("query_type") == "search" and labels.get("status") == "success":
+            counts[int(labels["node_id"])] += float(sample.group("value"))
+    return dict(counts)
+
+
+def scrape_search_counts(urls: Iterable[str]) -> dict[int, float]:
+    """`parse_search_counts` of the metrics of every query node, like http://querynode-0:9091/metrics"""
+    counts = {}
+    for url in urls:
+        with urllib.request.urlopen(url, timeout=METRICS_TIMEOUT) as resp:  # noqa: S310
+            counts.update(parse_search_counts(resp.read().decode()))
+    return counts
+
+
+def replica_search_counts(groups: Iterable, node_counts: dict[int, float], num_shards: int = 1) -> dict[str, float]:
+    """searches served by each replica group of `Collection.get_replicas()`, the sum of the counts of its nodes
+    divided by the `num_shards` of the collection, keyed by `<resource group>/<replica id>`"""
+    return {
+        f"{g.resource_group}/{g.id}": sum(node_counts.get(n, 0.0) for n in g.group_nodes) / num_shards for g in groups
+    }
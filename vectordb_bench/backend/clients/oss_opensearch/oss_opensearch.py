@@ -398,6 +398,37 @@ class OSSOpenSearch(VectorDB):
 
         return (total_count, None)
 
+    def _id_query(self, metadata: list[int]) -> dict:
+        if self.id_col_name == "_id":
+            return {"ids": {"values": [str(i) for i in metadata]}}
+        return {"terms": {self.id_col_name: list(metadata)}}
+
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception | None]:
+        """Delete by query so that documents written with a routing key are found on any shard."""
+        assert self.client is not None, "should self.init() first"
+        try:
+            resp = self.client.delete_by_query(
+                index=self.index_name,
+                body={"query": self._id_query(metadata)},
+                conflicts="proceed",
+            )
+            return resp["deleted"], None
+        except Exception as e:
+            log.warning(f"Failed to delete data: {self.index_name} error: {e!s}")
+            return 0, e
+
+    def upsert_embeddings(
+        self,
+        embeddings: Iterable[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[int, Exception | None]:
+        """Bulk `index` actions replace the document with the same _id in place."""
+        if self.id_col_name == "_id":
+            return self.insert_embeddings(embeddings, metadata, labels_data=labels_data, **kwargs)
+        return super().upsert_embeddings(embeddings, metadata, labels_data=labels_data, **kwargs)
+
     def _update_ef_search_before_search(self, client: OpenSearch):
         ef_search_value = self.case_config.efSearch
 
@@ -0,0 +1,114 @@
+"""Binary COPY encoding of vector batches, shared by the Postgres-family clients"""
+
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from psycopg import Copy, Cursor, pq
+from psycopg.adapt import PyFormat, Transformer
+
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + b"\x00" * 8  # signature, flags and header extension length
+COPY_TRAILER = b"\xff\xff"
+COPY_CHUNK_BYTES = 8 * 1024 * 1024  # rows are encoded and sent in chunks of about this size
+
+
+@dataclass(frozen=True)
+class VectorLayout:
+    """binary format of a vector value, a constant header, like the dimension, followed by the elements"""
+
+    header: bytes
+    dtype: np.dtype  # of the elements, with their byte order
+
+
+def vector_layout(cursor: Cursor, type_name: str, dim: int, dtype: str = "f4") -> VectorLayout:
+    """Layout of `type_name` values with `dim` elements of `dtype`.
+
+    It is probed from the binary dumper registered on the connection, the one `copy.set_types` would use,
+    like `pgvector.psycopg.register_vector`, so that extensions with different formats share one encoder.
+    """
+    tx = Transformer(cursor)
+    tx.set_dumper_types([cursor.adapters.types.get_oid(type_name)], pq.Format.BINARY)
+    probe = (np.arange(dim) % 997 + 1).astype(dtype)
+    payload = bytes(tx.dump_sequence([probe], [PyFormat.BINARY])[0])
+    for order in (">", "<"):
+        elements = probe.astype(probe.dtype.newbyteorder(order)).tobytes()
+        if payload.endswith(elements):
+            return VectorLayout(header=payload[: -len(elements)], dtype=probe.dtype.newbyteorder(order))
+    msg = f"unsupported binary format of {type_name}: {payload[:16]!r}..."
+    raise ValueError(msg)
+
+
+def halfvec_layout(dim: int) -> VectorLayout:
+    """pgvector `halfvec`, its psycopg dumper only takes HalfVector objects, so it can't be probed from an array"""
+    return VectorLayout(header=struct.pack(">HH", dim, 0), dtype=np.dtype(">f2"))
+
+
+def bit_layout(dim: int) -> VectorLayout:
+    """Postgres `bit(dim)`, the bit length followed by the bits packed by `np.packbits`, most significant first"""
+    return VectorLayout(header=struct.pack(">i", dim), dtype=np.dtype("u1"))
+
+
+def row_dtype(layout: VectorLayout, dim: int) -> np.dtype:
+    """a (bigint, vector) tuple: field count, then the length and the value of each field"""
+    fields = [("num_fields", ">i2"), ("id_len", ">i4"), ("id", ">i8"), ("vector_len", ">i4")]
+    if layout.header:
+        fields.append(("vector_header", f"V{len(layout.header)}"))
+    fields.append(("vector", layout.dtype, (dim,)))
+    return np.dtype(fields)
+
+
+def encode_rows(
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    layout: VectorLayout,
+    labels: Sequence[str] | None = None,
+) -> memoryview | bytes:
+    """(bigint id, vector[, varchar label]) tuples in the binary COPY format, without the signature and trailer"""
+    n, dim = vectors.shape
+    dtype = row_dtype(layout, dim)
+    rows = np.empty(n, dtype=dtype)
+    rows["num_fields"] = 2 if labels is None else 3
+    rows["id_len"] = 8
+    rows["id"] = ids
+    rows["vector_len"] = len(layout.header) + dim * layout.dtype.itemsize
+    if layout.header:
+        rows["vector_header"] = np.void(layout.header)
+    rows["vector"] = vectors
+    if labels is None:
+        return rows.view(np.uint8).data  # a byte buffer for copy.write, without copying the rows
+
+    # labels have variable lengths, interleave them with the fixed-size part of the tuples
+    fixed, width = rows.tobytes(), dtype.itemsize
+    out = bytearray()
+    for i, label in enumerate(labels):
+        b = label.encode()
+        out += fixed[i * width : (i + 1) * width]
+        out += struct.pack(">i", len(b))
+        out += b
+    return bytes(out)
+
+
+def write_binary_copy(
+    copy: Copy,
+    ids: Sequence[int] | np.ndarray,
+    vectors: Sequence[Sequence[float]] | np.ndarray,
+    layout: VectorLayout,
+    labels: Sequence[str] | None = None,
+    chunk_bytes: int = COPY_CHUNK_BYTES,
+):
+    """Send a whole batch to a `COPY ... FROM STDIN (FORMAT BINARY)`, instead of `copy.write_row` per row.
+
+    Examples:
+        >>> with cursor.copy("COPY items FROM STDIN (FORMAT BINARY)") as copy:
+        >>>     write_binary_copy(copy, ids, embeddings, vector_layout(cursor, "vector", dim))
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.asarray(vectors)
+    rows_per_chunk = max(1, chunk_bytes // row_dtype(layout, vectors.shape[1]).itemsize)
+    copy.write(COPY_SIGNATURE)
+    for start in range(0, len(ids), rows_per_chunk):
+        end = start + rows_per_chunk
+        chunk_labels = labels[start:end] if labels is not None else None
+        copy.write(encode_rows(ids[start:end], vectors[start:end], layout, chunk_labels))
+    copy.write(COPY_TRAILER)
@@ -0,0 +1,80 @@
+"""Connection pool shared by the threads of a Postgres-family client"""
+
+import copy
+import logging
+import os
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+from psycopg import Connection, Cursor
+from psycopg_pool import ConnectionPool
+
+from ... import config
+
+log = logging.getLogger(__name__)
+
+
+class PgSessionPool:
+    """Mixin of the pg clients, whose connection and cursor can't be used by several threads at once.
+
+    `session()` lends each thread a shallow copy of the client with a connection of a pool, opened on first use
+    and closed by `close_pool()` at the end of `init()`. Pooled connections are set up once, types registered and
+    `session_param()` applied, and keep their prepared statements across sessions, instead of paying the
+    connection, authentication and setup of a new connection for every batch.
+
+    Clients implement `_connect_kwargs`, `_register_types` and `_set_session_options`.
+    """
+
+    conn: Connection | None = None
+    cursor: Cursor | None = None
+    _pool: ConnectionPool | None = None
+    _pool_lock = threading.Lock()
+
+    def _connect_kwargs(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _register_types(conn: Connection):
+        raise NotImplementedError
+
+    def _set_session_options(self, cursor: Cursor):
+        raise NotImplementedError
+
+    def _configure_pooled(self, conn: Connection):
+        self._register_types(conn)
+        conn.autocommit = False
+        with conn.cursor() as cursor:
+            self._set_session_options(cursor)
+        conn.commit()
+
+    def _get_pool(self) -> ConnectionPool:
+        with self._pool_lock:
+            if self._pool is None:
+                max_size = config.PG_POOL_MAX_SIZE or os.cpu_count()
+                log.info(f"{self.name} opens a pool of up to {max_size} connections")
+                self._pool = ConnectionPool(
+                    kwargs=self._connect_kwargs(),
+                    configure=self._configure_pooled,
+                    min_size=1,
+                    max_size=max_size,
+                    open=True,
+                )
+            return self._pool
+
+    @contextmanager
+    def session(self) -> Generator["PgSessionPool", None, None]:
+        with self._get_pool().connection() as conn:
+            client = copy.copy(self)
+            client.conn, client.cursor = conn, conn.cursor()
+            try:
+                yield client
+            finally:
+                client.cursor.close()
+
+    def close_pool(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
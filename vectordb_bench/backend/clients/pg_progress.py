@@ -0,0 +1,105 @@
+"""Progress of index builds of the Postgres-family clients"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+import psycopg
+
+from ... import config
+
+log = logging.getLogger(__name__)
+
+PROGRESS_QUERY = """
+SELECT phase, tuples_done, tuples_total, blocks_done, blocks_total
+FROM pg_stat_progress_create_index WHERE pid = %s
+"""
+
+
+class IndexBuildMonitor:
+    """Polls `pg_stat_progress_create_index` for the CREATE INDEX of backend `pid`, from a connection of its own.
+
+    Every `interval` seconds it records the phase of the build, like "building index: loading tuples", and how
+    many tuples it has done, so phases shorter than the interval may be missed. A monitor that can't connect or
+    query logs a warning and records nothing, the build itself is not affected.
+
+    Examples:
+        >>> with IndexBuildMonitor(connect_kwargs, conn.info.backend_pid) as monitor:
+        >>>     cursor.execute(create_index_sql)
+        >>> monitor.summary()
+    """
+
+    def __init__(self, connect_kwargs: dict[str, Any], pid: int, interval: float = config.PG_INDEX_PROGRESS_INTERVAL):
+        self.connect_kwargs = connect_kwargs
+        self.pid = pid
+        self.interval = interval
+
+        self.phases: dict[str, float] = {}  # seconds spent in each phase, in the order they were seen
+        self.phase_tuples: dict[str, int] = {}  # tuples done by the end of each phase
+
+        self._phase: str | None = None
+        self._phase_start = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _record(self, now: float, phase: str | None, tuples_done: int = 0):
+        if phase != self._phase:
+            if self._phase is not None:
+                self.phases[self._phase] = round(self.phases.get(self._phase, 0.0) + now - self._phase_start, 4)
+            if phase is not None:
+                log.info(f"Index build of backend {self.pid} entered phase: {phase}")
+            self._phase, self._phase_start = phase, now
+        if phase is not None:
+            self.phase_tuples[phase] = max(self.phase_tuples.get(phase, 0), tuples_done or 0)
+
+    def _loop(self):
+        try:
+            with psycopg.connect(**self.connect_kwargs, autocommit=True) as conn:
+                while True:
+                    row = conn.execute(PROGRESS_QUERY, (self.pid,)).fetchone()
+                    now = time.perf_counter()
+                    if row is None:
+                        self._record(now, None)
+                    else:
+                        phase, tuples_done, tuples_total, blocks_done, blocks_total = row
+                        self._record(now, phase, tuples_done)
+                        log.debug(
+                            f"Index build of backend {self.pid}: {phase}, tuples {tuples_done}/{tuples_total},"
+                            f" blocks {blocks_done}/{blocks_total}"
+                        )
+                    if self._stop_event.wait(self.interval):
+                        return
+        except Exception as e:
+            log.warning(f"Failed to monitor the index build of backend {self.pid}, reason = {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="index-build-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._record(time.perf_counter(), None)  # the last phase ends with the statement
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def tuples_per_sec(self) -> float:
+        """rate of the phase that did the most tuples, the one that reads and inserts the table"""
+        if not self.phase_tuples:
+            return 0.0
+        phase = max(self.phase_tuples, key=self.phase_tuples.get)
+        duration = self.phases.get(phase, 0.0)
+        return round(self.phase_tuples[phase] / duration, 4) if duration > 0 else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """the stats `VectorDB.optimize` returns"""
+        return {"phases": dict(self.phases), "tuples_per_sec": self.tuples_per_sec()}
@@ -10,13 +10,16 @@ import psycopg
 from pgvector.psycopg import register_vector
 from psycopg import Connection, Cursor, sql
 
+from ...query_plan import PG_EXPLAIN, pg_plan_summary
 from ..api import VectorDB
+from ..pg_copy import vector_layout, write_binary_copy
+from ..pg_pool import PgSessionPool
 from .config import PgDiskANNConfigDict, PgDiskANNIndexConfig
 
 log = logging.getLogger(__name__)
 
 
-class PgDiskANN(VectorDB):
+class PgDiskANN(PgSessionPool, VectorDB):
     """Use psycopg instructions"""
 
     conn: psycopg.Connection[Any] | None = None
@@ -90,16 +93,8 @@ class PgDiskANN(VectorDB):
     def init(self) -> Generator[None, None, None]:
         self.conn, self.cursor = self._create_connection(**self.db_config)
 
-        session_options: dict[str, Any] = self.case_config.session_param()
-
-        if len(session_options) > 0:
-            for setting_name, setting_val in session_options.items():
-                command = sql.SQL("SET {setting_name} = {setting_val};").format(
-                    setting_name=sql.Identifier(setting_name), setting_val=sql.Literal(setting_val)
-                )
-                log.debug(command.as_string(self.cursor))
-                self.cursor.execute(command)
-            self.conn.commit()
+        self._set_session_options(self.cursor)
+        self.conn.commit()
 
         search_params = self.case_config.search_param()
 
@@ -171,11 +166,27 @@ class PgDiskANN(VectorDB):
         try:
             yield
         finally:
+            self.close_pool()
             self.cursor.close()
             self.conn.close()
             self.cursor = None
             self.conn = None
 
+    def _connect_kwargs(self) -> dict[str, Any]:
+        return self.db_config
+
+    _register_types = staticmethod(register_vector)
+
+    def _set_session_options(self, cursor: Cursor):
+        session_options: dict[str, Any] = self.case_config.session_param()
+
+        for setting_name, setting_val in session_options.items():
+            command = sql.SQL("SET {setting_name} = {setting_val};").format(
+                setting_name=sql.Identifier(setting_name), setting_val=sql.Literal(setting_val)
+            )
+            log.debug(command.as_string(cursor))
+            cursor.execute(command)
+
     def _drop_table(self):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
@@ -336,9 +347,8 @@ class PgDiskANN(VectorDB):
                     table_name=sql.Identifier(self.table_name),
                 ),
             ) as copy:
-                copy.set_types(["bigint", "vector"])
-                for i, row in enumerate(metadata_arr):
-                    copy.write_row((row, embeddings_arr[i]))
+                layout = vector_layout(self.cursor, "vector", embeddings_arr.shape[1])
+                write_binary_copy(copy, metadata_arr, embeddings_arr, layout)
             self.conn.commit()
 
             if kwargs.get("last_batch"):
@@ -395,3 +405,12 @@ class PgDiskANN(VectorDB):
             )
 
         return [int(i[0]) for i in result.fetchall()]
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        q = np.asarray(query)
+        params = (q, q, k) if self.case_config.search_param().get("reranking", False) else (q, k)
+        self.cursor.execute(sql.SQL(PG_EXPLAIN) + self._unfiltered_search, params)
+        return pg_plan_summary(self.cursor.fetchone()[0])
@@ -11,12 +11,14 @@ from pgvecto_rs.psycopg import register_vector
 from psycopg import Connection, Cursor, sql
 
 from ..api import VectorDB
+from ..pg_copy import vector_layout, write_binary_copy
+from ..pg_pool import PgSessionPool
 from .config import PgVectoRSConfig, PgVectoRSIndexConfig
 
 log = logging.getLogger(__name__)
 
 
-class PgVectoRS(VectorDB):
+class PgVectoRS(PgSessionPool, VectorDB):
     """Use psycopg instructions"""
 
     conn: psycopg.Connection[Any] | None = None
@@ -101,16 +103,7 @@ class PgVectoRS(VectorDB):
 
         self.conn, self.cursor = self._create_connection(**self.db_config)
 
-        # index configuration may have commands defined that we should set during each client session
-        session_options = self.case_config.session_param()
-
-        for key, val in session_options.items():
-            command = sql.SQL("SET {setting_name} " + "= {val};").format(
-                setting_name=sql.Identifier(key),
-                val=val,
-            )
-            log.debug(command.as_string(self.cursor))
-            self.cursor.execute(command)
+        self._set_session_options(self.cursor)
         self.conn.commit()
 
         self._filtered_search = sql.Composed(
@@ -136,11 +129,29 @@ class PgVectoRS(VectorDB):
         try:
             yield
         finally:
+            self.close_pool()
             self.cursor.close()
             self.conn.close()
             self.cursor = None
             self.conn = None
 
+    def _connect_kwargs(self) -> dict[str, Any]:
+        return self.db_config
+
+    _register_types = staticmethod(register_vector)
+
+    def _set_session_options(self, cursor: Cursor):
+        # index configuration may have commands defined that we should set during each client session
+        session_options = self.case_config.session_param()
+
+        for key, val in session_options.items():
+            command = sql.SQL("SET {setting_name} " + "= {val};").format(
+                setting_name=sql.Identifier(key),
+                val=val,
+            )
+            log.debug(command.as_string(cursor))
+            cursor.execute(command)
+
     def _drop_table(self):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
@@ -242,9 +253,8 @@ class PgVectoRS(VectorDB):
                     table_name=sql.Identifier(self.table_name),
                 ),
             ) as copy:
-                copy.set_types(["bigint", "vector"])
-                for i, row in enumerate(metadata_arr):
-                    copy.write_row((row, embeddings_arr[i]))
+                layout = vector_layout(self.cursor, "vector", embeddings_arr.shape[1])
+                write_binary_copy(copy, metadata_arr, embeddings_arr, layout)
             self.conn.commit()
 
             if kwargs.get("last_batch"):
@@ -76,6 +76,15 @@ class PgVectorTypedDict(CommonTypedDict):
             required=False,
         ),
     ]
+    prewarm: Annotated[
+        bool,
+        click.option(
+            "--prewarm/--skip-prewarm",
+            type=bool,
+            help="Load the index into shared buffers with pg_prewarm after building it, before searching",
+            default=False,
+        ),
+    ]
     quantization_type: Annotated[
         str | None,
         click.option(
@@ -154,6 +163,7 @@ def PgVectorIVFFlat(
             metric_type=None,
             lists=parameters["lists"],
             probes=parameters["probes"],
+            prewarm=parameters["prewarm"],
             quantization_type=parameters["quantization_type"],
             table_quantization_type=parameters["table_quantization_type"],
             reranking=parameters["reranking"],
@@ -191,6 +201,7 @@ def PgVectorHNSW(
             ef_search=parameters["ef_search"],
             maintenance_work_mem=parameters["maintenance_work_mem"],
             max_parallel_workers=parameters["max_parallel_workers"],
+            prewarm=parameters["prewarm"],
             quantization_type=parameters["quantization_type"],
             table_quantization_type=parameters["table_quantization_type"],
             reranking=parameters["reranking"],
@@ -12,13 +12,17 @@ from psycopg import Connection, Cursor, sql
 
 from vectordb_bench.backend.filter import Filter, FilterOp
 
+from ...query_plan import PG_EXPLAIN, pg_plan_summary
 from ..api import VectorDB
+from ..pg_copy import bit_layout, halfvec_layout, vector_layout, write_binary_copy
+from ..pg_pool import PgSessionPool
+from ..pg_progress import IndexBuildMonitor
 from .config import PgVectorConfigDict, PgVectorIndexConfig
 
 log = logging.getLogger(__name__)
 
 
-class PgVector(VectorDB):
+class PgVector(PgSessionPool, VectorDB):
     """Use psycopg instructions"""
 
     supported_filter_types: list[FilterOp] = [
@@ -216,28 +220,35 @@ class PgVector(VectorDB):
         """
 
         self.conn, self.cursor = self._create_connection(**self.connect_config)
-
-        # index configuration may have commands defined that we should set during each client session
-        session_options: Sequence[dict[str, Any]] = self.case_config.session_param()["session_options"]
-
-        if len(session_options) > 0:
-            for setting in session_options:
-                command = sql.SQL("SET {setting_name} " + "= {val};").format(
-                    setting_name=sql.Identifier(setting["parameter"]["setting_name"]),
-                    val=sql.Identifier(str(setting["parameter"]["val"])),
-                )
-                log.debug(command.as_string(self.cursor))
-                self.cursor.execute(command)
-            self.conn.commit()
+        self._set_session_options(self.cursor)
+        self.conn.commit()
 
         try:
             yield
         finally:
+            self.close_pool()
             self.cursor.close()
             self.conn.close()
             self.cursor = None
             self.conn = None
 
+    def _connect_kwargs(self) -> dict[str, Any]:
+        return self.connect_config
+
+    _register_types = staticmethod(register_vector)
+
+    def _set_session_options(self, cursor: Cursor):
+        # index configuration may have commands defined that we should set during each client session
+        session_options: Sequence[dict[str, Any]] = self.case_config.session_param()["session_options"]
+
+        for setting in session_options:
+            command = sql.SQL("SET {setting_name} " + "= {val};").format(
+                setting_name=sql.Identifier(setting["parameter"]["setting_name"]),
+                val=sql.Identifier(str(setting["parameter"]["val"])),
+            )
+            log.debug(command.as_string(cursor))
+            cursor.execute(command)
+
     def _drop_table(self):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
@@ -250,14 +261,57 @@ class PgVector(VectorDB):
         )
         self.conn.commit()
 
-    def optimize(self, data_size: int | None = None):
-        self._post_insert()
+    def count_embeddings(self) -> int:
+        assert self.cursor is not None, "Cursor is not initialized"
+        return self.cursor.execute(
+            sql.SQL("SELECT count(*) FROM public.{table_name}").format(
+                table_name=sql.Identifier(self.table_name),
+            ),
+        ).fetchone()[0]
+
+    def evict_cache(self):
+        """evict the table and its index from the shared buffers, with pg_buffercache_evict of PostgreSQL 17+,
+        the pages may still be in the page cache of the OS"""
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+        self.cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_buffercache")
+        evicted = self.cursor.execute(
+            sql.SQL(
+                "SELECT count(pg_buffercache_evict(bufferid)) FROM pg_buffercache "
+                "WHERE reldatabase = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+                "AND relfilenode IN (pg_relation_filenode({table_name}), pg_relation_filenode({index_name}))"
+            ).format(
+                table_name=sql.Literal(f"public.{self.table_name}"),
+                index_name=sql.Literal(f"public.{self._index_name}"),
+            ),
+        ).fetchone()[0]
+        self.conn.commit()
+        log.info(f"{self.name} evicted {evicted} buffers of {self.table_name} and {self._index_name}")
+
+    def optimize(self, data_size: int | None = None) -> dict[str, Any] | None:
+        build_stats = self._post_insert()
+        if self.case_config.prewarm:
+            self._prewarm_index()
+        return build_stats
 
-    def _post_insert(self):
+    def _post_insert(self) -> dict[str, Any] | None:
         log.info(f"{self.name} post insert before optimize")
         if self.case_config.create_index_after_load:
             self._drop_index()
-            self._create_index()
+            return self._create_index()
+        return None
+
+    def _prewarm_index(self):
+        """load the index into shared buffers, so that the first searches don't read it from disk"""
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        self.cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm")
+        blocks = self.cursor.execute(
+            sql.SQL("SELECT pg_prewarm({index_name})").format(index_name=sql.Literal(self._index_name)),
+        ).fetchone()[0]
+        self.conn.commit()
+        log.info(f"{self.name} prewarmed {blocks} blocks of index {self._index_name}")
 
     def _drop_index(self):
         assert self.conn is not None, "Connection is not initialized"
@@ -327,7 +381,8 @@ class PgVector(VectorDB):
         results.extend(self.cursor.execute(sql.SQL("SHOW maintenance_work_mem;")).fetchall())
         log.info(f"{self.name} parallel index creation parameters: {results}")
 
-    def _create_index(self):
+    def _create_index(self) -> dict[str, Any]:
+        """Returns the phases of the build, polled from pg_stat_progress_create_index"""
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
         log.info(f"{self.name} client create index : {self._index_name}")
@@ -380,8 +435,10 @@ class PgVector(VectorDB):
 
         index_create_sql_with_with_clause = (index_create_sql + with_clause).join(" ")
         log.debug(index_create_sql_with_with_clause.as_string(self.cursor))
-        self.cursor.execute(index_create_sql_with_with_clause)
-        self.conn.commit()
+        with IndexBuildMonitor(self.connect_config, self.conn.info.backend_pid) as monitor:
+            self.cursor.execute(index_create_sql_with_with_clause)
+            self.conn.commit()
+        return monitor.summary()
 
     def _create_table(self, dim: int):
         assert self.conn is not None, "Connection is not initialized"
@@ -433,7 +490,7 @@ class PgVector(VectorDB):
             log.warning(f"Failed to create pgvector table: {self.table_name} error: {e}")
             raise e from None
 
-    def insert_embeddings(  # noqa: PLR0912
+    def insert_embeddings(
         self,
         embeddings: list[list[float]],
         metadata: list[int],
@@ -451,46 +508,22 @@ class PgVector(VectorDB):
             metadata_arr = np.array(metadata)
             embeddings_arr = np.array(embeddings)
 
+            dim = embeddings_arr.shape[1]
             if index_param["table_quantization_type"] == "bit":
-                with self.cursor.copy(
-                    sql.SQL("COPY public.{table_name} FROM STDIN (FORMAT TEXT)").format(
-                        table_name=sql.Identifier(self.table_name)
-                    )
-                ) as copy:
-                    # Same logic as pgvector binary_quantize
-                    for i, row in enumerate(metadata_arr):
-                        embeddings_bit = ""
-                        for embedding in embeddings_arr[i]:
-                            if embedding > 0:
-                                embeddings_bit += "1"
-                            else:
-                                embeddings_bit += "0"
-                        if self.with_scalar_labels:
-                            copy.write_row((str(row), embeddings_bit, labels_data[i]))
-                        else:
-                            copy.write_row((str(row), embeddings_bit))
+                # Same logic as pgvector binary_quantize, positive elements are 1
+                vectors, layout = np.packbits(embeddings_arr > 0, axis=1), bit_layout(dim)
+            elif index_param["table_quantization_type"] == "halfvec":
+                vectors, layout = embeddings_arr.astype(np.float16), halfvec_layout(dim)
             else:
-                with self.cursor.copy(
-                    sql.SQL("COPY public.{table_name} FROM STDIN (FORMAT BINARY)").format(
-                        table_name=sql.Identifier(self.table_name)
-                    )
-                ) as copy:
-                    if index_param["table_quantization_type"] == "halfvec":
-                        for i, row in enumerate(metadata_arr):
-                            if self.with_scalar_labels:
-                                copy.set_types(["bigint", "halfvec", "varchar"])
-                                copy.write_row((row, np.float16(embeddings_arr[i]), labels_data[i]))
-                            else:
-                                copy.set_types(["bigint", "halfvec"])
-                                copy.write_row((row, np.float16(embeddings_arr[i])))
-                    else:
-                        for i, row in enumerate(metadata_arr):
-                            if self.with_scalar_labels:
-                                copy.set_types(["bigint", "vector", "varchar"])
-                                copy.write_row((row, embeddings_arr[i], labels_data[i]))
-                            else:
-                                copy.set_types(["bigint", "vector"])
-                                copy.write_row((row, embeddings_arr[i]))
+                vectors, layout = embeddings_arr, vector_layout(self.cursor, "vector", dim)
+
+            with self.cursor.copy(
+                sql.SQL("COPY public.{table_name} FROM STDIN (FORMAT BINARY)").format(
+                    table_name=sql.Identifier(self.table_name)
+                )
+            ) as copy:
+                labels = labels_data if self.with_scalar_labels else None
+                write_binary_copy(copy, metadata_arr, vectors, layout, labels)
             self.conn.commit()
 
             return len(metadata), None
@@ -498,6 +531,54 @@ class PgVector(VectorDB):
             log.warning(f"Failed to insert data into pgvector table ({self.table_name}), error: {e}")
             return 0, e
 
+    def _delete_rows(self, metadata: list[int]) -> int:
+        """Delete rows by primary key inside the current transaction, the caller commits"""
+        self.cursor.execute(
+            sql.SQL("DELETE FROM public.{table_name} WHERE {primary_field} = ANY(%s)").format(
+                table_name=sql.Identifier(self.table_name),
+                primary_field=sql.Identifier(self._primary_field),
+            ),
+            (list(metadata),),
+        )
+        return self.cursor.rowcount
+
+    def delete_embeddings(self, metadata: list[int], **kwargs: Any) -> tuple[int, Exception | None]:
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        try:
+            deleted = self._delete_rows(metadata)
+            self.conn.commit()
+        except Exception as e:
+            log.warning(f"Failed to delete data from pgvector table ({self.table_name}), error: {e}")
+            self.conn.rollback()
+            return 0, e
+        else:
+            return deleted, None
+
+    def upsert_embeddings(
+        self,
+        embeddings: list[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, Exception | None]:
+        """COPY has no ON CONFLICT clause, so delete and re-copy the rows in one transaction."""
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        try:
+            self._delete_rows(metadata)
+        except Exception as e:
+            log.warning(f"Failed to upsert data into pgvector table ({self.table_name}), error: {e}")
+            self.conn.rollback()
+            return 0, e
+
+        count, error = self.insert_embeddings(embeddings, metadata, labels_data=labels_data, **kwargs)
+        if error is not None:
+            self.conn.rollback()
+        return count, error
+
     def prepare_filter(self, filters: Filter):
         if filters.type == FilterOp.NonFilter:
             self.where_clause = ""
@@ -521,13 +602,18 @@ class PgVector(VectorDB):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
 
+        result = self.cursor.execute(self._search, self._search_params(query, k), prepare=True, binary=True)
+        return [int(i[0]) for i in result.fetchall()]
+
+    def _search_params(self, query: list[float], k: int) -> tuple:
         index_param = self.case_config.index_param()
         search_param = self.case_config.search_param()
         q = np.asarray(query)
-        result = self.cursor.execute(
-            self._search,
-            (q, q, k) if index_param["quantization_type"] == "bit" and search_param["reranking"] else (q, k),
-            prepare=True,
-            binary=True,
-        )
-        return [int(i[0]) for i in result.fetchall()]
+        return (q, q, k) if index_param["quantization_type"] == "bit" and search_param["reranking"] else (q, k)
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        assert self.conn is not None, "Connection is not initialized"
+        assert self.cursor is not None, "Cursor is not initialized"
+
+        self.cursor.execute(sql.SQL(PG_EXPLAIN) + self._search, self._search_params(query, k))
+        return pg_plan_summary(self.cursor.fetchone()[0])
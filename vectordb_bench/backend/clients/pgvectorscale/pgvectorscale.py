@@ -11,12 +11,14 @@ from pgvector.psycopg import register_vector
 from psycopg import Connection, Cursor, sql
 
 from ..api import VectorDB
+from ..pg_copy import vector_layout, write_binary_copy
+from ..pg_pool import PgSessionPool
 from .config import PgVectorScaleConfigDict, PgVectorScaleIndexConfig
 
 log = logging.getLogger(__name__)
 
 
-class PgVectorScale(VectorDB):
+class PgVectorScale(PgSessionPool, VectorDB):
     """Use psycopg instructions"""
 
     conn: psycopg.Connection[Any] | None = None
@@ -90,18 +92,8 @@ class PgVectorScale(VectorDB):
     def init(self) -> Generator[None, None, None]:
         self.conn, self.cursor = self._create_connection(**self.db_config)
 
-        # index configuration may have commands defined that we should set during each client session
-        session_options: dict[str, Any] = self.case_config.session_param()
-
-        if len(session_options) > 0:
-            for setting_name, setting_val in session_options.items():
-                command = sql.SQL("SET {setting_name} " + "= {setting_val};").format(
-                    setting_name=sql.Identifier(setting_name),
-                    setting_val=sql.Identifier(str(setting_val)),
-                )
-                log.debug(command.as_string(self.cursor))
-                self.cursor.execute(command)
-            self.conn.commit()
+        self._set_session_options(self.cursor)
+        self.conn.commit()
 
         self._filtered_search = sql.Composed(
             [
@@ -126,11 +118,29 @@ class PgVectorScale(VectorDB):
         try:
             yield
         finally:
+            self.close_pool()
             self.cursor.close()
             self.conn.close()
             self.cursor = None
             self.conn = None
 
+    def _connect_kwargs(self) -> dict[str, Any]:
+        return self.db_config
+
+    _register_types = staticmethod(register_vector)
+
+    def _set_session_options(self, cursor: Cursor):
+        # index configuration may have commands defined that we should set during each client session
+        session_options: dict[str, Any] = self.case_config.session_param()
+
+        for setting_name, setting_val in session_options.items():
+            command = sql.SQL("SET {setting_name} " + "= {setting_val};").format(
+                setting_name=sql.Identifier(setting_name),
+                setting_val=sql.Identifier(str(setting_val)),
+            )
+            log.debug(command.as_string(cursor))
+            cursor.execute(command)
+
     def _drop_table(self):
         assert self.conn is not None, "Connection is not initialized"
         assert self.cursor is not None, "Cursor is not initialized"
@@ -242,9 +252,8 @@ class PgVectorScale(VectorDB):
                     table_name=sql.Identifier(self.table_name),
                 ),
             ) as copy:
-                copy.set_types(["bigint", "vector"])
-                for i, row in enumerate(metadata_arr):
-                    copy.write_row((row, embeddings_arr[i]))
+                layout = vector_layout(self.cursor, "vector", embeddings_arr.shape[1])
+                write_binary_copy(copy, metadata_arr, embeddings_arr, layout)
             self.conn.commit()
 
             if kwargs.get("last_batch"):
@@ -21,6 +21,33 @@ class QdrantTypedDict(CommonTypedDict):
         str | None,
         click.option("--api-key", type=str, help="API key for authentication", required=False),
     ]
+    create_payload_int_index: Annotated[
+        bool,
+        click.option(
+            "--create-payload-int-index/--skip-payload-int-index",
+            default=True,
+            show_default=True,
+            help="Index the integer payload of the int-filter cases",
+        ),
+    ]
+    create_payload_keyword_index: Annotated[
+        bool,
+        click.option(
+            "--create-payload-keyword-index/--skip-payload-keyword-index",
+            default=True,
+            show_default=True,
+            help="Index the label payload of the label-filter cases",
+        ),
+    ]
+    is_tenant: Annotated[
+        bool,
+        click.option(
+            "--is-tenant",
+            is_flag=True,
+            default=False,
+            help="Mark the label payload index as a tenant index, to co-locate the points of each label",
+        ),
+    ]
 
 
 @cli.command()
@@ -38,6 +65,10 @@ def QdrantCloud(**parameters: Unpack[QdrantTypedDict]):
     run(
         db=DB.QdrantCloud,
         db_config=QdrantConfig(**config_params),
-        db_case_config=QdrantIndexConfig(),
+        db_case_config=QdrantIndexConfig(
+            create_payload_int_index=parameters["create_payload_int_index"],
+            create_payload_keyword_index=parameters["create_payload_keyword_index"],
+            is_tenant=parameters["is_tenant"],
+        ),
         **parameters,
     )
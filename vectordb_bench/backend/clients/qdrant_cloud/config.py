@@ -36,8 +36,8 @@ class QdrantIndexConfig(BaseModel, DBCaseConfig):
     metric_type: MetricType | None = None
     m: int = 16
     payload_m: int = 16  # only for label_filter cases
-    create_payload_int_index: bool = False
-    create_payload_keyword_index: bool = False
+    create_payload_int_index: bool = True  # only for int-filter cases
+    create_payload_keyword_index: bool = True  # only for label-filter cases
     is_tenant: bool = False
     use_scalar_quant: bool = False
     sq_quantile: float = 0.99
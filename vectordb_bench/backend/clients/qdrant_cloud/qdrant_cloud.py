@@ -8,25 +8,22 @@ from qdrant_client import QdrantClient
 from qdrant_client.http.models import (
     Batch,
     CollectionStatus,
-    FieldCondition,
     HnswConfigDiff,
     KeywordIndexParams,
     OptimizersConfigDiff,
     PayloadSchemaType,
-    Range,
+    PointIdsList,
     ScalarQuantization,
     ScalarQuantizationConfig,
     ScalarType,
     VectorParams,
 )
-from qdrant_client.http.models import (
-    Filter as QdrantFilter,
-)
 
 from vectordb_bench.backend.clients.qdrant_cloud.config import QdrantIndexConfig
 from vectordb_bench.backend.filter import Filter, FilterOp
 
 from ..api import VectorDB
+from ..qdrant_filter import build_query_filter
 
 log = logging.getLogger(__name__)
 
@@ -50,6 +47,7 @@ class QdrantCloud(VectorDB):
         collection_name: str = "QdrantCloudCollection",
         drop_old: bool = False,
         with_scalar_labels: bool = False,
+        with_int_filter: bool = False,
         **kwargs,
     ):
         """Initialize wrapper around the QdrantCloud vector database."""
@@ -63,6 +61,7 @@ class QdrantCloud(VectorDB):
 
         tmp_client = QdrantClient(**self.db_config)
         self.with_scalar_labels = with_scalar_labels
+        self.with_int_filter = with_int_filter
         if drop_old:
             log.info(f"QdrantCloud client drop_old collection: {self.collection_name}")
             tmp_client.delete_collection(self.collection_name)
@@ -132,7 +131,7 @@ class QdrantCloud(VectorDB):
             )
 
             # create payload_index for int-field
-            if self.db_case_config.create_payload_int_index:
+            if self.with_int_filter and self.db_case_config.create_payload_int_index:
                 qdrant_client.create_payload_index(
                     collection_name=self.collection_name,
                     field_name=self._primary_field,
@@ -186,6 +185,36 @@ class QdrantCloud(VectorDB):
         else:
             return len(metadata), None
 
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        """Delete points by id. should call self.init() first"""
+        assert self.qdrant_client is not None
+        try:
+            for offset in range(0, len(metadata), QDRANT_BATCH_SIZE):
+                self.qdrant_client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(points=metadata[offset : offset + QDRANT_BATCH_SIZE]),
+                    wait=True,
+                )
+        except Exception as e:
+            log.info(f"Failed to delete data, {e}")
+            return 0, e
+        else:
+            return len(metadata), None
+
+    def upsert_embeddings(
+        self,
+        embeddings: list[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[int, Exception]:
+        """insert_embeddings already upserts by point id"""
+        return self.insert_embeddings(embeddings, metadata, labels_data=labels_data, **kwargs)
+
+    def count_embeddings(self) -> int:
+        assert self.qdrant_client is not None
+        return self.qdrant_client.count(collection_name=self.collection_name, exact=True).count
+
     def search_embedding(
         self,
         query: list[float],
@@ -203,33 +232,12 @@ class QdrantCloud(VectorDB):
             query_vector=query,
             limit=k,
             query_filter=self.query_filter,
-            search_params=self.db_case_config.search_param(),
+            search_params=self.search_params,
             with_payload=self.db_case_config.with_payload,
         )
 
         return [r.id for r in res]
 
     def prepare_filter(self, filters: Filter):
-        if filters.type == FilterOp.NonFilter:
-            self.query_filter = None
-        elif filters.type == FilterOp.NumGE:
-            self.query_filter = QdrantFilter(
-                must=[
-                    FieldCondition(
-                        key=self._primary_field,
-                        range=Range(gte=filters.int_value),
-                    ),
-                ]
-            )
-        elif filters.type == FilterOp.StrEqual:
-            self.query_filter = QdrantFilter(
-                must=[
-                    FieldCondition(
-                        key=self._scalar_label_field,
-                        match={"value": filters.label_value},
-                    ),
-                ]
-            )
-        else:
-            msg = f"Not support Filter for Qdrant - {filters}"
-            raise ValueError(msg)
+        self.query_filter = build_query_filter(filters, self._primary_field, self._scalar_label_field)
+        self.search_params = self.db_case_config.search_param()
@@ -0,0 +1,18 @@
+"""Qdrant filters of the case filters, shared by the Qdrant clients"""
+
+from qdrant_client.http.models import FieldCondition, MatchValue, Range
+from qdrant_client.http.models import Filter as QdrantFilter
+
+from vectordb_bench.backend.filter import Filter, FilterOp
+
+
+def build_query_filter(filters: Filter, int_field: str, label_field: str) -> QdrantFilter | None:
+    """the Qdrant filter of a case filter, built once and sent with every search"""
+    if filters.type == FilterOp.NonFilter:
+        return None
+    if filters.type == FilterOp.NumGE:
+        return QdrantFilter(must=[FieldCondition(key=int_field, range=Range(gte=filters.int_value))])
+    if filters.type == FilterOp.StrEqual:
+        return QdrantFilter(must=[FieldCondition(key=label_field, match=MatchValue(value=filters.label_value))])
+    msg = f"Not support Filter for Qdrant - {filters}"
+    raise ValueError(msg)
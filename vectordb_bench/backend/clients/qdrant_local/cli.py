@@ -20,6 +20,34 @@ class QdrantLocalTypedDict(CommonTypedDict):
         str,
         click.option("--url", type=str, help="Qdrant url", required=True),
     ]
+    prefer_grpc: Annotated[
+        bool,
+        click.option("--prefer-grpc", is_flag=True, default=False, help="Talk to Qdrant over gRPC instead of REST"),
+    ]
+    grpc_port: Annotated[
+        int,
+        click.option("--grpc-port", type=int, default=6334, show_default=True, help="Qdrant gRPC port"),
+    ]
+    upload_parallel: Annotated[
+        int,
+        click.option(
+            "--upload-parallel",
+            type=int,
+            default=1,
+            show_default=True,
+            help="Processes uploading the points of each insert batch of the dataset load, "
+            "for batches (NUM_PER_BATCH) of more than 100 points",
+        ),
+    ]
+    defer_indexing: Annotated[
+        bool,
+        click.option(
+            "--defer-indexing/--index-while-loading",
+            default=True,
+            show_default=True,
+            help="Build the HNSW index once after the dataset load of performance cases instead of while inserting",
+        ),
+    ]
     on_disk: Annotated[
         bool,
         click.option("--on-disk", type=bool, default=False, help="Store the vectors and the HNSW index on disk"),
@@ -60,12 +88,18 @@ def QdrantLocal(**parameters: Unpack[QdrantLocalTypedDict]):
 
     run(
         db=DBTYPE,
-        db_config=QdrantLocalConfig(url=SecretStr(parameters["url"])),
+        db_config=QdrantLocalConfig(
+            url=SecretStr(parameters["url"]),
+            prefer_grpc=parameters["prefer_grpc"],
+            grpc_port=parameters["grpc_port"],
+            upload_parallel=parameters["upload_parallel"],
+        ),
         db_case_config=QdrantLocalIndexConfig(
             on_disk=parameters["on_disk"],
             m=parameters["m"],
             ef_construct=parameters["ef_construct"],
             hnsw_ef=parameters["hnsw_ef"],
+            defer_indexing=parameters["defer_indexing"],
             metric_type=MetricType(parameters["metric_type"].upper()),
         ),
         **parameters,
@@ -5,10 +5,16 @@ from ..api import DBCaseConfig, DBConfig, MetricType
 
 class QdrantLocalConfig(DBConfig):
     url: SecretStr
+    prefer_grpc: bool = False
+    grpc_port: int = 6334
+    upload_parallel: int = 1  # processes uploading the points of each insert of the dataset load
 
     def to_dict(self) -> dict:
         return {
             "url": self.url.get_secret_value(),
+            "prefer_grpc": self.prefer_grpc,
+            "grpc_port": self.grpc_port,
+            "upload_parallel": self.upload_parallel,
         }
 
 
@@ -18,6 +24,9 @@ class QdrantLocalIndexConfig(BaseModel, DBCaseConfig):
     ef_construct: int
     hnsw_ef: int | None = 0
     on_disk: bool | None = False
+    # no indexing while the dataset of a performance case is loaded, the index is built once after the load.
+    # Other inserts, like the ones of streaming cases, are always indexed
+    defer_indexing: bool = True
 
     def parse_metric(self) -> str:
         if self.metric_type == MetricType.L2:
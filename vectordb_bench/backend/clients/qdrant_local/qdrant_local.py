@@ -10,22 +10,28 @@ from qdrant_client.http.models import (
     Batch,
     CollectionStatus,
     FieldCondition,
-    Filter,
+    FilterSelector,
     HnswConfigDiff,
     OptimizersConfigDiff,
     PayloadSchemaType,
+    PointIdsList,
     Range,
     SearchParams,
     VectorParams,
 )
+from qdrant_client.http.models import Filter as QdrantFilter
+
+from vectordb_bench.backend.filter import Filter, FilterOp
 
 from ..api import VectorDB
+from ..qdrant_filter import build_query_filter
 from .config import QdrantLocalIndexConfig
 
 log = logging.getLogger(__name__)
 
 SECONDS_WAITING_FOR_INDEXING_API_CALL = 5
 QDRANT_BATCH_SIZE = 100
+INDEXING_THRESHOLD = 100  # KB, set back after the dataset load with deferred indexing
 
 
 def qdrant_collection_exists(client: QdrantClient, collection_name: str) -> bool:
@@ -40,6 +46,12 @@ def qdrant_collection_exists(client: QdrantClient, collection_name: str) -> bool
 
 
 class QdrantLocal(VectorDB):
+    supported_filter_types: list[FilterOp] = [
+        FilterOp.NonFilter,
+        FilterOp.NumGE,
+        FilterOp.StrEqual,
+    ]
+
     def __init__(
         self,
         dim: int,
@@ -48,17 +60,22 @@ class QdrantLocal(VectorDB):
         collection_name: str = "QdrantLocalCollection",
         drop_old: bool = False,
         name: str = "QdrantLocal",
+        with_scalar_labels: bool = False,
         **kwargs,
     ):
         """Initialize wrapper around the qdrant."""
         self.name = name
-        self.db_config = db_config
+        self.db_config = dict(db_config)
+        self.upload_parallel = self.db_config.pop("upload_parallel", 1)
         self.case_config = db_case_config
         self.search_parameter = self.case_config.search_param()
         self.collection_name = collection_name
+        self.with_scalar_labels = with_scalar_labels
         self.client = None
+        self._loading = False
 
         self._primary_field = "pk"
+        self._scalar_label_field = "label"
         self._vector_field = "vector"
 
         client = QdrantClient(**self.db_config)
@@ -94,6 +111,41 @@ class QdrantLocal(VectorDB):
         self.client = None
         del self.client
 
+    @contextmanager
+    def dataset_load(self):
+        """the dataset is uploaded without waiting for each insert to be applied, and applied once at the end.
+        With deferred indexing, nothing is indexed while it is inserted, the index is built once after the load"""
+        if self.case_config.defer_indexing:
+            self._set_indexing_threshold(0)
+        self._loading = True
+        try:
+            yield
+            self._wait_for_updates()
+        finally:
+            self._loading = False
+            if self.case_config.defer_indexing:
+                self._set_indexing_threshold(INDEXING_THRESHOLD)
+
+    def _wait_for_updates(self):
+        """wait until every shard has applied the updates sent before.
+
+        The updates of a shard are applied in order, and an update by filter goes to every shard, so waiting
+        for one that matches no point, like the negative ids, waits for all the uploads before it.
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(
+                filter=QdrantFilter(must=[FieldCondition(key=self._primary_field, range=Range(lt=0))])
+            ),
+            wait=True,
+        )
+
+    def _set_indexing_threshold(self, threshold: int):
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizer_config=OptimizersConfigDiff(indexing_threshold=threshold),
+        )
+
     def _create_collection(self, dim: int, qdrant_client: QdrantClient):
         log.info(f"Create collection: {self.collection_name}")
         log.info(
@@ -123,6 +175,12 @@ class QdrantLocal(VectorDB):
                 field_name=self._primary_field,
                 field_schema=PayloadSchemaType.INTEGER,
             )
+            if self.with_scalar_labels:
+                qdrant_client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=self._scalar_label_field,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
 
         except Exception as e:
             if "already exists!" in str(e):
@@ -156,13 +214,16 @@ class QdrantLocal(VectorDB):
         self,
         embeddings: Iterable[list[float]],
         metadata: list[int],
+        labels_data: list[str] | None = None,
         **kwargs,
     ) -> tuple[int, Exception]:
-        """Insert embeddings into the database.
+        """Insert embeddings into the database. In the dataset load, the points are uploaded without waiting
+        for them to be applied, see `dataset_load`, other inserts wait for each batch to be searchable.
 
         Args:
             embeddings(list[list[float]]): list of embeddings
             metadata(list[int]): list of metadata
+            labels_data(list[str], optional): labels of the label-filter cases
             kwargs: other arguments
 
         Returns:
@@ -170,66 +231,113 @@ class QdrantLocal(VectorDB):
         """
         assert self.client is not None
         assert len(embeddings) == len(metadata)
-        insert_count = 0
 
-        # disable indexing for quick insertion
-        self.client.update_collection(
-            collection_name=self.collection_name,
-            optimizer_config=OptimizersConfigDiff(indexing_threshold=0),
-        )
+        payloads = self._payloads(metadata, labels_data)
+        try:
+            if self._loading:
+                self.client.upload_collection(
+                    collection_name=self.collection_name,
+                    vectors=embeddings,
+                    payload=payloads,
+                    ids=metadata,
+                    batch_size=QDRANT_BATCH_SIZE,
+                    # the processes only pay off for more than one batch
+                    parallel=self.upload_parallel if len(metadata) > QDRANT_BATCH_SIZE else 1,
+                    wait=False,
+                )
+            else:
+                for offset in range(0, len(metadata), QDRANT_BATCH_SIZE):
+                    batch = slice(offset, offset + QDRANT_BATCH_SIZE)
+                    self.client.upsert(
+                        collection_name=self.collection_name,
+                        wait=True,
+                        points=Batch(ids=metadata[batch], payloads=payloads[batch], vectors=embeddings[batch]),
+                    )
+        except Exception as e:
+            log.info(f"Failed to insert data, {e}")
+            return 0, e
+        else:
+            return len(metadata), None
+
+    def _payloads(self, ids: list[int], labels_data: list[str] | None) -> list[dict]:
+        if self.with_scalar_labels:
+            return [
+                {self._primary_field: pk, self._scalar_label_field: label}
+                for pk, label in zip(ids, labels_data, strict=True)
+            ]
+        return [{self._primary_field: pk} for pk in ids]
+
+    def delete_embeddings(self, metadata: list[int], **kwargs) -> tuple[int, Exception]:
+        """Delete points by id. Should call self.init() first."""
+        assert self.client is not None
+        delete_count = 0
+        try:
+            for offset in range(0, len(metadata), QDRANT_BATCH_SIZE):
+                ids = metadata[offset : offset + QDRANT_BATCH_SIZE]
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(points=ids),
+                    wait=True,
+                )
+                delete_count += len(ids)
+        except Exception as e:
+            log.info(f"Failed to delete data, {e}")
+            return delete_count, e
+        return delete_count, None
+
+    def upsert_embeddings(
+        self,
+        embeddings: Iterable[list[float]],
+        metadata: list[int],
+        labels_data: list[str] | None = None,
+        **kwargs,
+    ) -> tuple[int, Exception]:
+        """Qdrant upserts by point id, so replacing points needs no delete and no indexing toggle."""
+        assert self.client is not None
+        assert len(embeddings) == len(metadata)
+        upsert_count = 0
         try:
             for offset in range(0, len(embeddings), QDRANT_BATCH_SIZE):
                 vectors = embeddings[offset : offset + QDRANT_BATCH_SIZE]
                 ids = metadata[offset : offset + QDRANT_BATCH_SIZE]
-                payloads = [{self._primary_field: v} for v in ids]
-                _ = self.client.upsert(
+                labels = labels_data[offset : offset + QDRANT_BATCH_SIZE] if labels_data is not None else None
+                payloads = self._payloads(ids, labels)
+                self.client.upsert(
                     collection_name=self.collection_name,
                     wait=True,
                     points=Batch(ids=ids, payloads=payloads, vectors=vectors),
                 )
-                insert_count += QDRANT_BATCH_SIZE
-            # enable indexing after insertion
-            self.client.update_collection(
-                collection_name=self.collection_name,
-                optimizer_config=OptimizersConfigDiff(indexing_threshold=100),
-            )
-
+                upsert_count += len(ids)
         except Exception as e:
-            log.info(f"Failed to insert data, {e}")
-            return insert_count, e
-        else:
-            return insert_count, None
+            log.info(f"Failed to upsert data, {e}")
+            return upsert_count, e
+        return upsert_count, None
+
+    def prepare_filter(self, filters: Filter):
+        self.query_filter = build_query_filter(filters, self._primary_field, self._scalar_label_field)
+        self.search_params = SearchParams(**self.search_parameter)
+
+    def count_embeddings(self) -> int:
+        assert self.client is not None
+        return self.client.count(collection_name=self.collection_name, exact=True).count
 
     def search_embedding(
         self,
         query: list[float],
         k: int = 100,
-        filters: dict | None = None,
         timeout: int | None = None,
     ) -> list[int]:
         """Perform a search on a query embedding and return results with score.
-        Should call self.init() first.
+        Should call self.init() and self.prepare_filter() first.
         """
         assert self.client is not None
 
-        f = None
-        if filters:
-            f = Filter(
-                must=[
-                    FieldCondition(
-                        key=self._primary_field,
-                        range=Range(
-                            gt=filters.get("id"),
-                        ),
-                    ),
-                ],
-            )
         res = self.client.query_points(
             collection_name=self.collection_name,
             query=query,
             limit=k,
-            query_filter=f,
-            search_params=SearchParams(**self.search_parameter),
+            query_filter=self.query_filter,
+            search_params=self.search_params,
         ).points
 
         return [result.id for result in res]
@@ -132,6 +132,33 @@ class Redis(VectorDB):
 
         return result_len, None
 
+    def delete_embeddings(
+        self,
+        metadata: list[int],
+        **kwargs: Any,
+    ) -> tuple[int, Exception]:
+        """Delete the hashes keyed by id, the index drops them on deletion.
+        Should call self.init() first.
+        """
+        batch_size = 1000
+        deleted = 0
+        try:
+            for offset in range(0, len(metadata), batch_size):
+                deleted += self.conn.delete(*metadata[offset : offset + batch_size])
+        except Exception as e:
+            return deleted, e
+
+        return deleted, None
+
+    def upsert_embeddings(
+        self,
+        embeddings: list[list[float]],
+        metadata: list[int],
+        **kwargs: Any,
+    ) -> tuple[int, Exception]:
+        """HSET overwrites the hash keyed by id, so insert is already an upsert."""
+        return self.insert_embeddings(embeddings, metadata, **kwargs)
+
     def search_embedding(
         self,
         query: list[float],
@@ -7,6 +7,7 @@ from typing import Any
 
 import pymysql
 
+from ...query_plan import TIDB_EXPLAIN, tidb_plan_summary
 from ..api import VectorDB
 from .config import TiDBIndexConfig
 
@@ -223,11 +224,16 @@ class TiDB(VectorDB):
         timeout: int | None = None,
         **kwargs: Any,
     ) -> list[int]:
-        self.cursor.execute(
-            f"""
+        self.cursor.execute(self._search_sql(query, k))
+        result = self.cursor.fetchall()
+        return [int(i[0]) for i in result]
+
+    def _search_sql(self, query: list[float], k: int) -> str:
+        return f"""
             SELECT id FROM {self.table_name}
             ORDER BY {self.search_fn}(embedding, "{query!s}") LIMIT {k};
             """  # noqa: S608
-        )
-        result = self.cursor.fetchall()
-        return [int(i[0]) for i in result]
+
+    def explain_search(self, query: list[float], k: int = 100) -> dict[str, Any]:
+        self.cursor.execute(TIDB_EXPLAIN + self._search_sql(query, k))
+        return tidb_plan_summary(self.cursor.fetchall())
@@ -0,0 +1,89 @@
+import logging
+import os
+import pathlib
+from enum import StrEnum
+
+log = logging.getLogger(__name__)
+
+NUMA_NODE_DIR = pathlib.Path("/sys/devices/system/node")
+
+
+class CPUPinning(StrEnum):
+    NONE = "none"  # let the OS scheduler place the search processes
+    ROUND_ROBIN = "round_robin"  # process i is pinned to the i-th available core
+    NUMA = "numa"  # process i is pinned to all available cores of the (i % num_nodes)-th NUMA node
+
+
+def parse_cpu_list(cpu_list: str) -> list[int]:
+    """parse the linux cpu list format, like `0-3,8,10-11`"""
+    cpus = []
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def available_cpus(reserved_cpus: list[int] | None = None) -> list[int]:
+    """cpus this process may run on, minus the reserved ones"""
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+    reserved = set(reserved_cpus or [])
+    return [c for c in cpus if c not in reserved]
+
+
+def numa_nodes() -> list[list[int]]:
+    """cpus of each NUMA node, a single node with all cpus if the topology is unknown"""
+    nodes = []
+    for node_dir in sorted(NUMA_NODE_DIR.glob("node[0-9]*"), key=lambda p: int(p.name[4:])):
+        try:
+            nodes.append(parse_cpu_list((node_dir / "cpulist").read_text()))
+        except OSError as e:
+            log.debug(f"Failed to read NUMA node {node_dir}: {e}")
+    return [n for n in nodes if n] or [available_cpus()]
+
+
+def plan_affinity(num_workers: int, pinning: CPUPinning, reserved_cpus: list[int] | None = None) -> list[list[int]]:
+    """cpus of each search process, empty lists when not pinned"""
+    if pinning == CPUPinning.NONE:
+        return [[] for _ in range(num_workers)]
+
+    cpus = available_cpus(reserved_cpus)
+    if not cpus:
+        msg = f"no cpu left after reserving {reserved_cpus}"
+        raise ValueError(msg)
+
+    if pinning == CPUPinning.ROUND_ROBIN:
+        if num_workers > len(cpus):
+            log.warning(f"{num_workers} search processes share {len(cpus)} pinned cpus")
+        return [[cpus[i % len(cpus)]] for i in range(num_workers)]
+
+    allowed = set(cpus)
+    nodes = [[c for c in node if c in allowed] for node in numa_nodes()]
+    nodes = [node for node in nodes if node]
+    return [nodes[i % len(nodes)] for i in range(num_workers)]
+
+
+def split_cpus(num_slices: int, cpus_per_slice: int = 0, reserved_cpus: list[int] | None = None) -> list[list[int]]:
+    """disjoint cpu slices for cases running in parallel, all available cpus are split evenly by default"""
+    cpus = available_cpus(reserved_cpus)
+    if not cpus:
+        msg = f"no cpu left after reserving {reserved_cpus}"
+        raise ValueError(msg)
+
+    if cpus_per_slice <= 0:
+        cpus_per_slice = max(1, len(cpus) // num_slices)
+    if num_slices * cpus_per_slice > len(cpus):
+        log.warning(f"{num_slices} slices of {cpus_per_slice} cpus share {len(cpus)} available cpus")
+    return [
+        sorted({cpus[(i * cpus_per_slice + j) % len(cpus)] for j in range(cpus_per_slice)}) for i in range(num_slices)
+    ]
+
+
+def pin_current_process(cpus: list[int]):
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        log.warning("os.sched_setaffinity is not supported on this platform, skip cpu pinning")
+        return
+    os.sched_setaffinity(0, cpus)
@@ -0,0 +1,123 @@
+import fcntl
+import hashlib
+import json
+import logging
+import pathlib
+from enum import StrEnum
+
+import ujson
+
+from .. import config
+from ..models import CaseResult, ResultLabel, TaskConfig, TestResult
+
+log = logging.getLogger(__name__)
+
+SECRET_FIELDS = {"password", "api_key"}
+
+
+class JournalEvent(StrEnum):
+    START = "start"
+    FINISH = "finish"
+
+
+class RunJournal:
+    """Append-only record of the cases of a run, one json object per line.
+
+    A `start` line is written before a case runs, with whether it drops the old collection,
+    and a `finish` line with the CaseResult right after it ends, so that a preempted run
+    can be resumed with the same run_id without losing or repeating finished cases.
+    """
+
+    def __init__(self, run_id: str, journal_dir: pathlib.Path | None = None):
+        self.run_id = run_id
+        journal_dir = journal_dir if journal_dir else config.RESULTS_LOCAL_DIR.joinpath("journal")
+        self.path = journal_dir.joinpath(f"{run_id}.jsonl")
+
+    @staticmethod
+    def case_key(task_config: TaskConfig) -> str:
+        b = task_config.json(exclude={"db_config": {"password", "api_key"}}, sort_keys=True)
+        return hashlib.sha1(b.encode()).hexdigest()  # noqa: S324
+
+    @staticmethod
+    def target_key(task_config: TaskConfig) -> str:
+        """the database instance the case runs on, secrets like the uri are masked by `json()`, use the raw values"""
+        db_config = {k: v for k, v in task_config.db_config.to_dict().items() if k not in SECRET_FIELDS}
+        b = json.dumps({"db": task_config.db.value, "db_config": db_config}, sort_keys=True, default=str)
+        return hashlib.sha1(b.encode()).hexdigest()  # noqa: S324
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _append(self, record: dict):
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            # the processes of targets run in parallel append to the same journal
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(ujson.dumps(record) + "\n")
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def start(self, task_config: TaskConfig, drop_old: bool):
+        self._append(
+            {
+                "event": JournalEvent.START,
+                "case": self.case_key(task_config),
+                "target": self.target_key(task_config),
+                "drop_old": drop_old,
+            }
+        )
+
+    def finish(self, case_res: CaseResult):
+        result = ujson.loads(case_res.json(exclude={"task_config": {"db_config": {"password", "api_key"}}}))
+        self._append({"event": JournalEvent.FINISH, "case": self.case_key(case_res.task_config), "result": result})
+
+    def _records(self) -> list[dict]:
+        if not self.exists():
+            return []
+        records = []
+        with self.path.open("r") as f:
+            for line in f:
+                try:
+                    records.append(ujson.loads(line))
+                except ValueError:
+                    # the last line may be truncated if the process was killed while writing it
+                    log.warning(f"Skip broken line of journal {self.path}: {line!r}")
+        return records
+
+    def _parse_result(self, result: dict, task_config: TaskConfig) -> CaseResult:
+        """the journaled db config lacks the secrets, `task_config` of the same target in the resumed run has them"""
+        journaled = {**result["task_config"], "db_config": task_config.db_config.dict()}
+        result["task_config"] = TestResult.parse_task_config(journaled, self.path)
+        return CaseResult.validate(result)
+
+    def finished(self, task_configs: list[TaskConfig]) -> dict[str, CaseResult]:
+        """CaseResults of the finished cases of `task_configs` by case key, failed cases are left to be run again"""
+        by_key = {self.case_key(t): t for t in task_configs}
+        finished = {}
+        for r in self._records():
+            if r["event"] == JournalEvent.FINISH and r["case"] in by_key:
+                case_res = self._parse_result(r["result"], by_key[r["case"]])
+                if case_res.label != ResultLabel.FAILED:
+                    finished[r["case"]] = case_res
+        return finished
+
+    def loaded(self, task_config: TaskConfig) -> CaseResult | None:
+        """The result of the case that loaded the collection currently in the database of `task_config`.
+
+        None if no case has loaded data, or the latest case that dropped the old collection
+        didn't finish successfully, in which case the collection may be partially loaded.
+        """
+        target = self.target_key(task_config)
+        loaded_key, loaded = None, None
+        for r in self._records():
+            if r["event"] == JournalEvent.START and r["drop_old"] and r["target"] == target:
+                loaded_key, loaded = r["case"], None
+            elif r["event"] == JournalEvent.FINISH and r["case"] == loaded_key:
+                loaded = r["result"]
+        if loaded is None:
+            return None
+        case_res = self._parse_result(loaded, task_config)
+        return case_res if case_res.label == ResultLabel.NORMAL else None
@@ -0,0 +1,134 @@
+"""Summaries of the plans of sampled searches, from the EXPLAIN ANALYZE of SQL-backed clients.
+
+Each engine reports its plan in its own format, the parsers here reduce one to a dict of the scan type of the
+vector search and the counters of PLAN_COUNTERS the engine reports, which `summarize_plans` aggregates over the
+samples of a serial search.
+"""
+
+import json
+import re
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+PLAN_COUNTERS = (
+    "execution_ms",
+    "shared_hit_blocks",  # pages found in the buffer pool
+    "shared_read_blocks",  # pages read from disk, or the OS cache
+    "heap_fetches",
+    "rows_examined",  # rows returned by the scans
+    "rows_removed_by_filter",
+)
+
+
+# prefixes of the searches of each engine, for the plan their parser reads
+PG_EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+MARIADB_EXPLAIN = "ANALYZE FORMAT=JSON "
+TIDB_EXPLAIN = "EXPLAIN ANALYZE "
+
+
+def _pg_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _pg_nodes(child)
+
+
+def pg_plan_summary(explain: list | dict) -> dict[str, Any]:
+    """Postgres `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`, buffer counts of the top node include its children's"""
+    root = explain[0] if isinstance(explain, list) else explain
+    plan = root["Plan"]
+    nodes = list(_pg_nodes(plan))
+    scans = [n for n in nodes if n["Node Type"].endswith("Scan")]
+    return {
+        "scan_type": scans[0]["Node Type"] if scans else plan["Node Type"],
+        "execution_ms": root.get("Execution Time", 0.0),
+        "shared_hit_blocks": plan.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": plan.get("Shared Read Blocks", 0),
+        "heap_fetches": sum(n.get("Heap Fetches", 0) for n in nodes),
+        "rows_examined": sum(n.get("Actual Rows", 0) * n.get("Actual Loops", 1) for n in scans),
+        # per loop averages
+        "rows_removed_by_filter": sum(
+            (n.get("Rows Removed by Filter", 0) + n.get("Rows Removed by Index Recheck", 0)) * n.get("Actual Loops", 1)
+            for n in nodes
+        ),
+    }
+
+
+def _mariadb_tables(node: Any) -> Iterator[dict]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "table" and isinstance(value, dict) and "access_type" in value:
+                yield value
+            else:
+                yield from _mariadb_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mariadb_tables(value)
+
+
+def mariadb_plan_summary(analyze: str | dict) -> dict[str, Any]:
+    """MariaDB `ANALYZE FORMAT=JSON`, pages of `r_engine_stats` are InnoDB's, reported since MariaDB 11"""
+    doc = json.loads(analyze) if isinstance(analyze, str) else analyze
+    block = doc["query_block"]
+    tables = list(_mariadb_tables(block))
+    summary = {
+        "scan_type": tables[0]["access_type"] if tables else "unknown",
+        "execution_ms": block.get("r_total_time_ms", 0.0),
+        "rows_examined": sum(t.get("r_rows", 0) * t.get("r_loops", 1) for t in tables),
+        "rows_removed_by_filter": round(
+            sum(t.get("r_rows", 0) * t.get("r_loops", 1) * (1 - t.get("r_filtered", 100) / 100) for t in tables),
+            4,
+        ),
+    }
+    engine_stats = [t["r_engine_stats"] for t in tables if "r_engine_stats" in t]
+    if engine_stats:
+        reads = sum(s.get("pages_read_count", 0) for s in engine_stats)
+        summary["shared_hit_blocks"] = sum(s.get("pages_accessed", 0) for s in engine_stats) - reads
+        summary["shared_read_blocks"] = reads
+    return summary
+
+
+TIDB_TIME_UNITS = {"ns": 1e-6, "µs": 1e-3, "us": 1e-3, "ms": 1.0, "s": 1e3, "m": 6e4}
+
+
+def tidb_plan_summary(rows: Sequence[Sequence]) -> dict[str, Any]:
+    """TiDB `EXPLAIN ANALYZE`, rows of (id, estRows, actRows, task, access object, execution info, operator info, ...)
+
+    The operators are listed depth first, a Selection filters the rows of the operator listed right after it.
+    """
+    ops = [(re.sub(r"_\d+$", "", re.sub(r"^[\s│├└─]+", "", row[0])), int(row[2] or 0), row) for row in rows]
+    scans = [(name, act_rows, row) for name, act_rows, row in ops if name.endswith("Scan")]
+    scan_type = "unknown"
+    if scans:
+        name, _, row = scans[0]
+        scan_type = f"{name} (annIndex)" if "annIndex" in str(row[6]) else name
+
+    removed = 0
+    for i, (name, act_rows, _) in enumerate(ops[:-1]):
+        if name == "Selection":
+            removed += max(ops[i + 1][1] - act_rows, 0)
+
+    summary = {
+        "scan_type": scan_type,
+        "rows_examined": sum(act_rows for _, act_rows, _ in scans),
+        "rows_removed_by_filter": removed,
+    }
+    elapsed = re.search(r"time:([\d.]+)(ns|µs|us|ms|s|m)\b", str(rows[0][5])) if rows else None
+    if elapsed:
+        summary["execution_ms"] = round(float(elapsed.group(1)) * TIDB_TIME_UNITS[elapsed.group(2)], 4)
+    return summary
+
+
+def summarize_plans(plans: list[dict[str, Any]]) -> tuple[dict[str, float], dict[str, int]]:
+    """Mean and p99 of each counter over the sampled plans, and how many samples used each scan type"""
+    if not plans:
+        return {}, {}
+    stats = {"samples": len(plans)}
+    for key in PLAN_COUNTERS:
+        values = [p[key] for p in plans if key in p]
+        if values:
+            stats[f"{key}_avg"] = round(float(np.mean(values)), 4)
+            stats[f"{key}_p99"] = round(float(np.percentile(values, 99)), 4)
+    return stats, dict(Counter(p["scan_type"] for p in plans))
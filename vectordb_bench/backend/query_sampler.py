@@ -0,0 +1,110 @@
+import logging
+import math
+import pathlib
+import random
+from collections.abc import Iterator
+from enum import StrEnum
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# number of indices drawn from numpy at once
+SAMPLE_CHUNK_SIZE = 4096
+
+
+class QueryDistribution(StrEnum):
+    SEQUENTIAL = "sequential"  # loop through the test data from a random offset
+    UNIFORM = "uniform"
+    ZIPF = "zipf"
+    HOT_SET = "hot_set"
+    TRACE = "trace"  # replay query indices from a file
+
+
+class QuerySampler:
+    """Picks the next test query of a concurrent search process.
+
+    The rank -> query permutation of zipf and hot_set only depends on `seed`, so all processes
+    share the same hot queries, while each process draws from its own random generator.
+
+    Args:
+        distribution(QueryDistribution): default to sequential, the historical behavior
+        zipf_skew(float): exponent s of zipf, P(rank i) ~ 1 / i^s
+        hot_set_ratio(float): share of the test data in the hot set
+        hot_set_prob(float): probability that a query is drawn from the hot set
+        trace_file(str): text file with one test query index per line, or .npy array, for trace
+        seed(int): seed of the rank -> query permutation
+    """
+
+    def __init__(
+        self,
+        distribution: QueryDistribution | str = QueryDistribution.SEQUENTIAL,
+        zipf_skew: float = 1.1,
+        hot_set_ratio: float = 0.01,
+        hot_set_prob: float = 0.9,
+        trace_file: str | None = None,
+        seed: int = 0,
+    ):
+        self.distribution = QueryDistribution(distribution)
+        self.zipf_skew = zipf_skew
+        self.hot_set_ratio = hot_set_ratio
+        self.hot_set_prob = hot_set_prob
+        self.trace_file = trace_file
+        self.seed = seed
+
+        if self.distribution == QueryDistribution.ZIPF and zipf_skew <= 0:
+            msg = f"zipf_skew must be positive, got {zipf_skew}"
+            raise ValueError(msg)
+        if self.distribution == QueryDistribution.HOT_SET and not (0 < hot_set_ratio <= 1 and 0 <= hot_set_prob <= 1):
+            msg = f"invalid hot set, hot_set_ratio={hot_set_ratio}, hot_set_prob={hot_set_prob}"
+            raise ValueError(msg)
+        if self.distribution == QueryDistribution.TRACE and not trace_file:
+            msg = "trace_file is required by the trace query distribution"
+            raise ValueError(msg)
+
+    def __repr__(self) -> str:
+        return f"QuerySampler({self.distribution.value})"
+
+    def _load_trace(self, num: int) -> np.ndarray:
+        path = pathlib.Path(self.trace_file)
+        trace = np.load(path) if path.suffix == ".npy" else np.loadtxt(path, dtype=np.int64, ndmin=1)
+        trace = np.asarray(trace, dtype=np.int64)
+        if len(trace) == 0:
+            msg = f"empty query trace file: {path}"
+            raise ValueError(msg)
+        if trace.min() < 0 or trace.max() >= num:
+            log.warning(f"query trace {path} has indices out of [0, {num}), wrap them around")
+        return trace % num
+
+    def indices(self, num: int) -> Iterator[int]:
+        """Endless iterator of indices in [0, num)"""
+        rng = np.random.default_rng()
+        start = random.randint(0, num - 1)
+
+        if self.distribution == QueryDistribution.SEQUENTIAL:
+            idx = start
+            while True:
+                yield idx
+                idx = idx + 1 if idx < num - 1 else 0
+
+        if self.distribution == QueryDistribution.TRACE:
+            trace = self._load_trace(num)
+            idx = start % len(trace)
+            while True:
+                yield int(trace[idx])
+                idx = idx + 1 if idx < len(trace) - 1 else 0
+
+        rank2query = np.random.default_rng(self.seed).permutation(num)
+        if self.distribution == QueryDistribution.ZIPF:
+            weights = 1.0 / np.power(np.arange(1, num + 1, dtype=np.float64), self.zipf_skew)
+            probs = weights / weights.sum()
+        elif self.distribution == QueryDistribution.HOT_SET:
+            num_hot = max(1, math.ceil(num * self.hot_set_ratio))
+            probs = np.full(num, (1 - self.hot_set_prob) / num)
+            probs[:num_hot] += self.hot_set_prob / num_hot
+        else:
+            probs = None
+
+        while True:
+            ranks = rng.choice(num, size=SAMPLE_CHUNK_SIZE, p=probs)
+            yield from rank2query[ranks].tolist()
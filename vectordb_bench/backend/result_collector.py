@@ -1,15 +1,57 @@
 import logging
 import pathlib
+import threading
 
 from vectordb_bench.models import TestResult
 
 log = logging.getLogger(__name__)
 
+RESULT_FILE_PATTERN = "result_*.json"
+
 
 class ResultCollector:
+    # parsed TestResult of each result file by path, with the (mtime, size) it was parsed at.
+    # Shared by all callers in the process, like the pages and sessions of the frontend.
+    _file_cache: dict[pathlib.Path, tuple[tuple[float, int], TestResult]] = {}
+    _lock = threading.Lock()
+
     @classmethod
     def collect(cls, result_dir: pathlib.Path) -> list[TestResult]:
-        reg = "result_*.json"
+        """TestResults of all runs under `result_dir`, only new or changed result files are read again"""
+        files = sorted(result_dir.rglob(RESULT_FILE_PATTERN)) if result_dir.exists() else []
+        with cls._lock:
+            stats = {}
+            for f in files:
+                st = f.stat()
+                stats[f] = (st.st_mtime, st.st_size)
+
+            stale = [f for f in files if f not in cls._file_cache or cls._file_cache[f][0] != stats[f]]
+            if stale:
+                log.debug(f"Read {len(stale)} new or changed result files under {result_dir}")
+                for f in stale:
+                    cls._file_cache[f] = (stats[f], TestResult.read_file(f, trans_unit=True))
+
+            for f in [f for f in cls._file_cache if f.is_relative_to(result_dir) and f not in stats]:
+                del cls._file_cache[f]
+
+            file_results = [cls._file_cache[f][1] for f in files if f in cls._file_cache]
+        return cls.merge_by_run_id(file_results)
+
+    @staticmethod
+    def merge_by_run_id(file_results: list[TestResult]) -> list[TestResult]:
+        """Group result files of the same run_id into one TestResult, without changing the given ones"""
+        results_d = {}
+        for file_result in file_results:
+            if file_result.run_id in results_d:
+                results_d[file_result.run_id].results.extend(file_result.results)
+            else:
+                results_d[file_result.run_id] = file_result.copy(update={"results": list(file_result.results)})
+        return list(results_d.values())
+
+    @classmethod
+    def collect_files(cls, result_dir: pathlib.Path) -> list[TestResult]:
+        """parse all the result files, bypassing the caches"""
+        reg = RESULT_FILE_PATTERN
         results_d = {}
         if not result_dir.exists() or len(list(result_dir.rglob(reg))) == 0:
             return []
@@ -24,3 +66,8 @@ class ResultCollector:
                 results_d[file_result.run_id] = file_result
 
         return list(results_d.values())
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._file_cache.clear()
@@ -0,0 +1,181 @@
+import json
+import logging
+import pathlib
+import re
+from dataclasses import dataclass
+
+from ..metric import (
+    LOAD_DURATION_METRIC,
+    QPS_METRIC,
+    RECALL_METRIC,
+    SERIAL_LATENCY_P99_METRIC,
+    bootstrap_diff_ci,
+    isLowerIsBetterMetric,
+)
+from ..models import CaseResult, ResultLabel
+from .result_collector import ResultCollector
+
+log = logging.getLogger(__name__)
+
+COMPARED_METRICS = [QPS_METRIC, SERIAL_LATENCY_P99_METRIC, RECALL_METRIC, LOAD_DURATION_METRIC]
+
+# a version part of the db_label, like the `v2.2.12` of `2c8g-disk-v2.2.12`
+_VERSION_PART = re.compile(r"^v?\d+(\.\d+)+$")
+
+
+@dataclass
+class Thresholds:
+    """largest tolerated regressions, relative in percent except for the absolute recall drop"""
+
+    max_qps_drop: float = 5.0
+    max_latency_increase: float = 10.0
+    max_recall_drop: float = 0.01
+    max_load_duration_increase: float = 20.0
+
+
+@dataclass
+class MetricDelta:
+    metric: str
+    baseline: float
+    target: float
+    change: float  # relative change in percent, absolute change for recall
+    significant: bool | None  # None if either side has no repeated samples
+    regression: bool
+
+
+@dataclass
+class CaseComparison:
+    name: str
+    deltas: list[MetricDelta]
+    target_label: ResultLabel | None = ResultLabel.NORMAL  # None if the case is missing in the target
+
+    @property
+    def regression(self) -> bool:
+        """a metric got worse, or the case failed or is missing in the target"""
+        return self.target_label != ResultLabel.NORMAL or any(d.regression for d in self.deltas)
+
+
+def db_label_key(db_label: str) -> str:
+    """the db_label without its version parts, `2c8g-disk-v2.2.12` matches `2c8g-disk-v2.3.0`"""
+    return "-".join(part for part in db_label.split("-") if not _VERSION_PART.match(part))
+
+
+def case_key(case_res: CaseResult) -> str:
+    """cases match by db, db_label, case and index configs, the db version is what is compared,
+    also when it is part of the db_label"""
+    task_config = case_res.task_config
+    return json.dumps(
+        {
+            "db": task_config.db.value,
+            "db_label": db_label_key(task_config.db_config.db_label),
+            "case_id": task_config.case_config.case_id.value,
+            "custom_case": task_config.case_config.custom_case,
+            "k": task_config.case_config.k,
+            "db_case_config": task_config.db_case_config.dict(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+def case_name(case_res: CaseResult) -> str:
+    task_config = case_res.task_config
+    return f"{task_config.db_name} {task_config.case_config.case_name}"
+
+
+def load_case_results(source: str, results_dir: pathlib.Path) -> list[CaseResult]:
+    """case results of a result directory, or of a run_id (or its unique prefix) under `results_dir`"""
+    path = pathlib.Path(source)
+    if path.is_dir():
+        return [r for test_result in ResultCollector.collect(path) for r in test_result.results]
+
+    runs = [r for r in ResultCollector.collect(results_dir) if r.run_id.startswith(source)]
+    if len(runs) != 1:
+        msg = f"{len(runs)} runs match run_id {source} under {results_dir}, expected exactly one"
+        raise ValueError(msg)
+    return runs[0].results
+
+
+def samples_of(case_res: CaseResult, metric: str) -> list[float]:
+    return getattr(case_res.metrics, f"repeat_{metric}_list", [])
+
+
+def compare_metric(metric: str, baseline: CaseResult, target: CaseResult, thresholds: Thresholds) -> MetricDelta | None:
+    base_v, target_v = getattr(baseline.metrics, metric), getattr(target.metrics, metric)
+    if not base_v:
+        return None  # not measured in the baseline, a target of 0 is a drop of 100%
+
+    if metric == RECALL_METRIC:
+        change = target_v - base_v
+        beyond = -change > thresholds.max_recall_drop
+    else:
+        change = (target_v / base_v - 1) * 100
+        if metric == QPS_METRIC:
+            beyond = -change > thresholds.max_qps_drop
+        elif metric == LOAD_DURATION_METRIC:
+            beyond = change > thresholds.max_load_duration_increase
+        else:
+            beyond = change > thresholds.max_latency_increase
+
+    significant = None
+    base_samples, target_samples = samples_of(baseline, metric), samples_of(target, metric)
+    if len(base_samples) > 1 and len(target_samples) > 1:
+        low, high = bootstrap_diff_ci(base_samples, target_samples)
+        significant = low > 0 or high < 0
+
+    worse = target_v < base_v if not isLowerIsBetterMetric(metric) else target_v > base_v
+    return MetricDelta(
+        metric=metric,
+        baseline=base_v,
+        target=target_v,
+        change=round(change, 4),
+        significant=significant,
+        regression=worse and beyond and significant is not False,
+    )
+
+
+def compare_results(
+    baseline: list[CaseResult],
+    target: list[CaseResult],
+    thresholds: Thresholds,
+) -> tuple[list[CaseComparison], list[str]]:
+    """Match the cases of both sides and compare the metrics of the successful ones.
+
+    A metric regresses when it gets worse beyond its threshold, unless both sides have repeated
+    samples and the bootstrap confidence interval of the difference contains 0. A successful
+    baseline case that failed or is missing in the target is a regression too.
+
+    Returns:
+        list[CaseComparison]: cases successful in the baseline, and those of the target that match them
+        list[str]: names of the cases found on only one side
+    """
+
+    def by_key(results: list[CaseResult], labels: tuple[ResultLabel, ...]) -> dict[str, CaseResult]:
+        keyed = {}
+        for r in results:
+            if r.label not in labels:
+                continue
+            key = case_key(r)
+            if key in keyed:
+                log.warning(f"Case {case_name(r)} appears more than once, compare the last one")
+            keyed[key] = r
+        return keyed
+
+    base_d = by_key(baseline, (ResultLabel.NORMAL,))
+    target_d = by_key(target, tuple(ResultLabel))
+    comparisons, unmatched = [], []
+    for key, base_res in base_d.items():
+        target_res = target_d.get(key)
+        if target_res is None:
+            comparisons.append(CaseComparison(name=case_name(base_res), deltas=[], target_label=None))
+            unmatched.append(f"baseline only: {case_name(base_res)}")
+        elif target_res.label != ResultLabel.NORMAL:
+            comparisons.append(CaseComparison(name=case_name(target_res), deltas=[], target_label=target_res.label))
+        else:
+            deltas = [compare_metric(m, base_res, target_res, thresholds) for m in COMPARED_METRICS]
+            comparisons.append(CaseComparison(name=case_name(target_res), deltas=[d for d in deltas if d]))
+
+    unmatched.extend(
+        f"target only: {case_name(r)}" for k, r in target_d.items() if k not in base_d and r.label == ResultLabel.NORMAL
+    )
+    return comparisons, unmatched
@@ -1,10 +1,17 @@
+from .distributed_runner import DistributedSearchCoordinator, serve_agent
+from .mixed_runner import MixedWorkloadRunner
 from .mp_runner import MultiProcessingSearchRunner
 from .read_write_runner import ReadWriteRunner
 from .serial_runner import SerialInsertRunner, SerialSearchRunner
+from .trace_runner import TraceReplayRunner
 
 __all__ = [
+    "DistributedSearchCoordinator",
+    "MixedWorkloadRunner",
     "MultiProcessingSearchRunner",
     "ReadWriteRunner",
     "SerialInsertRunner",
     "SerialSearchRunner",
+    "TraceReplayRunner",
+    "serve_agent",
 ]
@@ -0,0 +1,395 @@
+"""Concurrent search load generated from several hosts.
+
+A coordinator, running the case, waits for `num_agents` agents to connect over TCP, hands them the task,
+then for each concurrency splits the search processes among the agents, synchronizes their start and
+merges their latency histograms and counters into the usual concurrent search results.
+
+Messages are length-prefixed JSON. The task sent to agents contains the database credentials, so the coordinator
+only starts with a DISTRIBUTED_TOKEN set, hands the task only to agents presenting it, and by default listens on
+the loopback interface. Set DISTRIBUTED_BIND_HOST to reach agents on other hosts, on a trusted network only.
+
+Agents start at a wall-clock time set by the coordinator, hosts should be NTP-synchronized.
+"""
+
+import contextlib
+import hmac
+import json
+import logging
+import socket
+import struct
+import time
+from collections.abc import Callable
+
+import numpy as np
+from pydantic import SecretStr
+
+from ... import config
+from ...models import CaseConfig, ConcurrencySearchConfig, PerformanceTimeoutError, TaskConfig, TaskStage
+from ..clients import DB
+from ..data_source import DatasetSource
+from .mp_runner import MultiProcessingSearchRunner
+
+log = logging.getLogger(__name__)
+
+# seconds between the start message and the start of searching, to cover the network delay
+START_DELAY = 1.0
+# seconds an agent has to present its hello before the connection is dropped
+HANDSHAKE_TIMEOUT = 10.0
+# largest message accepted, the hello of an agent is checked before anything larger is read
+MAX_MESSAGE_SIZE, MAX_HELLO_SIZE = 64 * 1024 * 1024, 4096
+# log-spaced latency buckets from 10us to 100s, ~2.3% wide each
+HIST_MIN_LATENCY, HIST_MAX_LATENCY, HIST_NUM_BUCKETS = 1e-5, 100.0, 700
+
+
+class DistributedRunnerError(RuntimeError):
+    pass
+
+
+def send_msg(sock: socket.socket, msg: dict):
+    data = json.dumps(msg).encode()
+    sock.sendall(struct.pack(">I", len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            msg = "connection closed by peer"
+            raise DistributedRunnerError(msg)
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def recv_msg(sock: socket.socket, expected: str | None = None, max_size: int = MAX_MESSAGE_SIZE) -> dict:
+    (size,) = struct.unpack(">I", _recv_exact(sock, 4))
+    if size > max_size:
+        err = f"message of {size} bytes, larger than {max_size}"
+        raise DistributedRunnerError(err)
+    msg = json.loads(_recv_exact(sock, size))
+    if not isinstance(msg, dict):
+        err = f"expect a JSON object, got {type(msg).__name__}"
+        raise DistributedRunnerError(err)
+    if msg.get("type") == "error":
+        raise DistributedRunnerError(msg.get("msg"))
+    if expected is not None and msg.get("type") != expected:
+        err = f"expect message {expected}, got {msg.get('type')}"
+        raise DistributedRunnerError(err)
+    return msg
+
+
+def parse_address(address: str, default_port: int = config.DISTRIBUTED_PORT) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host:
+        return port, default_port
+    return host, int(port)
+
+
+class LatencyHistogram:
+    """Fixed log-spaced buckets, so that histograms of different hosts can be merged by adding the counts."""
+
+    edges = np.logspace(np.log10(HIST_MIN_LATENCY), np.log10(HIST_MAX_LATENCY), HIST_NUM_BUCKETS + 1)
+
+    def __init__(self):
+        self.counts = np.zeros(HIST_NUM_BUCKETS + 2, dtype=np.int64)  # plus underflow and overflow
+        self.total = 0.0
+
+    def add(self, latencies: list[float]):
+        if len(latencies) == 0:
+            return
+        lat = np.asarray(latencies, dtype=np.float64)
+        np.add.at(self.counts, np.searchsorted(self.edges, lat, side="right"), 1)
+        self.total += float(lat.sum())
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts += other.counts
+        self.total += other.total
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float("nan")
+
+    def percentile(self, p: float) -> float:
+        """upper edge of the bucket holding the p-th percentile"""
+        if self.count == 0:
+            return float("nan")
+        # counts[i] holds [edges[i-1], edges[i]), counts[0] and counts[-1] are the underflow and overflow
+        idx = np.searchsorted(np.cumsum(self.counts), self.count * p / 100, side="left")
+        return float(self.edges[min(idx, HIST_NUM_BUCKETS)])
+
+    def to_dict(self) -> dict:
+        nonzero = np.flatnonzero(self.counts)
+        return {"buckets": nonzero.tolist(), "counts": self.counts[nonzero].tolist(), "total": self.total}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "LatencyHistogram":
+        h = cls()
+        h.counts[d["buckets"]] = d["counts"]
+        h.total = d["total"]
+        return h
+
+
+def task_to_payload(task_config: TaskConfig, run_id: str, dataset_source: str) -> dict:
+    """Everything an agent needs to rebuild the case runner, including the secrets of db_config."""
+
+    def encoder(v: any) -> any:
+        if isinstance(v, SecretStr):
+            return v.get_secret_value()
+        return str(v)
+
+    return {
+        "run_id": run_id,
+        "dataset_source": dataset_source,
+        "db": task_config.db.value,
+        "db_config": json.loads(task_config.db_config.json(encoder=encoder)),
+        "db_case_config": json.loads(task_config.db_case_config.json()),
+        "case_config": json.loads(task_config.case_config.json()),
+    }
+
+
+def prepare_search_runner(payload: dict) -> MultiProcessingSearchRunner:
+    """Rebuild the concurrent search runner of the coordinator's case on an agent."""
+    # task_runner imports this module
+    from ..task_runner import CaseRunner, RunningStatus  # noqa: PLC0415
+
+    db = DB(payload["db"])
+    raw_case_cfg = payload["db_case_config"]
+    case_config = CaseConfig(**payload["case_config"])
+    # agents search locally, never hand it to another coordinator
+    case_config.concurrency_search_config = ConcurrencySearchConfig(
+        **{**case_config.concurrency_search_config.dict(), "num_agents": 0}
+    )
+    task_config = TaskConfig(
+        db=db,
+        db_config=db.config_cls(**payload["db_config"]),
+        db_case_config=db.case_config_cls(index_type=raw_case_cfg.get("index"))(**raw_case_cfg),
+        case_config=case_config,
+        stages=[TaskStage.SEARCH_CONCURRENT],
+    )
+    runner = CaseRunner(
+        run_id=payload["run_id"],
+        config=task_config,
+        ca=case_config.case,
+        status=RunningStatus.PENDING,
+        dataset_source=DatasetSource(payload["dataset_source"]),
+    )
+    runner._pre_run(drop_old=False)
+    runner._init_search_runner()
+    return runner.search_runner
+
+
+def serve_agent(
+    address: str,
+    token: str = config.DISTRIBUTED_TOKEN,
+    prepare: Callable[[dict], MultiProcessingSearchRunner] = prepare_search_runner,
+    connect_timeout: float = config.CONCURRENCY_TIMEOUT,
+):
+    """Connect to the coordinator at address, and search as told until it stops the agent."""
+    host, port = parse_address(address)
+    deadline = time.perf_counter() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError as e:
+            if time.perf_counter() > deadline:
+                raise e from None
+            time.sleep(1)
+
+    with sock:
+        send_msg(sock, {"type": "hello", "token": token, "host": socket.gethostname()})
+        try:
+            task = recv_msg(sock, "task")
+            runner = prepare(task["payload"])
+            send_msg(sock, {"type": "prepared"})
+            log.info(f"Agent connected to coordinator {host}:{port}, run_id={task['payload'].get('run_id')}")
+
+            while True:
+                msg = recv_msg(sock)
+                if msg["type"] == "stop":
+                    log.info("Agent stopped by coordinator")
+                    return
+                runner.duration = msg["duration"]
+
+                def wait_start() -> float:
+                    send_msg(sock, {"type": "ready"})
+                    return recv_msg(sock, "start")["start_at"]
+
+                count, latencies, recalls, cost = runner.run_conc_at(msg["concurrency"], wait_start)
+                hist = LatencyHistogram()
+                hist.add(latencies)
+                send_msg(
+                    sock,
+                    {
+                        "type": "result",
+                        "count": count,
+                        "hist": hist.to_dict(),
+                        "recall_sum": float(np.sum(recalls)),
+                        "recall_count": len(recalls),
+                        "cost": cost,
+                    },
+                )
+        except DistributedRunnerError:
+            raise
+        except Exception as e:
+            log.warning(f"Agent failed: {e}")
+            send_msg(sock, {"type": "error", "msg": f"{socket.gethostname()}: {e}"})
+            raise e from None
+
+
+class DistributedSearchCoordinator:
+    """Run the concurrent search stage on `num_agents` remote agents, see the module docstring.
+
+    Each concurrency in `concurrencies` is the total number of search processes over all agents.
+    """
+
+    def __init__(
+        self,
+        payload: dict,
+        num_agents: int,
+        concurrencies: list[int] = config.NUM_CONCURRENCY,
+        duration: int = config.CONCURRENCY_DURATION,
+        bind: str = f"{config.DISTRIBUTED_BIND_HOST}:{config.DISTRIBUTED_PORT}",
+        token: str = config.DISTRIBUTED_TOKEN,
+        concurrency_timeout: int = config.CONCURRENCY_TIMEOUT,
+    ):
+        if num_agents > 0 and not token:
+            msg = "DISTRIBUTED_TOKEN must be set to hand the task, with the database credentials, to remote agents"
+            raise ValueError(msg)
+        self.payload = payload
+        self.num_agents = num_agents
+        self.concurrencies = concurrencies
+        self.duration = duration
+        self.bind = parse_address(bind)
+        self.token = token
+        self.concurrency_timeout = concurrency_timeout
+        self.server: socket.socket | None = None
+        self.agents: list[socket.socket] = []
+
+    def listen(self) -> tuple[str, int]:
+        """Start listening, returns the bound address."""
+        self.server = socket.create_server(self.bind)
+        if self.concurrency_timeout > 0:
+            self.server.settimeout(self.concurrency_timeout)
+        return self.server.getsockname()[:2]
+
+    def _accept_agents(self):
+        if self.agents and len(self.agents) == self.num_agents:
+            return  # still connected and prepared since the previous run
+        if self.server is None:
+            self.listen()
+        log.info(f"Waiting for {self.num_agents} agents on {self.server.getsockname()[:2]}")
+        while len(self.agents) < self.num_agents:
+            try:
+                sock, addr = self.server.accept()
+            except TimeoutError as e:
+                msg = f"only {len(self.agents)}/{self.num_agents} agents connected in {self.concurrency_timeout}s"
+                raise PerformanceTimeoutError(msg) from e
+            sock.settimeout(HANDSHAKE_TIMEOUT)
+            try:
+                hello = recv_msg(sock, "hello", max_size=MAX_HELLO_SIZE)
+            except (OSError, ValueError, DistributedRunnerError) as e:
+                log.warning(f"Reject connection from {addr}: no valid hello, {e}")
+                sock.close()
+                continue
+            if not hmac.compare_digest(str(hello.get("token", "")).encode(), self.token.encode()):
+                log.warning(f"Reject agent {addr}: invalid token")
+                with contextlib.suppress(OSError):
+                    send_msg(sock, {"type": "error", "msg": "invalid token"})
+                sock.close()
+                continue
+            sock.settimeout(None)
+            log.info(f"Agent {hello.get('host')} connected from {addr}")
+            self.agents.append(sock)
+
+        for sock in self.agents:
+            send_msg(sock, {"type": "task", "payload": self.payload})
+        for sock in self.agents:
+            recv_msg(sock, "prepared")
+
+    def _search(self, conc: int) -> tuple[int, LatencyHistogram, float, int, float]:
+        shares = [conc // self.num_agents + (i < conc % self.num_agents) for i in range(self.num_agents)]
+        active = [sock for sock, share in zip(self.agents, shares, strict=True) if share > 0]
+        for sock, share in zip(self.agents, shares, strict=True):
+            if share > 0:
+                send_msg(sock, {"type": "search", "concurrency": share, "duration": self.duration})
+        for sock in active:
+            recv_msg(sock, "ready")
+
+        start_at = time.time() + START_DELAY
+        for sock in active:
+            send_msg(sock, {"type": "start", "start_at": start_at})
+
+        count, hist, recall_sum, recall_count, cost = 0, LatencyHistogram(), 0.0, 0, 0.0
+        for sock in active:
+            res = recv_msg(sock, "result")
+            count += res["count"]
+            hist.merge(LatencyHistogram.from_dict(res["hist"]))
+            recall_sum += res["recall_sum"]
+            recall_count += res["recall_count"]
+            cost = max(cost, res["cost"])
+        return count, hist, recall_sum, recall_count, cost
+
+    def run(self, keep_agents: bool = False) -> tuple:
+        """
+        Args:
+            keep_agents: keep the agents connected for another run, they are stopped on errors anyway
+
+        Returns:
+            the same results as MultiProcessingSearchRunner.run
+        """
+        max_qps = 0
+        conc_num_list, conc_qps_list, conc_recall_list = [], [], []
+        conc_latency_p99_list, conc_latency_p95_list, conc_latency_p90_list, conc_latency_avg_list = [], [], [], []
+        try:
+            self._accept_agents()
+            for conc in self.concurrencies:
+                log.info(f"Start distributed search {self.duration}s in concurrency {conc} on {self.num_agents} agents")
+                count, hist, recall_sum, recall_count, cost = self._search(conc)
+                qps = round(count / cost, 4) if cost > 0 else 0.0
+                avg_recall = recall_sum / recall_count if recall_count else 0.0
+
+                conc_num_list.append(conc)
+                conc_qps_list.append(qps)
+                conc_latency_p99_list.append(hist.percentile(99))
+                conc_latency_p95_list.append(hist.percentile(95))
+                conc_latency_p90_list.append(hist.percentile(90))
+                conc_latency_avg_list.append(hist.mean())
+                conc_recall_list.append(avg_recall)
+                log.info(
+                    f"End distributed search in concurrency {conc}: dur={cost}s, total_count={count}, "
+                    f"qps={qps}, recall={avg_recall}"
+                )
+                max_qps = max(max_qps, qps)
+        except BaseException:
+            self.stop()
+            raise
+
+        if not keep_agents:
+            self.stop()
+
+        return (
+            max_qps,
+            conc_num_list,
+            conc_qps_list,
+            conc_latency_p99_list,
+            conc_latency_p95_list,
+            conc_latency_p90_list,
+            conc_latency_avg_list,
+            conc_recall_list,
+        )
+
+    def stop(self) -> None:
+        for sock in self.agents:
+            try:
+                send_msg(sock, {"type": "stop"})
+            except OSError as e:
+                log.debug(f"Failed to stop agent: {e}")
+            sock.close()
+        self.agents = []
+        if self.server is not None:
+            self.server.close()
+            self.server = None
@@ -0,0 +1,264 @@
+import concurrent
+import logging
+import multiprocessing as mp
+import time
+from collections.abc import Iterable
+
+import numpy as np
+
+from vectordb_bench import config
+from vectordb_bench.backend.clients import api
+from vectordb_bench.backend.dataset import DatasetManager
+from vectordb_bench.metric import Metric
+
+from .mp_runner import MultiProcessingSearchRunner
+
+log = logging.getLogger(__name__)
+
+OP_INSERT, OP_DELETE, OP_UPSERT, OP_SEARCH = 0, 1, 2, 3
+
+
+class MixedWorkloadRunner(MultiProcessingSearchRunner):
+    """Search while churning a part of an already loaded dataset.
+
+    The churn pool is a random `churn_ratio` share of the train data. Each worker owns a disjoint
+    slice of the pool and issues, according to the ratios:
+        - delete: remove live rows of its slice.
+        - insert: re-insert rows it deleted before, with their original vectors.
+        - upsert: replace live rows with their original vectors.
+        - search: a random test query.
+
+    Re-using the original vectors keeps the ground truth valid, so after each concurrency the recall is
+    computed against the neighbors that are still live, and the share of deleted ids still returned is reported.
+    """
+
+    def __init__(
+        self,
+        db: api.VectorDB,
+        dataset: DatasetManager,
+        insert_ratio: float,
+        delete_ratio: float,
+        upsert_ratio: float,
+        search_ratio: float,
+        churn_ratio: float = 0.1,
+        write_batch_size: int = config.NUM_PER_BATCH,
+        normalize: bool = False,
+        k: int = 100,
+        concurrencies: Iterable[int] = (5, 10),
+        duration: int = config.CONCURRENCY_DURATION,
+        concurrency_timeout: int = config.CONCURRENCY_TIMEOUT,
+    ):
+        self.ratios = [insert_ratio, delete_ratio, upsert_ratio, search_ratio]
+        self.churn_ratio = churn_ratio
+        self.write_batch_size = write_batch_size
+        self.normalize = normalize
+
+        test_emb = np.array(dataset.test_data, dtype=np.float32)
+        if normalize:
+            test_emb = test_emb / np.linalg.norm(test_emb, axis=1)[:, np.newaxis]
+
+        super().__init__(
+            db=db,
+            test_data=test_emb.tolist(),
+            ground_truth=dataset.gt_data,
+            k=k,
+            concurrencies=concurrencies,
+            duration=duration,
+            concurrency_timeout=concurrency_timeout,
+        )
+        self.pool_ids, self.pool_embs = self._prepare_churn_pool(dataset)
+        self.deleted = np.zeros(len(self.pool_ids), dtype=bool)
+
+    def __getstate__(self):
+        """Workers only receive their own slice of the churn pool as arguments, don't pickle the whole pool."""
+        state = self.__dict__.copy()
+        for key in ("pool_ids", "pool_embs", "deleted"):
+            state.pop(key, None)
+        return state
+
+    def _prepare_churn_pool(self, dataset: DatasetManager) -> tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng()
+        ids, embs = [], []
+        for data_df in dataset:
+            picked = rng.random(len(data_df)) < self.churn_ratio
+            if not picked.any():
+                continue
+            ids.append(data_df[dataset.data.train_id_field].to_numpy()[picked])
+            embs.append(np.stack(data_df[dataset.data.train_vector_field].to_numpy()[picked]).astype(np.float32))
+
+        pool_ids, pool_embs = np.concatenate(ids).astype(np.int64), np.concatenate(embs)
+        if self.normalize:
+            pool_embs = pool_embs / np.linalg.norm(pool_embs, axis=1)[:, np.newaxis]
+        log.info(f"Mixed workload churn pool: {len(pool_ids)} rows, churn_ratio={self.churn_ratio}")
+        return pool_ids, pool_embs
+
+    def _write(self, op: int, ids: np.ndarray, embs: np.ndarray) -> Exception | None:
+        metadata = ids.tolist()
+        if op == OP_DELETE:
+            _, error = self.db.delete_embeddings(metadata)
+        elif op == OP_INSERT:
+            _, error = self.db.insert_embeddings(embs.tolist(), metadata)
+        else:
+            _, error = self.db.upsert_embeddings(embs.tolist(), metadata)
+        return error
+
+    def mixed_search(
+        self,
+        test_data: list[list[float]],
+        pool_ids: np.ndarray,
+        pool_embs: np.ndarray,
+        deleted: np.ndarray,
+        q: mp.Queue,
+        cond: mp.Condition,
+    ) -> tuple[dict[int, int], list[float], int, np.ndarray]:
+        """
+        Returns:
+            dict[int, int]: finished rows (or queries) of each operation
+            list[float]: search latencies
+            int: failed operations count
+            np.ndarray: deleted mask of the worker's slice of the churn pool
+        """
+        # sync all process
+        q.put(1)
+        with cond:
+            cond.wait()
+
+        rng = np.random.default_rng()
+        counts = {OP_INSERT: 0, OP_DELETE: 0, OP_UPSERT: 0, OP_SEARCH: 0}
+        latencies, failed_cnt = [], 0
+        with self.db.init():
+            self.db.prepare_filter(self.filters)
+            start_time = time.perf_counter()
+            while time.perf_counter() < start_time + self.duration:
+                op = rng.choice(4, p=self.ratios)
+                if op == OP_SEARCH:
+                    s = time.perf_counter()
+                    try:
+                        self.db.search_embedding(test_data[rng.integers(len(test_data))], self.k)
+                        latencies.append(time.perf_counter() - s)
+                        counts[op] += 1
+                    except Exception as e:
+                        failed_cnt += 1
+                        log.debug(f"VectorDB search_embedding error: {e}")
+                    continue
+
+                # insert brings back deleted rows, delete and upsert work on live rows
+                candidates = np.flatnonzero(deleted) if op == OP_INSERT else np.flatnonzero(~deleted)
+                if len(candidates) == 0:
+                    continue
+                picked = rng.choice(candidates, size=min(self.write_batch_size, len(candidates)), replace=False)
+                error = self._write(op, pool_ids[picked], pool_embs[picked])
+                if error is not None:
+                    failed_cnt += 1
+                    log.debug(f"VectorDB mixed write error, op={op}: {error}")
+                    continue
+                if op != OP_UPSERT:
+                    deleted[picked] = op == OP_DELETE
+                counts[op] += len(picked)
+
+        total_dur = round(time.perf_counter() - start_time, 4)
+        log.debug(
+            f"{mp.current_process().name:16} mixed workload {self.duration}s: actual_dur={total_dur}s, "
+            f"counts={counts}, failed_cnt={failed_cnt}"
+        )
+        return counts, latencies, failed_cnt, deleted
+
+    def search_live(
+        self,
+        test_data: list[list[float]],
+        ground_truth: list[list[int]],
+        deleted_ids: set[int],
+    ) -> tuple[float, float]:
+        """Serially search all test data, recall is computed against the live neighbors only.
+
+        Returns:
+            float: recall against the first k neighbors that are not deleted
+            float: share of returned ids that were already deleted
+        """
+        recalls, deleted_hits, total_hits = [], 0, 0
+        with self.db.init():
+            self.db.prepare_filter(self.filters)
+            for idx, emb in enumerate(test_data):
+                results = self.db.search_embedding(emb, self.k)
+                live_gt = [i for i in ground_truth[idx] if i not in deleted_ids][: self.k]
+                if live_gt:
+                    recalls.append(len(set(live_gt).intersection(results)) / len(live_gt))
+                deleted_hits += sum(1 for i in results if i in deleted_ids)
+                total_hits += len(results)
+
+        return round(float(np.mean(recalls)), 4), round(deleted_hits / total_hits, 4) if total_hits else 0.0
+
+    def _run_conc(self, conc: int) -> tuple[float, float, dict[int, int], float]:
+        slices = [np.arange(i, len(self.pool_ids), conc) for i in range(conc)]
+        with mp.Manager() as m:
+            q, cond = m.Queue(), m.Condition()
+            with concurrent.futures.ProcessPoolExecutor(
+                mp_context=self.get_mp_context(),
+                max_workers=conc,
+            ) as executor:
+                log.info(f"Start mixed workload {self.duration}s in concurrency {conc}, ratios(I/D/U/S)={self.ratios}")
+                future_iter = [
+                    executor.submit(
+                        self.mixed_search,
+                        self.test_data,
+                        self.pool_ids[sl],
+                        self.pool_embs[sl],
+                        self.deleted[sl],
+                        q,
+                        cond,
+                    )
+                    for sl in slices
+                ]
+                self._wait_for_queue_fill(q, size=conc)
+
+                with cond:
+                    cond.notify_all()
+                    log.info(f"Syncing all process and start mixed workload, concurrency={conc}")
+
+                start = time.perf_counter()
+                results = [r.result() for r in future_iter]
+                cost = time.perf_counter() - start
+
+        counts = {op: sum(r[0][op] for r in results) for op in (OP_INSERT, OP_DELETE, OP_UPSERT, OP_SEARCH)}
+        latencies = sum([r[1] for r in results], start=[])
+        failed_cnt = sum(r[2] for r in results)
+        for sl, r in zip(slices, results, strict=True):
+            self.deleted[sl] = r[3]
+
+        qps = round(counts[OP_SEARCH] / cost, 4) if cost > 0 else 0.0
+        p99 = round(float(np.percentile(latencies, 99)), 4) if latencies else float("nan")
+        num_ops = sum(counts.values()) + failed_cnt
+        failed_rate = round(failed_cnt / num_ops, 4) if num_ops else 0.0
+        log.info(
+            f"End mixed workload in concurrency {conc}: dur={cost}s, search_qps={qps}, p99={p99}, "
+            f"inserted={counts[OP_INSERT]}, deleted={counts[OP_DELETE]}, upserted={counts[OP_UPSERT]}, "
+            f"failed_rate={failed_rate}, currently deleted={int(self.deleted.sum())}"
+        )
+        return qps, p99, counts, failed_rate
+
+    def _run_live_search(self) -> tuple[float, float]:
+        deleted_ids = set(self.pool_ids[self.deleted].tolist())
+        with concurrent.futures.ProcessPoolExecutor(mp_context=self.get_mp_context(), max_workers=1) as executor:
+            future = executor.submit(self.search_live, self.test_data, self.ground_truth, deleted_ids)
+            return future.result()
+
+    def run_mixed(self) -> Metric:
+        m = Metric()
+        for conc in self.concurrencies:
+            qps, p99, counts, failed_rate = self._run_conc(conc)
+            recall, deleted_hit_rate = self._run_live_search()
+            log.info(f"Live search after concurrency {conc}: recall={recall}, deleted_hit_rate={deleted_hit_rate}")
+
+            m.mixed_conc_num_list.append(conc)
+            m.mixed_qps_list.append(qps)
+            m.mixed_latency_p99_list.append(p99)
+            m.mixed_insert_count_list.append(counts[OP_INSERT])
+            m.mixed_delete_count_list.append(counts[OP_DELETE])
+            m.mixed_upsert_count_list.append(counts[OP_UPSERT])
+            m.mixed_failed_rate_list.append(failed_rate)
+            m.mixed_recall_list.append(recall)
+            m.mixed_deleted_hit_rate_list.append(deleted_hit_rate)
+
+        m.qps = max(m.mixed_qps_list, default=0.0)
+        m.recall = m.mixed_recall_list[-1] if m.mixed_recall_list else 0.0
+        return m
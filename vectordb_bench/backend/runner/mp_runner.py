@@ -4,10 +4,12 @@ import multiprocessing as mp
 import random
 import time
 import traceback
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from multiprocessing.managers import ValueProxy
 from multiprocessing.queues import Queue
 
 import numpy as np
+import psutil
 
 from vectordb_bench.backend.filter import Filter, non_filter
 
@@ -16,11 +18,21 @@ from ...metric import calc_recall
 from ...models import PerformanceTimeoutError
 from .. import utils
 from ..clients import api
+from ..cpu_affinity import CPUPinning, pin_current_process, plan_affinity
+from ..query_sampler import QuerySampler
+from .util import warmup_search
 
 NUM_PER_BATCH = config.NUM_PER_BATCH
 log = logging.getLogger(__name__)
 
 
+def replica_qps(before: dict[str, float], after: dict[str, float], duration: float) -> dict[str, float]:
+    """qps of each replica from its search counts at the start and the end of a search of duration seconds"""
+    if duration <= 0:
+        return {}
+    return {replica: round((after.get(replica, count) - count) / duration, 4) for replica, count in before.items()}
+
+
 class MultiProcessingSearchRunner:
     """multiprocessing search runner
 
@@ -28,6 +40,11 @@ class MultiProcessingSearchRunner:
         k(int): search topk, default to 100
         concurrency(Iterable): concurrencies, default [1, 5, 10, 15, 20, 25, 30, 35]
         duration(int): duration for each concurency, default to 30s
+        warmup_duration(int): seconds of warm-up searches in each process before counting, default to 0
+        warmup_queries(int): number of warm-up searches in each process before counting, default to 0
+        query_sampler(QuerySampler): how each process picks the next test query, default to sequential
+        cpu_pinning(CPUPinning): how search processes are pinned to cpus, default to none
+        reserved_cpus(list[int]): cpus never used by search processes when pinned, e.g. for the network stack
     """
 
     def __init__(
@@ -40,6 +57,11 @@ class MultiProcessingSearchRunner:
         concurrencies: Iterable[int] = config.NUM_CONCURRENCY,
         duration: int = config.CONCURRENCY_DURATION,
         concurrency_timeout: int = config.CONCURRENCY_TIMEOUT,
+        warmup_duration: int = config.WARMUP_DURATION,
+        warmup_queries: int = config.WARMUP_QUERIES,
+        query_sampler: QuerySampler | None = None,
+        cpu_pinning: CPUPinning = CPUPinning.NONE,
+        reserved_cpus: list[int] | None = None,
     ):
         self.db = db
         self.k = k
@@ -47,6 +69,16 @@ class MultiProcessingSearchRunner:
         self.concurrencies = concurrencies
         self.duration = duration
         self.concurrency_timeout = concurrency_timeout
+        self.warmup_duration = warmup_duration
+        self.warmup_queries = warmup_queries
+        self.query_sampler = query_sampler if query_sampler is not None else QuerySampler()
+        self.cpu_pinning = cpu_pinning
+        self.reserved_cpus = reserved_cpus or []
+        # cpus of each search process in the largest concurrency, and per-core utilization of each concurrency
+        self.cpu_affinity_layout: list[list[int]] = []
+        self.conc_cpu_util_list: list[list[float]] = []
+        # qps served by each replica of the collection in each concurrency, if the client counts them
+        self.conc_replica_qps_list: list[dict[str, float]] = []
 
         self.test_data = test_data
         self.ground_truth = ground_truth
@@ -58,24 +90,42 @@ class MultiProcessingSearchRunner:
         ground_truth: list[list[int]] | None,
         q: mp.Queue,
         cond: mp.Condition,
+        start_at: ValueProxy | None = None,
+        cpus: list[int] | None = None,
     ) -> tuple[int, list[float], list[float]]:
         """
         Execute search for all test_data, return (count, latencies, recalls)
-        """
-        # sync all process
-        q.put(1)
-        with cond:
-            cond.wait()
 
+        If start_at is given, wait until the wall-clock time start_at.value after syncing.
+        If cpus is given, pin this process to them.
+        """
+        pin_current_process(cpus)
         with self.db.init():
             self.db.prepare_filter(self.filters)
-            num, idx = len(test_data), random.randint(0, len(test_data) - 1)
+            query_indices = self.query_sampler.indices(len(test_data))
+            # warm up before syncing, so that warm-up queries are excluded from qps and latencies
+            warmup_search(
+                self.db,
+                test_data,
+                self.k,
+                self.warmup_duration,
+                self.warmup_queries,
+                random.randint(0, len(test_data) - 1),
+            )
+
+            # sync all process
+            q.put(1)
+            with cond:
+                cond.wait()
+            if start_at is not None and start_at.value > time.time():
+                time.sleep(start_at.value - time.time())
 
             start_time = time.perf_counter()
             count = 0
             latencies = []
             recalls = []
             while time.perf_counter() < start_time + self.duration:
+                idx = next(query_indices)
                 s = time.perf_counter()
                 try:
                     emb = test_data[idx]
@@ -87,9 +137,6 @@ class MultiProcessingSearchRunner:
                 except Exception as e:
                     log.warning(f"VectorDB search_embedding error: {e}")
 
-                # loop through the test data
-                idx = idx + 1 if idx < num - 1 else 0
-
                 if count % 500 == 0:
                     log.debug(
                         f"({mp.current_process().name:16}) "
@@ -111,6 +158,9 @@ class MultiProcessingSearchRunner:
         return mp.get_context(mp_start_method)
 
     def _run_all_concurrencies_mem_efficient(self):
+        # the runner may run again over the same load, like in repeated search stages
+        self.conc_cpu_util_list = []
+        self.conc_replica_qps_list = []
         max_qps = 0
         conc_num_list = []
         conc_qps_list = []
@@ -127,20 +177,29 @@ class MultiProcessingSearchRunner:
                         mp_context=self.get_mp_context(),
                         max_workers=conc,
                     ) as executor:
-                        log.info(f"Start search {self.duration}s in concurrency {conc}, filters: {self.filters}")
+                        log.info(
+                            f"Start search {self.duration}s in concurrency {conc}, filters: {self.filters}, "
+                            f"query distribution: {self.query_sampler}"
+                        )
+                        layout = plan_affinity(conc, self.cpu_pinning, self.reserved_cpus)
                         future_iter = [
-                            executor.submit(self.search, self.test_data, self.ground_truth, q, cond)
-                            for i in range(conc)
+                            executor.submit(self.search, self.test_data, self.ground_truth, q, cond, None, cpus)
+                            for cpus in layout
                         ]
                         # Sync all processes
                         self._wait_for_queue_fill(q, size=conc)
+                        replica_counts = self._replica_search_counts()
 
+                        psutil.cpu_percent(percpu=True)  # reset the utilization counters
                         with cond:
                             cond.notify_all()
                             log.info(f"Syncing all process and start concurrency search, concurrency={conc}")
 
                         start = time.perf_counter()
                         results = [r.result() for r in future_iter]
+                        self.conc_cpu_util_list.append(psutil.cpu_percent(percpu=True))
+                        if len(layout) > len(self.cpu_affinity_layout):
+                            self.cpu_affinity_layout = layout
                         all_count = sum([r[0] for r in results])
                         latencies = sum([r[1] for r in results], start=[])
                         recalls = sum([r[2] for r in results], start=[])
@@ -158,6 +217,10 @@ class MultiProcessingSearchRunner:
                         cost = time.perf_counter() - start
 
                         qps = round(all_count / cost, 4) if cost > 0 else 0.0
+                        if replica_counts:
+                            self.conc_replica_qps_list.append(
+                                replica_qps(replica_counts, self._replica_search_counts(), cost)
+                            )
                         conc_num_list.append(conc)
                         conc_qps_list.append(qps)
                         conc_latency_p99_list.append(latency_p99)
@@ -194,6 +257,57 @@ class MultiProcessingSearchRunner:
             conc_recall_list,
         )
 
+    def run_conc_at(self, conc: int, wait_start: Callable[[], float]) -> tuple[int, list[float], list[float], float]:
+        """Search in concurrency conc, starting at the wall-clock time returned by wait_start.
+
+        wait_start is called once all processes are ready, it is how a coordinator synchronizes
+        the start of several hosts.
+
+        Returns:
+            int: successful searches
+            list[float]: latencies
+            list[float]: recalls, empty without ground truth
+            float: seconds from the start time to the end of the last process
+        """
+        with mp.Manager() as m:
+            q, cond, start_at = m.Queue(), m.Condition(), m.Value("d", 0.0)
+            with concurrent.futures.ProcessPoolExecutor(
+                mp_context=self.get_mp_context(),
+                max_workers=conc,
+            ) as executor:
+                layout = plan_affinity(conc, self.cpu_pinning, self.reserved_cpus)
+                future_iter = [
+                    executor.submit(self.search, self.test_data, self.ground_truth, q, cond, start_at, cpus)
+                    for cpus in layout
+                ]
+                self._wait_for_queue_fill(q, size=conc)
+
+                start = wait_start()
+                with cond:
+                    start_at.value = start
+                    cond.notify_all()
+                    log.info(f"Syncing all process and start concurrency search at {start}, concurrency={conc}")
+
+                results = [r.result() for r in future_iter]
+                cost = time.time() - start
+
+        return (
+            sum(r[0] for r in results),
+            sum([r[1] for r in results], start=[]),
+            sum([r[2] for r in results], start=[]),
+            cost,
+        )
+
+    def _replica_search_counts(self) -> dict[str, float]:
+        if not self.db.replica_counts_supported():
+            return {}
+        try:
+            with self.db.init():
+                return self.db.replica_search_counts()
+        except Exception as e:
+            log.warning(f"Failed to count the searches of each replica: {e}")
+            return {}
+
     def _wait_for_queue_fill(self, q: Queue, size: int):
         wait_t = 0
         while q.qsize() < size:
@@ -292,7 +406,7 @@ class MultiProcessingSearchRunner:
 
         with self.db.init():
             self.db.prepare_filter(self.filters)
-            num, idx = len(test_data), random.randint(0, len(test_data) - 1)
+            query_indices = self.query_sampler.indices(len(test_data))
 
             start_time = time.perf_counter()
             success_count = 0
@@ -300,7 +414,7 @@ class MultiProcessingSearchRunner:
             while time.perf_counter() < start_time + dur:
                 s = time.perf_counter()
                 try:
-                    self.db.search_embedding(test_data[idx], self.k)
+                    self.db.search_embedding(test_data[next(query_indices)], self.k)
                     success_count += 1
                 except Exception as e:
                     failed_cnt += 1
@@ -310,9 +424,6 @@ class MultiProcessingSearchRunner:
                     else:
                         log.debug(f"VectorDB search_embedding error: {e}")
 
-                # loop through the test data
-                idx = idx + 1 if idx < num - 1 else 0
-
                 if success_count % 500 == 0:
                     log.debug(
                         f"({mp.current_process().name:16}) search_count: {success_count}, "
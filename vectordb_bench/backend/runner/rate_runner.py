@@ -3,7 +3,6 @@ import logging
 import multiprocessing as mp
 import time
 from concurrent.futures import ThreadPoolExecutor
-from copy import deepcopy
 
 from vectordb_bench import config
 from vectordb_bench.backend.clients import api
@@ -47,14 +46,9 @@ class RatedMultiThreadingInsertRunner:
                     msg = f"Insert failed and retried more than {config.MAX_INSERT_RETRY} times"
                     raise RuntimeError(msg) from None
 
-        if db.name == "PgVector":
-            # pgvector is not thread-safe for concurrent insert,
-            #   so we need to copy the db object, make sure each thread has its own connection
-            db_copy = deepcopy(db)
-            with db_copy.init():
-                _insert_embeddings(db_copy, emb, metadata, retry_idx=0)
-        else:
-            _insert_embeddings(db, emb, metadata, retry_idx=0)
+        # clients that are not thread-safe, like pgvector, lend each thread a connection of their own
+        with db.session() as client:
+            _insert_embeddings(client, emb, metadata, retry_idx=0)
 
     @time_it
     def run_with_rate(self, q: mp.Queue):
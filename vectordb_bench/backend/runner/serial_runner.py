@@ -12,10 +12,12 @@ from vectordb_bench.backend.dataset import DatasetManager
 from vectordb_bench.backend.filter import Filter, FilterOp, non_filter
 
 from ... import config
-from ...metric import calc_ndcg, calc_recall, get_ideal_dcg
+from ...metric import Metric, calc_ndcg, calc_recall, get_ideal_dcg
 from ...models import LoadTimeoutError, PerformanceTimeoutError
 from .. import utils
 from ..clients import api
+from ..query_plan import summarize_plans
+from .util import warmup_search
 
 NUM_PER_BATCH = config.NUM_PER_BATCH
 LOAD_MAX_TRY_COUNT = config.LOAD_MAX_TRY_COUNT
@@ -31,12 +33,15 @@ class SerialInsertRunner:
         normalize: bool,
         filters: Filter = non_filter,
         timeout: float | None = None,
+        perturbation: float = 0.0,
     ):
         self.timeout = timeout if isinstance(timeout, int | float) else None
         self.dataset = dataset
         self.db = db
         self.normalize = normalize
         self.filters = filters
+        self.perturbation = perturbation
+        self.round_count = 0
 
     def retry_insert(self, db: api.VectorDB, retry_idx: int = 0, **kwargs):
         _, error = db.insert_embeddings(**kwargs)
@@ -52,7 +57,7 @@ class SerialInsertRunner:
 
     def task(self) -> int:
         count = 0
-        with self.db.init():
+        with self.db.init(), self.db.dataset_load():
             log.info(f"({mp.current_process().name:16}) Start inserting embeddings in batch {config.NUM_PER_BATCH}")
             start = time.perf_counter()
             for data_df in self.dataset:
@@ -98,11 +103,22 @@ class SerialInsertRunner:
             )
             return count
 
-    def endless_insert_data(self, all_embeddings: list, all_metadata: list, left_id: int = 0) -> int:
+    def endless_insert_data(
+        self,
+        all_embeddings: np.ndarray,
+        all_metadata: np.ndarray,
+        left_id: int = 0,
+        round_idx: int = 0,
+    ) -> int:
+        """Insert the whole dataset once, ids are shifted by left_id to stay unique.
+
+        Embeddings and ids stay numpy arrays, only the current batch is converted to python lists.
+        From the second round on, vectors are perturbed with `self.perturbation` relative gaussian noise
+        so that the vector database can't benefit from exact duplicates.
+        The rows inserted so far in the round are kept in `self.round_count`.
+        """
+        rng = np.random.default_rng(round_idx) if self.perturbation > 0 and round_idx > 0 else None
         with self.db.init():
-            # unique id for endlessness insertion
-            all_metadata = [i + left_id for i in all_metadata]
-
             num_batches = math.ceil(len(all_embeddings) / NUM_PER_BATCH)
             log.info(
                 f"({mp.current_process().name:16}) Start inserting {len(all_embeddings)} "
@@ -112,8 +128,12 @@ class SerialInsertRunner:
             for batch_id in range(num_batches):
                 retry_count = 0
                 already_insert_count = 0
-                metadata = all_metadata[batch_id * NUM_PER_BATCH : (batch_id + 1) * NUM_PER_BATCH]
-                embeddings = all_embeddings[batch_id * NUM_PER_BATCH : (batch_id + 1) * NUM_PER_BATCH]
+                # unique id for endlessness insertion
+                metadata = (all_metadata[batch_id * NUM_PER_BATCH : (batch_id + 1) * NUM_PER_BATCH] + left_id).tolist()
+                emb_np = all_embeddings[batch_id * NUM_PER_BATCH : (batch_id + 1) * NUM_PER_BATCH]
+                if rng is not None:
+                    emb_np = self._perturb(emb_np, rng)
+                embeddings = emb_np.tolist()
 
                 log.debug(
                     f"({mp.current_process().name:16}) batch [{batch_id:3}/{num_batches}], "
@@ -125,6 +145,7 @@ class SerialInsertRunner:
                         metadata=metadata[already_insert_count:],
                     )
                     already_insert_count += insert_count
+                    self.round_count = count + already_insert_count
                     if error is not None:
                         retry_count += 1
                         time.sleep(10)
@@ -147,6 +168,15 @@ class SerialInsertRunner:
             )
         return count
 
+    def _perturb(self, emb_np: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Add gaussian noise scaled by each vector's rms, keep the length of each vector."""
+        norm = np.linalg.norm(emb_np, axis=1, keepdims=True)
+        perturbed = emb_np + rng.standard_normal(emb_np.shape, dtype=np.float32) * (
+            self.perturbation * norm / np.sqrt(emb_np.shape[1])
+        )
+        perturbed *= norm / np.linalg.norm(perturbed, axis=1, keepdims=True)
+        return perturbed
+
     @utils.time_it
     def _insert_all_batches(self) -> int:
         """Performance case only"""
@@ -169,30 +199,41 @@ class SerialInsertRunner:
             else:
                 return count
 
-    def run_endlessness(self) -> int:
-        """run forever util DB raises exception or crash"""
+    def run_endlessness(self) -> Metric:
+        """run forever util DB raises exception or crash
+
+        Returns:
+            Metric: max_load_count, and the loaded count, elapsed time and insert throughput after each round,
+                the last round being the partial one the DB failed in.
+        """
         # datasets for load tests are quite small, can fit into memory
         # only 1 file
         data_df = next(iter(self.dataset))
-        all_embeddings, all_metadata = (
-            np.stack(data_df[self.dataset.data.train_vector_field]).tolist(),
-            data_df[self.dataset.data.train_id_field].tolist(),
-        )
+        all_embeddings = np.stack(data_df[self.dataset.data.train_vector_field]).astype(np.float32, copy=False)
+        all_metadata = data_df[self.dataset.data.train_id_field].to_numpy(dtype=np.int64)
+        del data_df
 
+        # ids of each round start right after the largest id of the previous one
+        id_step = int(all_metadata.max()) + 1
+        m = Metric()
         start_time = time.perf_counter()
         max_load_count, times = 0, 0
         try:
             while time.perf_counter() - start_time < self.timeout:
+                round_start = time.perf_counter()
+                self.round_count = 0
                 count = self.endless_insert_data(
                     all_embeddings,
                     all_metadata,
-                    left_id=max_load_count,
+                    left_id=times * id_step,
+                    round_idx=times,
                 )
                 max_load_count += count
                 times += 1
+                self._record_round(m, max_load_count, count, start_time, round_start)
                 log.info(
                     f"Loaded {times} entire dataset, current max load counts={utils.numerize(max_load_count)}, "
-                    f"{max_load_count}"
+                    f"{max_load_count}, round insert throughput={m.cap_insert_throughput_list[-1]} rows/s"
                 )
         except Exception as e:
             log.info(
@@ -200,10 +241,20 @@ class SerialInsertRunner:
                 f"{max_load_count}, err={e}"
             )
             traceback.print_exc()
-            return max_load_count
+            if self.round_count > 0:
+                self._record_round(m, max_load_count + self.round_count, self.round_count, start_time, round_start)
+            m.max_load_count = max_load_count
+            return m
         else:
             raise LoadTimeoutError(self.timeout)
 
+    @staticmethod
+    def _record_round(m: Metric, load_count: int, round_count: int, start_time: float, round_start: float):
+        now = time.perf_counter()
+        m.cap_load_count_list.append(load_count)
+        m.cap_elapsed_time_list.append(round(now - start_time, 4))
+        m.cap_insert_throughput_list.append(round(round_count / (now - round_start), 4))
+
     def run(self) -> int:
         count, _ = self._insert_all_batches()
         return count
@@ -217,10 +268,18 @@ class SerialSearchRunner:
         ground_truth: list[list[int]],
         k: int = 100,
         filters: Filter = non_filter,
+        warmup_duration: int = config.WARMUP_DURATION,
+        warmup_queries: int = config.WARMUP_QUERIES,
+        explain_sample_rate: float = 0.0,
     ):
         self.db = db
         self.k = k
         self.filters = filters
+        self.warmup_duration = warmup_duration
+        self.warmup_queries = warmup_queries
+        self.explain_sample_rate = explain_sample_rate
+        self.plan_stats: dict[str, float] = {}  # of the last run, see `query_plan.summarize_plans`
+        self.plan_scan_types: dict[str, int] = {}
 
         if isinstance(test_data[0], np.ndarray):
             self.test_data = [query.tolist() for query in test_data]
@@ -241,18 +300,45 @@ class SerialSearchRunner:
 
         return results
 
-    def search(self, args: tuple[list, list[list[int]]]) -> tuple[float, float, float, float]:
+    def _explain(self, emb: list[float]) -> dict | None:
+        try:
+            return self.db.explain_search(emb, self.k)
+        except Exception as e:
+            log.warning(f"VectorDB explain_search error: {e}")
+            return None
+
+    def search(self, args: tuple[list, list[list[int]]]) -> tuple[tuple[float, float, float, float], list[dict]]:
+        """
+        Returns:
+            tuple[tuple[float, float, float, float], list[dict]]: (avg_recall, avg_ndcg, p99_latency, p95_latency),
+                and the plans of the sampled searches
+        """
         log.info(f"{mp.current_process().name:14} start search the entire test_data to get recall and latency")
+        explain_sample_rate = self.explain_sample_rate
+        if explain_sample_rate > 0 and not self.db.explain_supported():
+            log.warning(f"{self.db.name} doesn't support explain_search, no plan will be sampled")
+            explain_sample_rate = 0
+        rng = np.random.default_rng(0)  # the same queries are sampled in every run
+
         with self.db.init():
             self.db.prepare_filter(self.filters)
             test_data, ground_truth = args
             ideal_dcg = get_ideal_dcg(self.k)
+            warmup_search(self.db, test_data, self.k, self.warmup_duration, self.warmup_queries)
 
             log.debug(f"test dataset size: {len(test_data)}")
             log.debug(f"ground truth size: {len(ground_truth)}")
 
-            latencies, recalls, ndcgs = [], [], []
+            latencies, recalls, ndcgs, plans = [], [], [], []
             for idx, emb in enumerate(test_data):
+                # a sampled search is explained first, on the cache as its timed search would find it,
+                # then searched again for its recall only, its latency on the warmed cache is left out
+                sampled = explain_sample_rate > 0 and rng.random() < explain_sample_rate
+                if sampled:
+                    plan = self._explain(emb)
+                    if plan is not None:
+                        plans.append(plan)
+
                 s = time.perf_counter()
                 try:
                     results = self._get_db_search_res(emb)
@@ -260,7 +346,8 @@ class SerialSearchRunner:
                     log.warning(f"VectorDB search_embedding error: {e}")
                     raise e from None
 
-                latencies.append(time.perf_counter() - s)
+                if not sampled:
+                    latencies.append(time.perf_counter() - s)
 
                 if ground_truth is not None:
                     gt = ground_truth[idx]
@@ -270,7 +357,7 @@ class SerialSearchRunner:
                     recalls.append(0)
                     ndcgs.append(0)
 
-                if len(latencies) % 100 == 0:
+                if not sampled and len(latencies) % 100 == 0:
                     log.debug(
                         f"({mp.current_process().name:14}) search_count={len(latencies):3}, "
                         f"latest_latency={latencies[-1]}, latest recall={recalls[-1]}"
@@ -292,12 +379,17 @@ class SerialSearchRunner:
             f"p99={p99}, "
             f"p95={p95}"
         )
-        return (avg_recall, avg_ndcg, p99, p95)
+        return (avg_recall, avg_ndcg, p99, p95), plans
 
     def _run_in_subprocess(self) -> tuple[float, float, float, float]:
         with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
             future = executor.submit(self.search, (self.test_data, self.ground_truth))
-            return future.result()
+            results, plans = future.result()
+
+        self.plan_stats, self.plan_scan_types = summarize_plans(plans)
+        if plans:
+            log.info(f"Plans of {len(plans)} sampled searches: {self.plan_stats}, scan types: {self.plan_scan_types}")
+        return results
 
     @utils.time_it
     def run(self) -> tuple[float, float, float, float]:
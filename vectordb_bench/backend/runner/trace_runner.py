@@ -0,0 +1,198 @@
+import concurrent
+import logging
+import multiprocessing as mp
+import time
+from multiprocessing.managers import ValueProxy
+
+import numpy as np
+import pandas as pd
+
+from ... import config
+from ...metric import Metric
+from ...models import PerformanceTimeoutError
+from ..clients import api
+from ..trace import QueryTrace, filter_from_json
+from .mp_runner import MultiProcessingSearchRunner
+
+log = logging.getLogger(__name__)
+
+# seconds between the start signal and the first scheduled query, so that all processes start on time
+START_DELAY = 1.0
+
+
+class TraceReplayRunner:
+    """Replay a query trace against a VectorDB with open-loop scheduling.
+
+    Query i is due at `start + timestamp_i / speedup`, whether or not the earlier queries are done.
+    Queries are dealt round-robin to `num_workers` processes, a process that falls behind sends its
+    queries late, which is reported as the deviation from schedule instead of slowing the schedule down.
+
+    For each query, the latency is measured from the actual send time, and the response time from the
+    scheduled time, so queueing in an overloaded client or database isn't hidden.
+    """
+
+    def __init__(
+        self,
+        db: api.VectorDB,
+        trace: QueryTrace,
+        speedup: float = 1.0,
+        num_workers: int = 8,
+        concurrency_timeout: int = config.CONCURRENCY_TIMEOUT,
+    ):
+        if speedup <= 0:
+            msg = f"speedup must be positive, got {speedup}"
+            raise ValueError(msg)
+        if len(trace) == 0:
+            msg = "empty query trace"
+            raise ValueError(msg)
+        self.db = db
+        self.speedup = speedup
+        self.num_workers = max(1, min(num_workers, len(trace)))
+        self.concurrency_timeout = concurrency_timeout
+        self.trace = trace
+
+    def __getstate__(self):
+        """Workers receive their own share of the trace as arguments."""
+        state = self.__dict__.copy()
+        state.pop("trace", None)
+        return state
+
+    def replay(
+        self,
+        indices: np.ndarray,
+        schedule: np.ndarray,
+        embs: np.ndarray,
+        ks: np.ndarray,
+        filters: list[str | None],
+        q: mp.Queue,
+        cond: mp.Condition,
+        start_at: ValueProxy,
+    ) -> pd.DataFrame:
+        """Send the queries of this worker at their scheduled time.
+
+        Returns:
+            pd.DataFrame: idx, scheduled, sent, latency, response_time, success of each query, times in seconds
+        """
+        sent = np.zeros(len(indices), dtype=np.float64)
+        latencies = np.zeros(len(indices), dtype=np.float64)
+        success = np.zeros(len(indices), dtype=bool)
+        with self.db.init():
+            current_filter = None
+            self.db.prepare_filter(filter_from_json(current_filter))
+
+            # sync all process
+            q.put(1)
+            with cond:
+                cond.wait()
+            start = start_at.value
+
+            for i in range(len(indices)):
+                if filters[i] != current_filter:
+                    current_filter = filters[i]
+                    self.db.prepare_filter(filter_from_json(current_filter))
+
+                wait_t = start + schedule[i] - time.time()
+                if wait_t > 0:
+                    time.sleep(wait_t)
+
+                s = time.time()
+                try:
+                    self.db.search_embedding(embs[i].tolist(), int(ks[i]))
+                    success[i] = True
+                except Exception as e:
+                    log.debug(f"VectorDB search_embedding error: {e}")
+                latencies[i] = time.time() - s
+                sent[i] = s - start
+
+        log.debug(
+            f"{mp.current_process().name:16} replayed {len(indices)} queries, failed={int((~success).sum())}, "
+            f"max deviation={round(float(np.max(sent - schedule, initial=0)), 4)}s"
+        )
+        return pd.DataFrame(
+            {
+                "idx": indices,
+                "scheduled": schedule,
+                "sent": sent,
+                "latency": latencies,
+                "response_time": sent - schedule + latencies,
+                "success": success,
+            },
+        )
+
+    def _wait_for_queue_fill(self, q: mp.Queue, size: int):
+        wait_t = 0
+        while q.qsize() < size:
+            sleep_t = size if size < 10 else 10
+            wait_t += sleep_t
+            if wait_t > self.concurrency_timeout > 0:
+                raise PerformanceTimeoutError
+            time.sleep(sleep_t)
+
+    def _run_replay(self) -> pd.DataFrame:
+        schedule = self.trace.timestamps / self.speedup
+        with mp.Manager() as m:
+            q, cond, start_at = m.Queue(), m.Condition(), m.Value("d", 0.0)
+            with concurrent.futures.ProcessPoolExecutor(
+                mp_context=MultiProcessingSearchRunner.get_mp_context(),
+                max_workers=self.num_workers,
+            ) as executor:
+                log.info(
+                    f"Start replaying {len(self.trace)} queries of {round(self.trace.duration, 4)}s trace, "
+                    f"speedup={self.speedup}, workers={self.num_workers}"
+                )
+                future_iter = []
+                for w in range(self.num_workers):
+                    idx = np.arange(w, len(self.trace), self.num_workers)
+                    future_iter.append(
+                        executor.submit(
+                            self.replay,
+                            idx,
+                            schedule[idx],
+                            self.trace.embs[idx],
+                            self.trace.ks[idx],
+                            [self.trace.filters[i] for i in idx],
+                            q,
+                            cond,
+                            start_at,
+                        )
+                    )
+                self._wait_for_queue_fill(q, size=self.num_workers)
+
+                with cond:
+                    start_at.value = time.time() + START_DELAY
+                    cond.notify_all()
+                    log.info("Syncing all process and start replaying")
+
+                results = [r.result() for r in future_iter]
+
+        return pd.concat(results, ignore_index=True).sort_values("idx", ignore_index=True)
+
+    def run(self) -> tuple[Metric, pd.DataFrame]:
+        """
+        Returns:
+            Metric: trace_* metrics, qps is the achieved qps of successful queries
+            pd.DataFrame: per-request results, see `replay`
+        """
+        res = self._run_replay()
+        ok = res[res["success"]]
+        deviation = (res["sent"] - res["scheduled"]).clip(lower=0)
+        cost = float((res["sent"] + res["latency"]).max())
+
+        m = Metric()
+        m.trace_num_queries = len(res)
+        m.trace_speedup = self.speedup
+        m.trace_failed_rate = round(1 - len(ok) / len(res), 4)
+        m.qps = round(len(ok) / cost, 4) if cost > 0 else 0.0
+        if len(ok) > 0:
+            m.trace_latency_avg = round(float(ok["latency"].mean()), 4)
+            m.trace_latency_p99 = round(float(np.percentile(ok["latency"], 99)), 4)
+            m.trace_latency_p95 = round(float(np.percentile(ok["latency"], 95)), 4)
+            m.trace_response_time_p99 = round(float(np.percentile(ok["response_time"], 99)), 4)
+        m.trace_deviation_avg = round(float(deviation.mean()), 4)
+        m.trace_deviation_p99 = round(float(np.percentile(deviation, 99)), 4)
+        log.info(
+            f"End replaying: qps={m.qps}, latency_p99={m.trace_latency_p99}, "
+            f"response_time_p99={m.trace_response_time_p99}, deviation_p99={m.trace_deviation_p99}, "
+            f"failed_rate={m.trace_failed_rate}"
+        )
+        return m, res
@@ -1,8 +1,11 @@
 import logging
+import time
 
 import numpy as np
 from pandas import DataFrame
 
+from ..clients import api
+
 log = logging.getLogger(__name__)
 
 
@@ -15,3 +18,37 @@ def get_data(data_df: DataFrame, normalize: bool) -> tuple[list[list[float]], li
     else:
         all_embeddings = emb_np.tolist()
     return all_embeddings, all_metadata
+
+
+def warmup_search(
+    db: api.VectorDB,
+    test_data: list[list[float]],
+    k: int,
+    duration: float = 0,
+    num_queries: int = 0,
+    start_idx: int = 0,
+) -> tuple[int, int]:
+    """Search the test data in a loop without measuring anything, to warm up connections and caches.
+
+    Stops once `num_queries` queries are sent or `duration` seconds passed, a limit of 0 is ignored.
+    db.init() and prepare_filter() must have been called by the caller.
+
+    Returns:
+        int: warm-up queries sent
+        int: index of the next query in test_data
+    """
+    if duration <= 0 and num_queries <= 0:
+        return 0, start_idx
+
+    num, idx, count = len(test_data), start_idx, 0
+    start_time = time.perf_counter()
+    while (num_queries <= 0 or count < num_queries) and (duration <= 0 or time.perf_counter() < start_time + duration):
+        try:
+            db.search_embedding(test_data[idx], k)
+        except Exception as e:
+            log.debug(f"VectorDB warm-up search error: {e}")
+        count += 1
+        idx = idx + 1 if idx < num - 1 else 0
+
+    log.debug(f"Warm-up finished: queries={count}, dur={round(time.perf_counter() - start_time, 4)}s")
+    return count, idx
@@ -6,14 +6,32 @@ from enum import Enum, auto
 import numpy as np
 import psutil
 
+from .. import config
 from ..base import BaseModel
-from ..metric import Metric
+from ..metric import REPEATED_CONC_METRICS, REPEATED_METRICS, Metric, summarize_samples
 from ..models import PerformanceTimeoutError, TaskConfig, TaskStage
 from . import utils
-from .cases import Case, CaseLabel, StreamingPerformanceCase
+from .cases import (
+    Case,
+    CaseLabel,
+    MixedWorkloadPerformanceCase,
+    StreamingPerformanceCase,
+    TraceReplayPerformanceCase,
+)
 from .clients import MetricType, api
 from .data_source import DatasetSource
-from .runner import MultiProcessingSearchRunner, ReadWriteRunner, SerialInsertRunner, SerialSearchRunner
+from .runner import (
+    DistributedSearchCoordinator,
+    MixedWorkloadRunner,
+    MultiProcessingSearchRunner,
+    ReadWriteRunner,
+    SerialInsertRunner,
+    SerialSearchRunner,
+    TraceReplayRunner,
+)
+from .runner.distributed_runner import task_to_payload
+from .telemetry import ResourceSampler
+from .trace import QueryTrace
 
 log = logging.getLogger(__name__)
 
@@ -48,6 +66,8 @@ class CaseRunner(BaseModel):
     search_runner: MultiProcessingSearchRunner | None = None
     final_search_runner: MultiProcessingSearchRunner | None = None
     read_write_runner: ReadWriteRunner | None = None
+    mixed_workload_runner: MixedWorkloadRunner | None = None
+    distributed_search_runner: DistributedSearchCoordinator | None = None
 
     def __eq__(self, obj: any):
         if isinstance(obj, CaseRunner):
@@ -70,6 +90,33 @@ class CaseRunner(BaseModel):
             )
         )
 
+    def holds_collection_of(self, task_config: TaskConfig) -> bool:
+        """whether this case runs on the collection loaded by the case of `task_config`, see `__eq__`"""
+        return (
+            self.ca.label == CaseLabel.Performance
+            and self.config.db == task_config.db
+            and self.config.db_case_config == task_config.db_case_config
+            and self.ca.dataset == task_config.case_config.case.dataset
+        )
+
+    def dataset_loaded(self) -> bool:
+        """whether the collection of this case in the database still holds the whole dataset, checked before
+        a resumed run skips loading it again. False if the client can't count its embeddings."""
+        if not self.config.db.init_cls.count_supported():
+            log.info(f"{self.config.db_name} can't count the embeddings of its collection, load it again")
+            return False
+        try:
+            self.init_db(drop_old=False)
+            with self.db.init():
+                count = self.db.count_embeddings()
+        except Exception as e:
+            log.warning(f"Failed to count the embeddings of the collection of {self.config.db_name}: {e}")
+            return False
+        if count != self.ca.dataset.data.size:
+            log.info(f"The collection holds {count} of {self.ca.dataset.data.size} embeddings, load it again")
+            return False
+        return True
+
     def display(self) -> dict:
         c_dict = self.ca.dict(
             include={
@@ -104,11 +151,21 @@ class CaseRunner(BaseModel):
             db_case_config=self.config.db_case_config,
             drop_old=drop_old,
             with_scalar_labels=self.ca.with_scalar_labels,
+            with_int_filter=self.ca.with_int_filter,
         )
 
     def _pre_run(self, drop_old: bool = True):
         try:
             self.init_db(drop_old)
+            if self.ca.label != CaseLabel.Performance and self.db.inserts_wait_for_optimize():
+                msg = (
+                    f"{self.config.db_name} inserts only become searchable in optimize, like through a bulk import, "
+                    f"which only performance cases wait for, not {self.ca.name}"
+                )
+                raise ValueError(msg)
+            if self.config.case_config.warmup_config.cold_cache_pass and not self.db.evict_supported():
+                msg = f"{self.config.db_name} can't evict its caches for the cold-cache pass"
+                raise ValueError(msg)
             self.ca.dataset.prepare(self.dataset_source, filters=self.ca.filters)
         except ModuleNotFoundError as e:
             log.warning(f"pre run case error: please install client for db: {self.config.db}, error={e}")
@@ -133,7 +190,7 @@ class CaseRunner(BaseModel):
         """run capacity cases
 
         Returns:
-            Metric: the max load count
+            Metric: the max load count, and the insert throughput of each round
         """
         assert self.db is not None
         log.info("Start capacity case")
@@ -144,14 +201,17 @@ class CaseRunner(BaseModel):
                 self.normalize,
                 self.ca.filters,
                 self.ca.load_timeout,
+                self.ca.perturbation,
             )
-            count = runner.run_endlessness()
+            with ResourceSampler() as sampler:
+                m = runner.run_endlessness()
+            sampler.attach(m, "load")
         except Exception as e:
             log.warning(f"Failed to run capacity case, reason = {e}")
             raise e from None
         else:
-            log.info(f"Capacity case loading dataset reaches VectorDB's limit: max capacity = {count}")
-            return Metric(max_load_count=count)
+            log.info(f"Capacity case loading dataset reaches VectorDB's limit: max capacity = {m.max_load_count}")
+            return m
 
     def _run_perf_case(self, drop_old: bool = True) -> Metric:
         """run performance cases
@@ -160,15 +220,21 @@ class CaseRunner(BaseModel):
             Metric: load_duration, recall, serial_latency_p99, and, qps
         """
 
+        if isinstance(self.ca, TraceReplayPerformanceCase):
+            return self._run_trace_replay_case(drop_old)
+
         log.info("Start performance case")
         try:
             m = Metric()
             if drop_old:
                 if TaskStage.LOAD in self.config.stages:
-                    _, load_dur = self._load_train_data()
-                    build_dur = self._optimize()
+                    with ResourceSampler() as sampler:
+                        _, load_dur = self._load_train_data()
+                        build_dur, build_stats = self._optimize()
+                    sampler.attach(m, "load")
                     m.insert_duration = round(load_dur, 4)
                     m.optimize_duration = round(build_dur, 4)
+                    self._record_build_stats(m, build_stats)
                     m.load_duration = round(load_dur + build_dur, 4)
                     log.info(
                         f"Finish loading the entire dataset into VectorDB,"
@@ -179,21 +245,37 @@ class CaseRunner(BaseModel):
                     log.info("Data loading skipped")
             if TaskStage.SEARCH_SERIAL in self.config.stages or TaskStage.SEARCH_CONCURRENT in self.config.stages:
                 self._init_search_runner()
-                if TaskStage.SEARCH_CONCURRENT in self.config.stages:
-                    search_results = self._conc_search()
-                    (
-                        m.qps,
-                        m.conc_num_list,
-                        m.conc_qps_list,
-                        m.conc_latency_p99_list,
-                        m.conc_latency_p95_list,
-                        m.conc_latency_p90_list,
-                        m.conc_latency_avg_list,
-                        m.conc_recall_list,
-                    ) = search_results
-                if TaskStage.SEARCH_SERIAL in self.config.stages:
-                    search_results = self._serial_search()
-                    m.recall, m.ndcg, m.serial_latency_p99, m.serial_latency_p95 = search_results
+                if self.config.case_config.warmup_config.cold_cache_pass:
+                    with ResourceSampler() as sampler:
+                        cold_results = self._cold_serial_search()
+                    sampler.attach(m, "cold_search")
+                    m.cold_recall, _, m.cold_serial_latency_p99, m.cold_serial_latency_p95 = cold_results
+
+                # the point values of m are from the first repetition
+                repeats = self.config.case_config.search_repeats
+                reps = []
+                for i in range(repeats):
+                    if repeats > 1:
+                        log.info(f"Start search repetition {i + 1}/{repeats}")
+                    rep = m if i == 0 else Metric()
+                    self._search_stages(rep, last=i == repeats - 1)
+                    reps.append(rep)
+                    if i > 0:
+                        m.client_stats.update({f"{k}_{i + 1}": v for k, v in rep.client_stats.items()})
+                        m.client_series.update({f"{k}_{i + 1}": v for k, v in rep.client_series.items()})
+
+                if repeats > 1:
+                    for name in REPEATED_METRICS:
+                        samples = [getattr(rep, name) for rep in reps]
+                        setattr(m, f"repeat_{name}_list", samples)
+                        m.repeat_stats[name] = summarize_samples(samples)
+                    for name in REPEATED_CONC_METRICS:
+                        samples = [getattr(rep, f"{name}_list") for rep in reps]
+                        setattr(m, f"repeat_{name}_list", samples)
+                        for i, conc in enumerate(m.conc_num_list):
+                            conc_samples = [s[i] for s in samples if i < len(s)]
+                            m.repeat_stats[f"{name}@{conc}"] = summarize_samples(conc_samples)
+                    log.info(f"Search repetition stats: {m.repeat_stats}")
 
         except Exception as e:
             log.warning(f"Failed to run performance case, reason = {e}")
@@ -204,10 +286,15 @@ class CaseRunner(BaseModel):
             return m
 
     def _run_streaming_case(self) -> Metric:
+        if isinstance(self.ca, MixedWorkloadPerformanceCase):
+            return self._run_mixed_workload_case()
+
         log.info("Start streaming case")
         try:
             self._init_read_write_runner()
-            m = self.read_write_runner.run_read_write()
+            with ResourceSampler() as sampler:
+                m = self.read_write_runner.run_read_write()
+            sampler.attach(m, "streaming")
         except Exception as e:
             log.warning(f"Failed to run streaming case, reason = {e}")
             traceback.print_exc()
@@ -216,6 +303,89 @@ class CaseRunner(BaseModel):
             log.info(f"Streaming case got result: {m}")
             return m
 
+    def _run_mixed_workload_case(self) -> Metric:
+        """run mixed-workload cases, always load the entire dataset before churning it
+
+        Returns:
+            Metric: load_duration, mixed_* lists, qps(max search qps) and recall(after the last concurrency)
+        """
+        log.info("Start mixed workload case")
+        try:
+            with ResourceSampler() as load_sampler:
+                _, load_dur = self._load_train_data()
+                build_dur, build_stats = self._optimize()
+            self._init_mixed_workload_runner()
+            with ResourceSampler() as sampler:
+                m = self.mixed_workload_runner.run_mixed()
+            load_sampler.attach(m, "load")
+            sampler.attach(m, "mixed")
+            m.insert_duration = round(load_dur, 4)
+            m.optimize_duration = round(build_dur, 4)
+            m.load_duration = round(load_dur + build_dur, 4)
+            self._record_build_stats(m, build_stats)
+        except Exception as e:
+            log.warning(f"Failed to run mixed workload case, reason = {e}")
+            traceback.print_exc()
+            raise e from None
+        else:
+            log.info(f"Mixed workload case got result: {m}")
+            return m
+
+    def _run_trace_replay_case(self, drop_old: bool = True) -> Metric:
+        """run trace replay cases, the search stages replay the trace instead of searching the test data
+
+        Returns:
+            Metric: load_duration, qps and trace_*, per-request results are saved in trace_result_file
+        """
+        log.info("Start trace replay case")
+        ca: TraceReplayPerformanceCase = self.ca
+        try:
+            m = Metric()
+            if drop_old and TaskStage.LOAD in self.config.stages:
+                with ResourceSampler() as sampler:
+                    _, load_dur = self._load_train_data()
+                    build_dur, build_stats = self._optimize()
+                sampler.attach(m, "load")
+                m.insert_duration = round(load_dur, 4)
+                m.optimize_duration = round(build_dur, 4)
+                m.load_duration = round(load_dur + build_dur, 4)
+                self._record_build_stats(m, build_stats)
+            if TaskStage.SEARCH_SERIAL in self.config.stages or TaskStage.SEARCH_CONCURRENT in self.config.stages:
+                runner = TraceReplayRunner(
+                    db=self.db,
+                    trace=QueryTrace.load(ca.trace_file),
+                    speedup=ca.trace_speedup,
+                    num_workers=ca.trace_workers,
+                    concurrency_timeout=self.config.case_config.concurrency_search_config.concurrency_timeout,
+                )
+                with ResourceSampler() as sampler:
+                    trace_m, per_request = runner.run()
+                sampler.attach(trace_m, "trace_replay")
+                trace_m.client_stats.update(m.client_stats)
+                trace_m.client_series.update(m.client_series)
+                trace_m.insert_duration, trace_m.optimize_duration, trace_m.load_duration = (
+                    m.insert_duration,
+                    m.optimize_duration,
+                    m.load_duration,
+                )
+                trace_m.index_build_phases = m.index_build_phases
+                trace_m.index_build_tuples_per_sec = m.index_build_tuples_per_sec
+                trace_m.bulk_import_duration = m.bulk_import_duration
+                trace_m.bulk_import_rows_per_sec = m.bulk_import_rows_per_sec
+                m = trace_m
+
+                result_file = config.RESULTS_LOCAL_DIR / "traces" / f"{self.run_id}_{self.config.db_name}.parquet"
+                result_file.parent.mkdir(parents=True, exist_ok=True)
+                per_request.to_parquet(result_file, index=False)
+                m.trace_result_file = result_file.as_posix()
+        except Exception as e:
+            log.warning(f"Failed to run trace replay case, reason = {e}")
+            traceback.print_exc()
+            raise e from None
+        else:
+            log.info(f"Trace replay case got result: {m}")
+            return m
+
     @utils.time_it
     def _load_train_data(self):
         """Insert train data and get the insert_duration"""
@@ -233,6 +403,34 @@ class CaseRunner(BaseModel):
         finally:
             runner = None
 
+    def _search_stages(self, m: Metric, last: bool = True):
+        """run the concurrent and serial search stages once, and fill their results into m"""
+        if TaskStage.SEARCH_CONCURRENT in self.config.stages:
+            with ResourceSampler() as sampler:
+                search_results = self._conc_search(keep_alive=not last)
+            sampler.attach(m, "search_concurrent")
+            (
+                m.qps,
+                m.conc_num_list,
+                m.conc_qps_list,
+                m.conc_latency_p99_list,
+                m.conc_latency_p95_list,
+                m.conc_latency_p90_list,
+                m.conc_latency_avg_list,
+                m.conc_recall_list,
+            ) = search_results
+            if self.search_runner is not None:
+                m.cpu_affinity_layout = self.search_runner.cpu_affinity_layout
+                m.conc_cpu_util_list = list(self.search_runner.conc_cpu_util_list)
+                m.conc_replica_qps_list = list(self.search_runner.conc_replica_qps_list)
+        if TaskStage.SEARCH_SERIAL in self.config.stages:
+            with ResourceSampler() as sampler:
+                search_results = self._serial_search()
+            sampler.attach(m, "search_serial")
+            m.recall, m.ndcg, m.serial_latency_p99, m.serial_latency_p95 = search_results
+            m.search_plan_stats = self.serial_search_runner.plan_stats
+            m.search_plan_scan_types = self.serial_search_runner.plan_scan_types
+
     def _serial_search(self) -> tuple[float, float, float, float]:
         """Performance serial tests, search the entire test data once,
         calculate the recall, serial_latency_p99, serial_latency_p95
@@ -249,31 +447,69 @@ class CaseRunner(BaseModel):
         else:
             return results
 
-    def _conc_search(self):
+    def _cold_serial_search(self) -> tuple[float, float, float, float]:
+        """Evict the collection from the caches of the database, see `VectorDB.evict_cache`, then search
+        the entire test data once before any warm-up, to record the cold-cache performance
+
+        Returns:
+            tuple[float, float, float, float]: recall, ndcg, serial_latency_p99, serial_latency_p95
+        """
+        with self.db.init():
+            log.info("Evict the collection from the caches before the cold-cache search")
+            self.db.evict_cache()
+        log.info("Start cold-cache serial search")
+        runner = SerialSearchRunner(
+            db=self.db,
+            test_data=self.test_emb,
+            ground_truth=self.ca.dataset.gt_data,
+            filters=self.ca.filters,
+            k=self.config.case_config.k,
+            warmup_duration=0,
+            warmup_queries=0,
+        )
+        try:
+            results, _ = runner.run()
+        except Exception as e:
+            log.warning(f"cold-cache search error: {e!s}, {e}")
+            raise e from e
+        else:
+            return results
+
+    def _conc_search(self, keep_alive: bool = False):
         """Performance concurrency tests, search the test data endlessness
         for 30s in several concurrencies
 
+        Args:
+            keep_alive: keep the search runners, like the connected agents, for another repetition
+
         Returns:
             float: the largest qps in all concurrencies
         """
         try:
-            return self.search_runner.run()
+            if self.distributed_search_runner is not None:
+                results = self.distributed_search_runner.run(keep_agents=keep_alive)
+            else:
+                results = self.search_runner.run()
         except Exception as e:
             log.warning(f"search error: {e!s}, {e}")
+            self.stop()
             raise e from None
-        finally:
+
+        if not keep_alive:
             self.stop()
+        return results
 
     @utils.time_it
-    def _optimize_task(self) -> None:
+    def _optimize_task(self) -> dict | None:
         with self.db.init():
-            self.db.optimize(data_size=self.ca.dataset.data.size)
+            return self.db.optimize(data_size=self.ca.dataset.data.size)
 
-    def _optimize(self) -> float:
+    def _optimize(self) -> tuple[float, dict]:
+        """Returns the duration of optimize and the index build stats it reported, see `VectorDB.optimize`"""
         with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
             future = executor.submit(self._optimize_task)
             try:
-                return future.result(timeout=self.ca.optimize_timeout)[1]
+                build_stats, build_dur = future.result(timeout=self.ca.optimize_timeout)
             except TimeoutError as e:
                 log.warning(f"VectorDB optimize timeout in {self.ca.optimize_timeout}")
                 for pid, _ in executor._processes.items():
@@ -282,6 +518,18 @@ class CaseRunner(BaseModel):
             except Exception as e:
                 log.warning(f"VectorDB optimize error: {e}")
                 raise e from None
+            else:
+                return build_dur, build_stats or {}
+
+    @staticmethod
+    def _record_build_stats(m: Metric, build_stats: dict):
+        if not build_stats:
+            return
+        m.index_build_phases = build_stats.get("phases", {})
+        m.index_build_tuples_per_sec = build_stats.get("tuples_per_sec", 0.0)
+        m.bulk_import_duration = build_stats.get("import_duration", 0.0)
+        m.bulk_import_rows_per_sec = build_stats.get("import_rows_per_sec", 0.0)
+        log.info(f"Optimize stats: {build_stats}")
 
     def _init_search_runner(self):
         if self.normalize:
@@ -292,6 +540,7 @@ class CaseRunner(BaseModel):
             self.test_emb = self.ca.dataset.test_data
 
         gt_df = self.ca.dataset.gt_data
+        warmup_config = self.config.case_config.warmup_config
 
         if TaskStage.SEARCH_SERIAL in self.config.stages:
             self.serial_search_runner = SerialSearchRunner(
@@ -300,8 +549,20 @@ class CaseRunner(BaseModel):
                 ground_truth=gt_df,
                 filters=self.ca.filters,
                 k=self.config.case_config.k,
+                warmup_duration=warmup_config.warmup_duration,
+                warmup_queries=warmup_config.warmup_queries,
+                explain_sample_rate=self.config.case_config.explain_sample_rate,
             )
-        if TaskStage.SEARCH_CONCURRENT in self.config.stages:
+        concurrency_search_config = self.config.case_config.concurrency_search_config
+        if TaskStage.SEARCH_CONCURRENT in self.config.stages and concurrency_search_config.num_agents > 0:
+            self.distributed_search_runner = DistributedSearchCoordinator(
+                payload=task_to_payload(self.config, self.run_id, self.dataset_source.value),
+                num_agents=concurrency_search_config.num_agents,
+                concurrencies=concurrency_search_config.num_concurrency,
+                duration=concurrency_search_config.concurrency_duration,
+                concurrency_timeout=concurrency_search_config.concurrency_timeout,
+            )
+        elif TaskStage.SEARCH_CONCURRENT in self.config.stages:
             self.search_runner = MultiProcessingSearchRunner(
                 db=self.db,
                 test_data=self.test_emb,
@@ -311,6 +572,11 @@ class CaseRunner(BaseModel):
                 duration=self.config.case_config.concurrency_search_config.concurrency_duration,
                 concurrency_timeout=self.config.case_config.concurrency_search_config.concurrency_timeout,
                 k=self.config.case_config.k,
+                warmup_duration=warmup_config.warmup_duration,
+                warmup_queries=warmup_config.warmup_queries,
+                query_sampler=self.config.case_config.concurrency_search_config.query_sampler(),
+                cpu_pinning=concurrency_search_config.cpu_pinning,
+                reserved_cpus=concurrency_search_config.reserved_cpus,
             )
 
     def _init_read_write_runner(self):
@@ -327,9 +593,29 @@ class CaseRunner(BaseModel):
             normalize=self.normalize,
         )
 
+    def _init_mixed_workload_runner(self):
+        ca: MixedWorkloadPerformanceCase = self.ca
+        self.mixed_workload_runner = MixedWorkloadRunner(
+            db=self.db,
+            dataset=ca.dataset,
+            insert_ratio=ca.insert_ratio,
+            delete_ratio=ca.delete_ratio,
+            upsert_ratio=ca.upsert_ratio,
+            search_ratio=ca.search_ratio,
+            churn_ratio=ca.churn_ratio,
+            write_batch_size=ca.write_batch_size,
+            normalize=self.normalize,
+            k=self.config.case_config.k,
+            concurrencies=ca.concurrencies,
+            duration=ca.churn_duration,
+            concurrency_timeout=self.config.case_config.concurrency_search_config.concurrency_timeout,
+        )
+
     def stop(self):
         if self.search_runner:
             self.search_runner.stop()
+        if self.distributed_search_runner:
+            self.distributed_search_runner.stop()
 
 
 DATA_FORMAT = " %-14s | %-12s %-20s %7s | %-10s"
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+
+import psutil
+
+from .. import config
+from ..metric import Metric
+from .cpu_affinity import available_cpus
+
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class ResourceSampler:
+    """Samples the resource usage of the client process tree in a background thread.
+
+    Every `interval` seconds it records the cpu utilization (% of one core, summed over this process
+    and all its children, like top), the rss and the context switches of the tree, and the host network
+    bytes, psutil has no per-process network counters. Use it as a context manager around a stage,
+    then `attach` the summary and series to the stage's Metric.
+
+    Examples:
+        >>> with ResourceSampler() as sampler:
+        >>>     runner.run()
+        >>> sampler.attach(m, "load")
+    """
+
+    def __init__(
+        self,
+        interval: float = config.CLIENT_TELEMETRY_INTERVAL,
+        enabled: bool = config.CLIENT_TELEMETRY,
+        cpu_warn_threshold: float = config.CLIENT_CPU_WARN_THRESHOLD,
+    ):
+        self.interval = interval
+        self.enabled = enabled
+        self.cpu_warn_threshold = cpu_warn_threshold  # % of the cpus this process may run on
+        self.root = psutil.Process()
+        self.num_cpus = len(available_cpus())
+
+        self.cpu_series: list[float] = []
+        self.rss_series: list[float] = []  # MB
+        self.net_sent_series: list[float] = []  # MB since the start
+        self.net_recv_series: list[float] = []
+
+        self._procs: dict[int, psutil.Process] = {}
+        self._ctx_start: dict[int, int] = {}
+        self._ctx_last: dict[int, int] = {}
+        self._net_start = None
+        self._start_time = 0.0
+        self._duration = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _tree(self) -> list[psutil.Process]:
+        """processes of the tree, the same Process objects across samples so that cpu_percent has a baseline"""
+        try:
+            current = [self.root, *self.root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return []
+        procs = {}
+        for p in current:
+            procs[p.pid] = self._procs.get(p.pid, p)
+        self._procs = procs
+        return list(procs.values())
+
+    def _sample(self, record: bool = True):
+        cpu, rss = 0.0, 0
+        for p in self._tree():
+            try:
+                with p.oneshot():
+                    cpu += p.cpu_percent()
+                    rss += p.memory_info().rss
+                    ctx = p.num_ctx_switches()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            self._ctx_start.setdefault(p.pid, ctx.voluntary + ctx.involuntary)
+            self._ctx_last[p.pid] = ctx.voluntary + ctx.involuntary
+
+        net = psutil.net_io_counters()
+        if self._net_start is None:
+            self._net_start = net
+        if record:
+            self.cpu_series.append(round(cpu, 2))
+            self.rss_series.append(round(rss / MB, 2))
+            self.net_sent_series.append(round((net.bytes_sent - self._net_start.bytes_sent) / MB, 4))
+            self.net_recv_series.append(round((net.bytes_recv - self._net_start.bytes_recv) / MB, 4))
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._start_time = time.perf_counter()
+        self._sample(record=False)  # the first cpu_percent of each process is meaningless
+        self._thread = threading.Thread(target=self._loop, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._sample()  # stages shorter than the interval get one sample
+        self._duration = time.perf_counter() - self._start_time
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def summary(self) -> dict[str, float]:
+        if not self.cpu_series:
+            return {}
+        return {
+            "duration": round(self._duration, 4),
+            "samples": len(self.cpu_series),
+            "num_cpus": self.num_cpus,
+            "cpu_avg": round(sum(self.cpu_series) / len(self.cpu_series), 2),
+            "cpu_max": max(self.cpu_series),
+            "rss_start_mb": self.rss_series[0],
+            "rss_end_mb": self.rss_series[-1],
+            "rss_max_mb": max(self.rss_series),
+            "net_sent_mb": self.net_sent_series[-1],
+            "net_recv_mb": self.net_recv_series[-1],
+            "ctx_switches": sum(self._ctx_last[pid] - self._ctx_start[pid] for pid in self._ctx_last),
+        }
+
+    def saturated_samples(self) -> int:
+        """samples in which the client used more than the threshold of its cpus"""
+        limit = self.cpu_warn_threshold * self.num_cpus
+        return sum(1 for c in self.cpu_series if c > limit)
+
+    def attach(self, m: Metric, stage: str):
+        """record the summary and series of `stage` into m, warn if the client was cpu bound"""
+        summary = self.summary()
+        if not summary:
+            return
+        m.client_stats[stage] = summary
+        m.client_series[stage] = {
+            "cpu": self.cpu_series,
+            "rss_mb": self.rss_series,
+            "net_sent_mb": self.net_sent_series,
+            "net_recv_mb": self.net_recv_series,
+        }
+        log.info(f"Client resources during {stage}: {summary}")
+
+        saturated = self.saturated_samples()
+        if saturated:
+            log.warning(
+                f"Client cpu exceeded {self.cpu_warn_threshold}% of its {self.num_cpus} cpus in {saturated}/"
+                f"{len(self.cpu_series)} samples during {stage}, the results may be limited by the client"
+            )
@@ -0,0 +1,145 @@
+"""Query traces, to replay a recorded production query mix against any VectorDB.
+
+A trace is a parquet file with one row per query:
+    - timestamp(float64): seconds since the first query of the trace
+    - emb(list[float32]): query vector
+    - k(int32): topk
+    - filter(str | None): Filter serialized by `filter_to_json`, None for non-filter searches
+"""
+
+import json
+import logging
+import pathlib
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .clients import api
+from .filter import Filter, FilterOp, LabelFilter, NewIntFilter, non_filter
+
+log = logging.getLogger(__name__)
+
+TRACE_COLUMNS = ["timestamp", "emb", "k", "filter"]
+
+
+def filter_to_json(filters: Filter | None) -> str | None:
+    if filters is None or filters.type == FilterOp.NonFilter:
+        return None
+    return filters.json()
+
+
+def filter_from_json(filter_json: str | None) -> Filter:
+    if not filter_json:
+        return non_filter
+    d = json.loads(filter_json)
+    op = FilterOp(d["type"])
+    if op == FilterOp.NumGE:
+        return NewIntFilter(filter_rate=d["filter_rate"], int_field=d["int_field"], int_value=d["int_value"])
+    if op == FilterOp.StrEqual:
+        return LabelFilter(label_percentage=d["label_percentage"], label_field=d["label_field"])
+    return non_filter
+
+
+class QueryTrace:
+    """In-memory query trace, vectors are kept as one float32 array."""
+
+    def __init__(self, timestamps: np.ndarray, embs: np.ndarray, ks: np.ndarray, filters: list[str | None]):
+        if not (len(timestamps) == len(embs) == len(ks) == len(filters)):
+            msg = "trace columns have different lengths"
+            raise ValueError(msg)
+        order = np.argsort(timestamps, kind="stable")
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+        if len(self.timestamps) > 0:
+            self.timestamps -= self.timestamps[0]
+        self.embs = np.asarray(embs, dtype=np.float32)[order]
+        self.ks = np.asarray(ks, dtype=np.int32)[order]
+        self.filters = [filters[i] for i in order]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def duration(self) -> float:
+        return float(self.timestamps[-1]) if len(self) > 0 else 0.0
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "QueryTrace":
+        df = pd.read_parquet(path, columns=TRACE_COLUMNS)
+        log.info(f"Loaded query trace {path}: {len(df)} queries")
+        return cls(
+            timestamps=df["timestamp"].to_numpy(),
+            embs=np.stack(df["emb"]) if len(df) > 0 else np.empty((0, 0), dtype=np.float32),
+            ks=df["k"].to_numpy(),
+            filters=df["filter"].tolist(),
+        )
+
+    def save(self, path: str | pathlib.Path):
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(
+            {
+                "timestamp": self.timestamps,
+                "emb": list(self.embs),
+                "k": self.ks,
+                "filter": self.filters,
+            },
+        )
+        df.to_parquet(path, index=False)
+        log.info(f"Saved query trace {path}: {len(df)} queries")
+
+    @classmethod
+    def from_test_data(
+        cls,
+        test_data: list[list[float]] | np.ndarray,
+        qps: float,
+        num_queries: int | None = None,
+        k: int = 100,
+        filters: Filter = non_filter,
+        seed: int | None = None,
+    ) -> "QueryTrace":
+        """Synthesize a trace with poisson arrivals at `qps` from the test data of a dataset."""
+        rng = np.random.default_rng(seed)
+        test_emb = np.asarray(test_data, dtype=np.float32)
+        num_queries = num_queries if num_queries is not None else len(test_emb)
+        timestamps = np.cumsum(rng.exponential(1.0 / qps, size=num_queries))
+        picked = rng.integers(len(test_emb), size=num_queries)
+        return cls(timestamps, test_emb[picked], np.full(num_queries, k), [filter_to_json(filters)] * num_queries)
+
+
+class TraceRecorder:
+    """Record the queries sent to a VectorDB into a QueryTrace.
+
+    Examples:
+        >>> recorder = TraceRecorder()
+        >>> with db.init():
+        >>>     db.prepare_filter(filters)
+        >>>     res = recorder.search(db, query, k=100, filters=filters)
+        >>> recorder.save("trace.parquet")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timestamps, self._embs, self._ks, self._filters = [], [], [], []
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def record(self, query: list[float], k: int, filters: Filter | None = None, timestamp: float | None = None):
+        with self._lock:
+            self._timestamps.append(timestamp if timestamp is not None else time.time())
+            self._embs.append(np.asarray(query, dtype=np.float32))
+            self._ks.append(k)
+            self._filters.append(filter_to_json(filters))
+
+    def search(self, db: api.VectorDB, query: list[float], k: int, filters: Filter | None = None) -> list[int]:
+        """record the query and send it to db, prepare_filter(filters) must have been called on db"""
+        self.record(query, k, filters)
+        return db.search_embedding(query, k)
+
+    def to_trace(self) -> QueryTrace:
+        with self._lock:
+            return QueryTrace(np.array(self._timestamps), np.stack(self._embs), np.array(self._ks), list(self._filters))
+
+    def save(self, path: str | pathlib.Path):
+        self.to_trace().save(path)
@@ -0,0 +1,42 @@
+import logging
+from typing import Annotated, TypedDict
+
+import click
+
+from .. import config
+from ..backend.runner import serve_agent
+from ..cli.cli import (
+    cli,
+    click_parameter_decorators_from_typed_dict,
+)
+
+log = logging.getLogger(__name__)
+
+
+class AgentTypedDict(TypedDict):
+    coordinator: Annotated[
+        str,
+        click.option(
+            "--coordinator",
+            type=str,
+            required=True,
+            help="host:port of the coordinator, a vectordbbench run with --num-agents",
+        ),
+    ]
+    token: Annotated[
+        str,
+        click.option(
+            "--token",
+            type=str,
+            default=config.DISTRIBUTED_TOKEN,
+            help="Shared token checked by the coordinator, default to DISTRIBUTED_TOKEN",
+        ),
+    ]
+
+
+@cli.command()
+@click_parameter_decorators_from_typed_dict(AgentTypedDict)
+def Agent(**parameters):
+    """Generate concurrent search load for a coordinator on another host."""
+    log.info(f"Start agent for coordinator {parameters['coordinator']}")
+    serve_agent(parameters["coordinator"], token=parameters["token"])
@@ -3,13 +3,14 @@ import time
 from collections.abc import MutableMapping
 from concurrent.futures import wait
 from pathlib import Path
-from typing import Annotated, Any, TypedDict
+from typing import Annotated, Any, TypedDict, Unpack
 
 import click
 from click.testing import CliRunner
 from yaml import Loader, load
 
 from .. import config
+from ..cli import cli as cli_module
 from ..cli.cli import (
     cli,
     click_parameter_decorators_from_typed_dict,
@@ -45,6 +46,27 @@ class BatchCliTypedDict(TypedDict):
             help="Read batch configuration from yaml file",
         ),
     ]
+    case_parallelism: Annotated[
+        int,
+        click.option(
+            "--case-parallelism",
+            type=int,
+            help="Run the sub commands as one task, cases on up to this number of different databases "
+            "run at the same time",
+            default=config.CASE_PARALLELISM,
+            show_default=True,
+        ),
+    ]
+    cpus_per_case: Annotated[
+        int,
+        click.option(
+            "--cpus-per-case",
+            type=int,
+            help="Cpus each parallel database target is pinned to, 0 splits the available cpus evenly",
+            default=config.CPUS_PER_CASE,
+            show_default=True,
+        ),
+    ]
 
 
 def build_sub_cmd_args(batch_config: MutableMapping[str, Any] | None):
@@ -97,7 +119,7 @@ def build_sub_cmd_args(batch_config: MutableMapping[str, Any] | None):
 
 @cli.command()
 @click_parameter_decorators_from_typed_dict(BatchCliTypedDict)
-def BatchCli():
+def BatchCli(**parameters: Unpack[BatchCliTypedDict]):
     ctx = click.get_current_context()
     batch_config = ctx.default_map
 
@@ -108,6 +130,10 @@ def BatchCli():
     for args in args_arr:
         log.info(f"got batch config: {' '.join(args)}")
 
+    if parameters["case_parallelism"] > 1:
+        run_in_parallel(runner, args_arr, parameters["case_parallelism"], parameters["cpus_per_case"])
+        return
+
     for args in args_arr:
         result = runner.invoke(cli, args)
         time.sleep(5)
@@ -119,3 +145,35 @@ def BatchCli():
 
         if result.exception:
             log.exception(f"failed to run sub command: {args[0]}", exc_info=result.exception)
+
+
+def run_in_parallel(runner: CliRunner, args_arr: list[list[str]], case_parallelism: int, cpus_per_case: int):
+    """collect the tasks of all sub commands and run them as one task, see `BenchMarkRunner.set_case_parallelism`"""
+    cli_module.collected_tasks = []
+    try:
+        for args in args_arr:
+            result = runner.invoke(cli, args)
+            if result.exception:
+                log.exception(f"failed to build sub command: {args[0]}", exc_info=result.exception)
+        collected = cli_module.collected_tasks
+    finally:
+        cli_module.collected_tasks = None
+
+    if not collected:
+        log.warning("No task collected from the batch config")
+        return
+
+    tasks = [task for task, _, _ in collected]
+    task_label = next((label for _, label, _ in collected if label), None)
+    resume = next((resume for _, _, resume in collected if resume), None)
+
+    from ..interface import benchmark_runner
+
+    benchmark_runner.set_case_parallelism(case_parallelism, cpus_per_case)
+    benchmark_runner.run(tasks, task_label, resume)
+    time.sleep(5)
+
+    from ..interface import global_result_future
+
+    if global_result_future:
+        wait([global_result_future])
@@ -20,6 +20,8 @@ from yaml import load
 from .. import config
 from ..backend.clients import DB
 from ..backend.clients.api import MetricType
+from ..backend.cpu_affinity import CPUPinning, parse_cpu_list
+from ..backend.query_sampler import QueryDistribution
 from ..interface import benchmark_runner, global_result_future
 from ..models import (
     CaseConfig,
@@ -29,6 +31,7 @@ from ..models import (
     DBConfig,
     TaskConfig,
     TaskStage,
+    WarmupConfig,
 )
 
 try:
@@ -149,6 +152,13 @@ def parse_task_stages(
     return stages
 
 
+def check_distributed_token(ctx: any, param: any, value: any):  # noqa: ARG001
+    if value and value > 0 and not config.DISTRIBUTED_TOKEN:
+        msg = "DISTRIBUTED_TOKEN must be set to run the concurrent search on remote agents"
+        raise click.BadParameter(msg)
+    return value
+
+
 def check_custom_case_parameters(ctx: any, param: any, value: any):  # noqa: ARG001
     if ctx.params.get("case_type") == "PerformanceCustomDataset" and value is None:
         raise click.BadParameter(
@@ -188,11 +198,32 @@ def get_custom_case_config(parameters: dict) -> dict:
             "dataset_with_size_type": parameters["dataset_with_size_type"],
             "filter_rate": parameters["filter_rate"],
         }
+    elif parameters["case_type"] == "TraceReplayPerformanceCase":
+        custom_case_config = {
+            "dataset_with_size_type": parameters["dataset_with_size_type"],
+            "trace_file": parameters["trace_file"],
+            "trace_speedup": parameters["trace_speedup"],
+            "trace_workers": parameters["trace_workers"],
+        }
+    elif parameters["case_type"] == "MixedWorkloadPerformanceCase":
+        custom_case_config = {
+            "dataset_with_size_type": parameters["dataset_with_size_type"],
+            "insert_ratio": parameters["insert_ratio"],
+            "delete_ratio": parameters["delete_ratio"],
+            "upsert_ratio": parameters["upsert_ratio"],
+            "search_ratio": parameters["search_ratio"],
+            "churn_ratio": parameters["churn_ratio"],
+            "churn_duration": parameters["concurrency_duration"],
+            "concurrencies": [int(s) for s in parameters["num_concurrency"]],
+        }
     return custom_case_config
 
 
 log = logging.getLogger(__name__)
 
+# set to a list by BatchCli to collect (task, task_label, resume) of the sub commands instead of running them
+collected_tasks: list[tuple[TaskConfig, str | None, str | None]] | None = None
+
 
 class CommonTypedDict(TypedDict):
     config_file: Annotated[
@@ -318,6 +349,174 @@ class CommonTypedDict(TypedDict):
             "Set to a negative value to wait indefinitely.",
         ),
     ]
+    num_agents: Annotated[
+        int,
+        click.option(
+            "--num-agents",
+            type=int,
+            default=0,
+            show_default=True,
+            help="Run the concurrent search on this many remote agents started with `vectordbbench agent`, "
+            "--num-concurrency is then the total over all agents. The coordinator listens on "
+            "DISTRIBUTED_BIND_HOST:DISTRIBUTED_PORT (127.0.0.1 by default) and requires DISTRIBUTED_TOKEN",
+            callback=check_distributed_token,
+        ),
+    ]
+    cpu_pinning: Annotated[
+        str,
+        click.option(
+            "--cpu-pinning",
+            type=click.Choice([p.value for p in CPUPinning]),
+            default=CPUPinning.NONE.value,
+            show_default=True,
+            help="Pin concurrent search processes to cpus, one core each (round_robin) or one NUMA node each (numa)",
+        ),
+    ]
+    reserved_cpus: Annotated[
+        list[int],
+        click.option(
+            "--reserved-cpus",
+            type=str,
+            default="",
+            help="Cpus never used by pinned search processes, in linux cpu list format like 0-1,36",
+            callback=lambda _ctx, _param, value: parse_cpu_list(value),
+        ),
+    ]
+    query_distribution: Annotated[
+        str,
+        click.option(
+            "--query-distribution",
+            type=click.Choice([d.value for d in QueryDistribution]),
+            default=QueryDistribution.SEQUENTIAL.value,
+            show_default=True,
+            help="How each process of concurrent search picks the next test query",
+        ),
+    ]
+    zipf_skew: Annotated[
+        float,
+        click.option(
+            "--zipf-skew",
+            type=float,
+            default=1.1,
+            show_default=True,
+            help="Skew of the zipf query distribution, P(rank i) ~ 1 / i^skew",
+        ),
+    ]
+    hot_set_ratio: Annotated[
+        float,
+        click.option(
+            "--hot-set-ratio",
+            type=float,
+            default=0.01,
+            show_default=True,
+            help="Share of the test data in the hot set of the hot_set query distribution",
+        ),
+    ]
+    hot_set_prob: Annotated[
+        float,
+        click.option(
+            "--hot-set-prob",
+            type=float,
+            default=0.9,
+            show_default=True,
+            help="Probability that a query is drawn from the hot set of the hot_set query distribution",
+        ),
+    ]
+    query_trace_file: Annotated[
+        str | None,
+        click.option(
+            "--query-trace-file",
+            type=click.Path(exists=True, dir_okay=False),
+            default=None,
+            help="Test query indices to replay for the trace query distribution, one per line or a .npy file",
+        ),
+    ]
+    trace_file: Annotated[
+        str | None,
+        click.option(
+            "--trace-file",
+            type=click.Path(exists=True, dir_okay=False),
+            default=None,
+            help="Query trace parquet to replay for TraceReplayPerformanceCase",
+        ),
+    ]
+    trace_speedup: Annotated[
+        float,
+        click.option(
+            "--trace-speedup",
+            type=float,
+            default=1.0,
+            show_default=True,
+            help="Replay the query trace this many times faster than recorded for TraceReplayPerformanceCase",
+        ),
+    ]
+    trace_workers: Annotated[
+        int,
+        click.option(
+            "--trace-workers",
+            type=int,
+            default=8,
+            show_default=True,
+            help="Processes sending the trace queries for TraceReplayPerformanceCase",
+        ),
+    ]
+    warmup_duration: Annotated[
+        int,
+        click.option(
+            "--warmup-duration",
+            type=int,
+            default=config.WARMUP_DURATION,
+            show_default=True,
+            help="Seconds of warm-up searches before serial search and in each process of concurrent search, "
+            "excluded from the results. 0 to disable",
+        ),
+    ]
+    warmup_queries: Annotated[
+        int,
+        click.option(
+            "--warmup-queries",
+            type=int,
+            default=config.WARMUP_QUERIES,
+            show_default=True,
+            help="Number of warm-up searches before serial search and in each process of concurrent search, "
+            "excluded from the results. 0 to disable",
+        ),
+    ]
+    cold_cache_pass: Annotated[
+        bool,
+        click.option(
+            "--cold-cache-pass/--skip-cold-cache-pass",
+            type=bool,
+            default=False,
+            show_default=True,
+            help="Search the entire test data once right after loading, before any warm-up, "
+            "with the collection evicted from the caches of the database, and record it as cold-cache results. "
+            "For the clients that can evict it, like Milvus and PgVector",
+        ),
+    ]
+    search_repeats: Annotated[
+        int,
+        click.option(
+            "--search-repeats",
+            type=click.IntRange(min=1),
+            default=config.SEARCH_REPEATS,
+            show_default=True,
+            help="Repeat the search stages of performance cases over one load, "
+            "and record the mean, stddev and bootstrap confidence interval of qps, latency and recall",
+        ),
+    ]
+    explain_sample_rate: Annotated[
+        float,
+        click.option(
+            "--explain-sample-rate",
+            type=click.FloatRange(min=0, max=1, max_open=True),
+            default=config.EXPLAIN_SAMPLE_RATE,
+            show_default=True,
+            help="Fraction of serial searches run under EXPLAIN ANALYZE instead, for the clients that support it, "
+            "to record the buffer hits and reads, rows removed by filter and scan types of the searches. "
+            "Their latencies are left out of the serial latencies",
+        ),
+    ]
     custom_case_name: Annotated[
         str,
         click.option(
@@ -421,11 +620,22 @@ class CommonTypedDict(TypedDict):
         ),
     ]
     task_label: Annotated[str, click.option("--task-label", help="Task label")]
+    resume: Annotated[
+        str | None,
+        click.option(
+            "--resume",
+            type=str,
+            help="Run with this run_id and skip the cases already finished in its journal. "
+            "If the database still holds the collection loaded before the interruption, loading is skipped too",
+            default=None,
+        ),
+    ]
     dataset_with_size_type: Annotated[
         str,
         click.option(
             "--dataset-with-size-type",
-            help="Dataset with size type for NewIntFilterPerformanceCase, you can use Medium Cohere (768dim, 1M)|"
+            help="Dataset with size type for NewIntFilterPerformanceCase and MixedWorkloadPerformanceCase, "
+            "you can use Medium Cohere (768dim, 1M)|"
             "Large Cohere (768dim, 10M)|Medium Bioasq (1024dim, 1M)|Large Bioasq (1024dim, 10M)|"
             "Large OpenAI (1536dim, 5M)|Medium OpenAI (1536dim, 500K)",
             default="Medium Cohere (768dim, 1M)",
@@ -441,6 +651,51 @@ class CommonTypedDict(TypedDict):
             show_default=True,
         ),
     ]
+    insert_ratio: Annotated[
+        float,
+        click.option(
+            "--insert-ratio",
+            help="Share of re-insert operations for MixedWorkloadPerformanceCase",
+            default=0.05,
+            show_default=True,
+        ),
+    ]
+    delete_ratio: Annotated[
+        float,
+        click.option(
+            "--delete-ratio",
+            help="Share of delete operations for MixedWorkloadPerformanceCase",
+            default=0.05,
+            show_default=True,
+        ),
+    ]
+    upsert_ratio: Annotated[
+        float,
+        click.option(
+            "--upsert-ratio",
+            help="Share of upsert operations for MixedWorkloadPerformanceCase",
+            default=0.1,
+            show_default=True,
+        ),
+    ]
+    search_ratio: Annotated[
+        float,
+        click.option(
+            "--search-ratio",
+            help="Share of search operations for MixedWorkloadPerformanceCase",
+            default=0.8,
+            show_default=True,
+        ),
+    ]
+    churn_ratio: Annotated[
+        float,
+        click.option(
+            "--churn-ratio",
+            help="Fraction of the dataset that may be churned for MixedWorkloadPerformanceCase",
+            default=0.1,
+            show_default=True,
+        ),
+    ]
 
 
 class HNSWBaseTypedDict(TypedDict):
@@ -620,7 +875,22 @@ def run(
                 concurrency_duration=parameters["concurrency_duration"],
                 num_concurrency=[int(s) for s in parameters["num_concurrency"]],
                 concurrency_timeout=parameters["concurrency_timeout"],
+                query_distribution=parameters["query_distribution"],
+                zipf_skew=parameters["zipf_skew"],
+                hot_set_ratio=parameters["hot_set_ratio"],
+                hot_set_prob=parameters["hot_set_prob"],
+                query_trace_file=parameters["query_trace_file"],
+                num_agents=parameters["num_agents"],
+                cpu_pinning=parameters["cpu_pinning"],
+                reserved_cpus=parameters["reserved_cpus"],
+            ),
+            warmup_config=WarmupConfig(
+                warmup_duration=parameters["warmup_duration"],
+                warmup_queries=parameters["warmup_queries"],
+                cold_cache_pass=parameters["cold_cache_pass"],
             ),
+            search_repeats=parameters["search_repeats"],
+            explain_sample_rate=parameters["explain_sample_rate"],
             custom_case=get_custom_case_config(parameters),
         ),
         stages=parse_task_stages(
@@ -634,7 +904,10 @@ def run(
 
     log.info(f"Task:\n{pformat(task)}\n")
     if not parameters["dry_run"]:
-        benchmark_runner.run([task], task_label)
+        if collected_tasks is not None:
+            collected_tasks.append((task, task_label, parameters["resume"]))
+            return
+        benchmark_runner.run([task], task_label, parameters["resume"])
         time.sleep(5)
         if global_result_future:
             wait([global_result_future])
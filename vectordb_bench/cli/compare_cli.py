@@ -0,0 +1,123 @@
+import logging
+from pathlib import Path
+from typing import Annotated, TypedDict, Unpack
+
+import click
+
+from .. import config
+from ..backend.result_compare import Thresholds, compare_results, load_case_results
+from ..cli.cli import (
+    cli,
+    click_parameter_decorators_from_typed_dict,
+)
+from ..models import ResultLabel
+
+log = logging.getLogger(__name__)
+
+
+class CompareTypedDict(TypedDict):
+    baseline: Annotated[
+        str,
+        click.option("--baseline", type=str, required=True, help="run_id (or its prefix) or result directory"),
+    ]
+    target: Annotated[
+        str,
+        click.option("--target", type=str, required=True, help="run_id (or its prefix) or result directory"),
+    ]
+    results_dir: Annotated[
+        Path,
+        click.option(
+            "--results-dir",
+            type=click.Path(exists=True, file_okay=False, path_type=Path),
+            default=config.RESULTS_LOCAL_DIR,
+            show_default=True,
+            help="Where to look for the result files of run_ids",
+        ),
+    ]
+    max_qps_drop: Annotated[
+        float,
+        click.option("--max-qps-drop", type=float, default=Thresholds.max_qps_drop, show_default=True, help="%"),
+    ]
+    max_latency_increase: Annotated[
+        float,
+        click.option(
+            "--max-latency-increase",
+            type=float,
+            default=Thresholds.max_latency_increase,
+            show_default=True,
+            help="% of serial latency p99",
+        ),
+    ]
+    max_recall_drop: Annotated[
+        float,
+        click.option(
+            "--max-recall-drop",
+            type=float,
+            default=Thresholds.max_recall_drop,
+            show_default=True,
+            help="absolute",
+        ),
+    ]
+    max_load_duration_increase: Annotated[
+        float,
+        click.option(
+            "--max-load-duration-increase",
+            type=float,
+            default=Thresholds.max_load_duration_increase,
+            show_default=True,
+            help="%",
+        ),
+    ]
+
+
+@cli.command()
+@click_parameter_decorators_from_typed_dict(CompareTypedDict)
+def Compare(**parameters: Unpack[CompareTypedDict]):
+    """Compare the cases of two runs, exit with 1 if any metric regresses beyond its threshold,
+    a case of the baseline failed or is missing in the target, or no case matched at all.
+
+    Significance is tested on the repeated search samples (--search-repeats) when both runs have them.
+    """
+    thresholds = Thresholds(
+        max_qps_drop=parameters["max_qps_drop"],
+        max_latency_increase=parameters["max_latency_increase"],
+        max_recall_drop=parameters["max_recall_drop"],
+        max_load_duration_increase=parameters["max_load_duration_increase"],
+    )
+    try:
+        baseline = load_case_results(parameters["baseline"], parameters["results_dir"])
+        target = load_case_results(parameters["target"], parameters["results_dir"])
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+    comparisons, unmatched = compare_results(baseline, target, thresholds)
+
+    fmt = [f"Compare baseline={parameters['baseline']} target={parameters['target']}, {thresholds}"]
+    for c in comparisons:
+        fmt.append(f"{'REGRESSION' if c.regression else 'ok':10} {c.name}")
+        if c.target_label is None:
+            fmt.append(f"{'!':>12} missing in the target")
+        elif c.target_label != ResultLabel.NORMAL:
+            fmt.append(f"{'!':>12} {c.target_label.name} in the target")
+        for d in c.deltas:
+            unit = "" if d.metric == "recall" else "%"
+            significance = {True: "significant", False: "not significant", None: "single sample"}[d.significant]
+            fmt.append(
+                f"{'!' if d.regression else ' ':>12} {d.metric:20} {d.baseline:>12} -> {d.target:<12} "
+                f"{d.change:+.4f}{unit} ({significance})"
+            )
+    fmt.extend(unmatched)
+
+    tmp_logger = logging.getLogger("no_color")
+    for f in fmt:
+        tmp_logger.info(f)
+
+    if not comparisons:
+        log.warning("No successful case of the baseline to compare")
+        raise SystemExit(1)
+
+    regressions = [c.name for c in comparisons if c.regression]
+    if regressions:
+        log.warning(f"{len(regressions)}/{len(comparisons)} cases regressed: {regressions}")
+        raise SystemExit(1)
+    log.info(f"No regression in {len(comparisons)} matched cases")
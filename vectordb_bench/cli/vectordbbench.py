@@ -22,8 +22,10 @@ from ..backend.clients.vald.cli import Vald
 from ..backend.clients.vespa.cli import Vespa
 from ..backend.clients.weaviate_cloud.cli import Weaviate
 from ..backend.clients.zilliz_cloud.cli import ZillizAutoIndex
+from .agent_cli import Agent
 from .batch_cli import BatchCli
 from .cli import cli
+from .compare_cli import Compare
 
 cli.add_command(PgVectorHNSW)
 cli.add_command(PgVectoRSHNSW)
@@ -52,6 +54,8 @@ cli.add_command(QdrantLocal)
 cli.add_command(Vald)
 cli.add_command(BatchCli)
 cli.add_command(S3Vectors)
+cli.add_command(Agent)
+cli.add_command(Compare)
 
 
 if __name__ == "__main__":
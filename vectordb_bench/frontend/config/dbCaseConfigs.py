@@ -1553,6 +1553,13 @@ CaseConfigParamInput_Milvus_use_partition_key = CaseConfigInput(
     inputHelp="whether to use partition_key for label-filter cases. only works in label-filter cases",
     inputConfig={"options": [False, True]},
 )
+CaseConfigParamInput_Milvus_partition_key_isolation = CaseConfigInput(
+    label=CaseConfigParamType.partition_key_isolation,
+    inputType=InputType.Option,
+    inputHelp="build an index per partition key, searched alone by the label filters. only works in label-filter cases",
+    inputConfig={"options": [False, True]},
+    isDisplayed=lambda config: config.get(CaseConfigParamType.use_partition_key, False),
+)
 
 
 CaseConfigParamInput_MongoDBQuantizationType = CaseConfigInput(
@@ -1721,6 +1728,7 @@ MilvusLoadConfig = [
     CaseConfigParamInput_RefineType,
     CaseConfigParamInput_NRQ,
     CaseConfigParamInput_Milvus_use_partition_key,
+    CaseConfigParamInput_Milvus_partition_key_isolation,
 ]
 MilvusPerformanceConfig = [
     CaseConfigParamInput_IndexType,
@@ -1749,6 +1757,7 @@ MilvusPerformanceConfig = [
     CaseConfigParamInput_RefineType,
     CaseConfigParamInput_RefineK,
     CaseConfigParamInput_Milvus_use_partition_key,
+    CaseConfigParamInput_Milvus_partition_key_isolation,
 ]
 
 WeaviateLoadConfig = [
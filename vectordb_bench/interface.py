@@ -8,14 +8,17 @@ import uuid
 from collections.abc import Callable
 from enum import Enum
 from multiprocessing.connection import Connection
+from queue import Queue
 
 import psutil
 
 from . import config
-from .backend.assembler import Assembler, FilterNotSupportedError
+from .backend.assembler import Assembler, DeleteNotSupportedError, FilterNotSupportedError
+from .backend.cpu_affinity import pin_current_process, split_cpus
 from .backend.data_source import DatasetSource
+from .backend.journal import RunJournal
 from .backend.result_collector import ResultCollector
-from .backend.task_runner import TaskRunner
+from .backend.task_runner import CaseRunner, TaskRunner
 from .metric import Metric
 from .models import (
     CaseResult,
@@ -44,6 +47,8 @@ class BenchMarkRunner:
         self.latest_error: str | None = None
         self.receive_conn: Connection | None = None
         self.drop_old: bool = True
+        self.case_parallelism: int = config.CASE_PARALLELISM
+        self.cpus_per_case: int = config.CPUS_PER_CASE
         # set default data source by ENV
         if config.DATASET_SOURCE.upper() == "ALIYUNOSS":
             self.dataset_source: DatasetSource = DatasetSource.AliyunOSS
@@ -53,14 +58,22 @@ class BenchMarkRunner:
     def set_drop_old(self, drop_old: bool):
         self.drop_old = drop_old
 
+    def set_case_parallelism(self, case_parallelism: int, cpus_per_case: int = 0):
+        """run cases on up to `case_parallelism` different databases at the same time"""
+        self.case_parallelism = case_parallelism
+        self.cpus_per_case = cpus_per_case
+
     def set_download_address(self, use_aliyun: bool):
         if use_aliyun:
             self.dataset_source = DatasetSource.AliyunOSS
         else:
             self.dataset_source = DatasetSource.S3
 
-    def run(self, tasks: list[TaskConfig], task_label: str | None = None) -> bool:
-        """run all the tasks in the configs, write one result into the path"""
+    def run(self, tasks: list[TaskConfig], task_label: str | None = None, resume_run_id: str | None = None) -> bool:
+        """run all the tasks in the configs, write one result into the path
+
+        With `resume_run_id`, the run reuses the run_id and skips the cases already finished in its journal.
+        """
         self.latest_error = ""
         # Consume any pending success/error signals so completed runs get cleared
         self._try_get_signal()
@@ -75,8 +88,12 @@ class BenchMarkRunner:
         log.debug(f"tasks: {tasks}, task_label: {task_label}, dataset source: {self.dataset_source}")
 
         # Generate run_id
-        run_id = uuid.uuid4().hex
-        log.info(f"generated uuid for the tasks: {run_id}")
+        if resume_run_id:
+            run_id = resume_run_id
+            log.info(f"resume the tasks of run: {run_id}")
+        else:
+            run_id = uuid.uuid4().hex
+            log.info(f"generated uuid for the tasks: {run_id}")
         task_label = task_label if task_label else run_id
 
         self.receive_conn, send_conn = mp.Pipe()
@@ -95,7 +112,7 @@ class BenchMarkRunner:
             log.warning(msg)
             self.latest_error = msg
             return True
-        except FilterNotSupportedError as e:
+        except (FilterNotSupportedError, DeleteNotSupportedError) as e:
             log.warning(e.args[0])
             self.latest_error = e.args[0]
             return True
@@ -168,54 +185,29 @@ class BenchMarkRunner:
             if not running_task:
                 return
 
-            c_results = []
-            latest_runner, cached_load_duration = None, None
-            for idx, runner in enumerate(running_task.case_runners):
-                case_res = CaseResult(
-                    metrics=Metric(),
-                    task_config=runner.config,
-                )
-
-                drop_old = TaskStage.DROP_OLD in runner.config.stages
-                if (latest_runner and runner == latest_runner) or not self.drop_old:
-                    drop_old = False
-                num_cases = running_task.num_cases()
-                try:
-                    log.info(f"[{idx+1}/{num_cases}] start case: {runner.display()}, drop_old={drop_old}")
-                    case_res.metrics = runner.run(drop_old)
-                    log.info(
-                        f"[{idx+1}/{num_cases}] finish case: {runner.display()}, "
-                        f"result={case_res.metrics}, label={case_res.label}"
-                    )
-
-                    # cache the latest succeeded runner
-                    latest_runner = runner
+            journal = RunJournal(running_task.run_id)
+            finished = journal.finished([r.config for r in running_task.case_runners])
+            if finished:
+                log.info(f"{len(finished)} cases already finished in journal {journal.path}")
 
-                    # cache the latest drop_old=True load_duration of the latest succeeded runner
-                    cached_load_duration = case_res.metrics.load_duration if drop_old else cached_load_duration
-
-                    # use the cached load duration if this case didn't drop the existing collection
-                    if not drop_old:
-                        case_res.metrics.load_duration = cached_load_duration if cached_load_duration else 0.0
-                except (LoadTimeoutError, PerformanceTimeoutError) as e:
-                    log.warning(f"[{idx+1}/{num_cases}] case {runner.display()} failed to run, reason={e}")
-                    case_res.label = ResultLabel.OUTOFRANGE
-                    continue
-
-                except Exception as e:
-                    log.warning(f"[{idx+1}/{num_cases}] case {runner.display()} failed to run, reason={e}")
-                    traceback.print_exc()
-                    case_res.label = ResultLabel.FAILED
-                    continue
-
-                finally:
-                    c_results.append(case_res)
-                    send_conn.send((SIGNAL.WIP, idx))
+            num_cases = running_task.num_cases()
+            indexed_runners = list(enumerate(running_task.case_runners))
+            targets = group_by_target(indexed_runners)
+            if self.case_parallelism > 1 and len(targets) > 1:
+                c_results = self._run_targets_in_parallel(targets, num_cases, journal, send_conn)
+            else:
+                c_results = run_cases(
+                    indexed_runners,
+                    num_cases,
+                    journal,
+                    self.drop_old,
+                    progress=lambda idx: send_conn.send((SIGNAL.WIP, idx)),
+                )
 
             test_result = TestResult(
                 run_id=running_task.run_id,
                 task_label=running_task.task_label,
-                results=c_results,
+                results=[case_res for _, case_res in sorted(c_results, key=lambda r: r[0])],
             )
             test_result.display()
             test_result.flush()
@@ -234,6 +226,54 @@ class BenchMarkRunner:
             send_conn.close()
             return
 
+    def _run_targets_in_parallel(
+        self,
+        targets: list[list[tuple[int, CaseRunner]]],
+        num_cases: int,
+        journal: RunJournal,
+        send_conn: Connection,
+    ) -> list[tuple[int, CaseResult]]:
+        """Run the cases of each database target in its own process, at most `case_parallelism` at a time.
+
+        Each running target holds a disjoint slice of cpus, its search processes inherit the affinity,
+        so that the load generators of different targets don't contend for the same cores.
+        """
+        parallelism = min(self.case_parallelism, len(targets))
+        cpu_slices = split_cpus(parallelism, self.cpus_per_case)
+        log.info(f"run {len(targets)} database targets in parallel={parallelism}, cpu slices={cpu_slices}")
+
+        c_results = []
+        with mp.Manager() as m:
+            progress, cpu_slots = m.Queue(), m.Queue()
+            for cpus in cpu_slices:
+                cpu_slots.put(cpus)
+
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=parallelism,
+                mp_context=mp.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        run_target_cases,
+                        runners,
+                        num_cases,
+                        journal,
+                        self.drop_old,
+                        progress,
+                        cpu_slots,
+                    )
+                    for runners in targets
+                ]
+                not_done = set(futures)
+                while not_done:
+                    _, not_done = concurrent.futures.wait(not_done, timeout=1)
+                    while not progress.empty():
+                        send_conn.send((SIGNAL.WIP, progress.get()))
+
+                for f in futures:
+                    c_results.extend(f.result())
+        return c_results
+
     def _clear_running_task(self):
         global global_result_future
         global_result_future = None
@@ -289,4 +329,108 @@ class BenchMarkRunner:
             p.kill()
 
 
+def group_by_target(indexed_runners: list[tuple[int, CaseRunner]]) -> list[list[tuple[int, CaseRunner]]]:
+    """group the cases by the database instance they run on, keeping the order of cases in each group"""
+    targets = {}
+    for idx, runner in indexed_runners:
+        targets.setdefault(RunJournal.target_key(runner.config), []).append((idx, runner))
+    return list(targets.values())
+
+
+def run_cases(
+    indexed_runners: list[tuple[int, CaseRunner]],
+    num_cases: int,
+    journal: RunJournal,
+    drop_old_enabled: bool,
+    progress: Callable[[int], None],
+) -> list[tuple[int, CaseResult]]:
+    """Run the cases one by one, reusing the loaded collection of the previous case when possible.
+
+    Returns:
+        list[tuple[int, CaseResult]]: index of the case in the task and its result
+    """
+    finished = journal.finished([runner.config for _, runner in indexed_runners])
+    c_results = []
+    started_targets = set()
+    latest_runner, cached_load_duration = None, None
+    for idx, runner in indexed_runners:
+        case_key = journal.case_key(runner.config)
+        if case_key in finished:
+            log.info(f"[{idx+1}/{num_cases}] skip finished case: {runner.display()}")
+            c_results.append((idx, finished[case_key]))
+            progress(idx)
+            continue
+
+        case_res = CaseResult(
+            metrics=Metric(),
+            task_config=runner.config,
+        )
+
+        drop_old = TaskStage.DROP_OLD in runner.config.stages
+        target = journal.target_key(runner.config)
+        if (latest_runner and runner == latest_runner) or not drop_old_enabled:
+            drop_old = False
+        elif drop_old and target not in started_targets:
+            # the collection in the database is only known before the first resumed case on it starts
+            loaded = journal.loaded(runner.config)
+            if loaded and runner.holds_collection_of(loaded.task_config) and runner.dataset_loaded():
+                log.info(f"[{idx+1}/{num_cases}] reuse the collection loaded before resuming, skip loading")
+                drop_old = False
+                cached_load_duration = loaded.metrics.load_duration
+
+        started_targets.add(target)
+        journal.start(runner.config, drop_old)
+        try:
+            log.info(f"[{idx+1}/{num_cases}] start case: {runner.display()}, drop_old={drop_old}")
+            case_res.metrics = runner.run(drop_old)
+            log.info(
+                f"[{idx+1}/{num_cases}] finish case: {runner.display()}, "
+                f"result={case_res.metrics}, label={case_res.label}"
+            )
+
+            # cache the latest succeeded runner
+            latest_runner = runner
+
+            # cache the latest drop_old=True load_duration of the latest succeeded runner
+            cached_load_duration = case_res.metrics.load_duration if drop_old else cached_load_duration
+
+            # use the cached load duration if this case didn't drop the existing collection
+            if not drop_old:
+                case_res.metrics.load_duration = cached_load_duration if cached_load_duration else 0.0
+        except (LoadTimeoutError, PerformanceTimeoutError) as e:
+            log.warning(f"[{idx+1}/{num_cases}] case {runner.display()} failed to run, reason={e}")
+            case_res.label = ResultLabel.OUTOFRANGE
+            continue
+
+        except Exception as e:
+            log.warning(f"[{idx+1}/{num_cases}] case {runner.display()} failed to run, reason={e}")
+            traceback.print_exc()
+            case_res.label = ResultLabel.FAILED
+            continue
+
+        finally:
+            c_results.append((idx, case_res))
+            journal.finish(case_res)
+            progress(idx)
+    return c_results
+
+
+def run_target_cases(
+    indexed_runners: list[tuple[int, CaseRunner]],
+    num_cases: int,
+    journal: RunJournal,
+    drop_old_enabled: bool,
+    progress: Queue,
+    cpu_slots: Queue,
+) -> list[tuple[int, CaseResult]]:
+    """run the cases of one database target pinned to a free cpu slice, in a process of its own"""
+    cpus = cpu_slots.get()
+    try:
+        pin_current_process(cpus)
+        log.info(f"run {len(indexed_runners)} cases of {indexed_runners[0][1].config.db_name} on cpus {cpus}")
+        return run_cases(indexed_runners, num_cases, journal, drop_old_enabled, progress.put)
+    finally:
+        cpu_slots.put(cpus)
+
+
 benchmark_runner = BenchMarkRunner()
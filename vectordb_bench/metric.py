@@ -12,11 +12,18 @@ class Metric:
 
     # for load cases
     max_load_count: int = 0
+    cap_load_count_list: list[int] = field(default_factory=list)  # loaded count after each round, last may be partial
+    cap_elapsed_time_list: list[float] = field(default_factory=list)
+    cap_insert_throughput_list: list[float] = field(default_factory=list)  # rows/s of each round
 
     # for both performace and streaming cases
     insert_duration: float = 0.0
     optimize_duration: float = 0.0
     load_duration: float = 0.0  # insert + optimize
+    index_build_phases: dict[str, float] = field(default_factory=dict)  # seconds of each phase, if reported
+    index_build_tuples_per_sec: float = 0.0
+    bulk_import_duration: float = 0.0  # of the bulk import of the loaded data, for clients that load that way
+    bulk_import_rows_per_sec: float = 0.0
 
     # for performance cases
     qps: float = 0.0
@@ -31,6 +38,18 @@ class Metric:
     conc_latency_p90_list: list[float] = field(default_factory=list)
     conc_latency_avg_list: list[float] = field(default_factory=list)
     conc_recall_list: list[float] = field(default_factory=list)
+    cpu_affinity_layout: list[list[int]] = field(default_factory=list)  # pinned cpus of each search process
+    conc_cpu_util_list: list[list[float]] = field(default_factory=list)  # client per-core utilization(%)
+    conc_replica_qps_list: list[dict[str, float]] = field(default_factory=list)  # qps served by each replica
+    # EXPLAIN ANALYZE of a sample of the serial searches, see `query_plan.summarize_plans`
+    search_plan_stats: dict[str, float] = field(default_factory=dict)
+    search_plan_scan_types: dict[str, int] = field(default_factory=dict)
+
+    # for performance cases with a cold-cache pass, searched once right after loading and evicting the
+    # collection from the caches of the database, before any warm-up
+    cold_recall: float = 0.0
+    cold_serial_latency_p99: float = 0.0
+    cold_serial_latency_p95: float = 0.0
 
     # for streaming cases
     st_ideal_insert_duration: int = 0
@@ -43,6 +62,46 @@ class Metric:
     st_serial_latency_p95_list: list[float] = field(default_factory=list)
     st_conc_failed_rate_list: list[float] = field(default_factory=list)
 
+    # for mixed-workload cases, one item per concurrency
+    mixed_conc_num_list: list[int] = field(default_factory=list)
+    mixed_qps_list: list[float] = field(default_factory=list)
+    mixed_latency_p99_list: list[float] = field(default_factory=list)
+    mixed_insert_count_list: list[int] = field(default_factory=list)
+    mixed_delete_count_list: list[int] = field(default_factory=list)
+    mixed_upsert_count_list: list[int] = field(default_factory=list)
+    mixed_failed_rate_list: list[float] = field(default_factory=list)
+    mixed_recall_list: list[float] = field(default_factory=list)  # recall against the live (non-deleted) neighbors
+    mixed_deleted_hit_rate_list: list[float] = field(default_factory=list)  # share of results already deleted
+
+    # for trace replay cases, latency is measured from the actual send time, response time from the scheduled time
+    trace_num_queries: int = 0
+    trace_speedup: float = 1.0
+    trace_latency_avg: float = 0.0
+    trace_latency_p99: float = 0.0
+    trace_latency_p95: float = 0.0
+    trace_response_time_p99: float = 0.0
+    trace_deviation_avg: float = 0.0  # how late queries are sent compared to the schedule
+    trace_deviation_p99: float = 0.0
+    trace_failed_rate: float = 0.0
+    trace_result_file: str = ""  # per-request results
+
+    # for performance cases with repeated search stages over one load, one item per repetition.
+    # the point values above are from the first repetition
+    repeat_qps_list: list[float] = field(default_factory=list)
+    repeat_serial_latency_p99_list: list[float] = field(default_factory=list)
+    repeat_serial_latency_p95_list: list[float] = field(default_factory=list)
+    repeat_recall_list: list[float] = field(default_factory=list)
+    # the concurrent latencies of each concurrency of conc_num_list, one list per repetition
+    repeat_conc_latency_p99_list: list[list[float]] = field(default_factory=list)
+    repeat_conc_latency_p95_list: list[list[float]] = field(default_factory=list)
+    repeat_conc_latency_p90_list: list[list[float]] = field(default_factory=list)
+    repeat_conc_latency_avg_list: list[list[float]] = field(default_factory=list)
+    repeat_stats: dict[str, dict[str, float]] = field(default_factory=dict)  # see `summarize_samples`
+
+    # client process tree resources by stage, see ResourceSampler
+    client_stats: dict[str, dict[str, float]] = field(default_factory=dict)
+    client_series: dict[str, dict[str, list[float]]] = field(default_factory=dict)  # one item per sample
+
 
 QURIES_PER_DOLLAR_METRIC = "QP$ (Quries per Dollar)"
 LOAD_DURATION_METRIC = "load_duration"
@@ -76,6 +135,70 @@ metric_order = [
 ]
 
 
+REPEATED_METRICS = [
+    QPS_METRIC,
+    SERIAL_LATENCY_P99_METRIC,
+    SERIAL_LATENCY_P95_METRIC,
+    RECALL_METRIC,
+]
+
+# metrics with one value per concurrency, their repeat_stats are keyed by "<metric>@<concurrency>"
+REPEATED_CONC_METRICS = [
+    "conc_latency_p99",
+    "conc_latency_p95",
+    "conc_latency_p90",
+    "conc_latency_avg",
+]
+
+
+def bootstrap_ci(
+    samples: list[float],
+    confidence: float = 0.95,
+    n_resamples: int = 1000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """percentile bootstrap confidence interval of the mean of samples"""
+    values = np.asarray(samples, dtype=np.float64)
+    if len(values) < 2:
+        mean = float(values.mean()) if len(values) else 0.0
+        return mean, mean
+    rng = np.random.default_rng(seed)
+    means = rng.choice(values, size=(n_resamples, len(values)), replace=True).mean(axis=1)
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(means, alpha)), float(np.quantile(means, 1 - alpha))
+
+
+def bootstrap_diff_ci(
+    baseline: list[float],
+    target: list[float],
+    confidence: float = 0.95,
+    n_resamples: int = 1000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """percentile bootstrap confidence interval of mean(target) - mean(baseline)"""
+    a, b = np.asarray(baseline, dtype=np.float64), np.asarray(target, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    target_means = rng.choice(b, size=(n_resamples, len(b))).mean(axis=1)
+    baseline_means = rng.choice(a, size=(n_resamples, len(a))).mean(axis=1)
+    diffs = target_means - baseline_means
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(diffs, alpha)), float(np.quantile(diffs, 1 - alpha))
+
+
+def summarize_samples(samples: list[float], confidence: float = 0.95) -> dict[str, float]:
+    """mean, sample stddev and bootstrap confidence interval of the mean of repeated measurements"""
+    values = np.asarray(samples, dtype=np.float64)
+    ci_low, ci_high = bootstrap_ci(samples, confidence)
+    return {
+        "n": len(values),
+        "mean": round(float(values.mean()), 6),
+        "std": round(float(values.std(ddof=1)), 6) if len(values) > 1 else 0.0,
+        "ci_low": round(ci_low, 6),
+        "ci_high": round(ci_high, 6),
+        "confidence": confidence,
+    }
+
+
 def isLowerIsBetterMetric(metric: str) -> bool:
     return metric in lower_is_better_metrics
 
@@ -7,7 +7,9 @@ from typing import Self
 import ujson
 
 from vectordb_bench.backend.cases import type2case
+from vectordb_bench.backend.cpu_affinity import CPUPinning
 from vectordb_bench.backend.dataset import DatasetWithSizeMap
+from vectordb_bench.backend.query_sampler import QueryDistribution, QuerySampler
 
 from . import config
 from .backend.cases import Case, CaseType
@@ -121,6 +123,7 @@ class CaseConfigParamType(Enum):
     mongodb_quantization_type = "quantization"
     mongodb_num_candidates_ratio = "num_candidates_ratio"
     use_partition_key = "use_partition_key"
+    partition_key_isolation = "partition_key_isolation"
     refresh_interval = "refresh_interval"
     use_rescore = "use_rescore"
     oversample_ratio = "oversample_ratio"
@@ -143,6 +146,39 @@ class ConcurrencySearchConfig(BaseModel):
     num_concurrency: list[int] = config.NUM_CONCURRENCY
     concurrency_duration: int = config.CONCURRENCY_DURATION
     concurrency_timeout: int = config.CONCURRENCY_TIMEOUT
+    # how each search process picks its next test query, see QuerySampler
+    query_distribution: QueryDistribution = QueryDistribution.SEQUENTIAL
+    zipf_skew: float = 1.1
+    hot_set_ratio: float = 0.01
+    hot_set_prob: float = 0.9
+    query_trace_file: str | None = None
+    # > 0 to run the concurrent search on remote agents, num_concurrency is then the total over all agents
+    num_agents: int = 0
+    cpu_pinning: CPUPinning = CPUPinning.NONE
+    reserved_cpus: list[int] = []
+
+    def query_sampler(self) -> QuerySampler:
+        return QuerySampler(
+            distribution=self.query_distribution,
+            zipf_skew=self.zipf_skew,
+            hot_set_ratio=self.hot_set_ratio,
+            hot_set_prob=self.hot_set_prob,
+            trace_file=self.query_trace_file,
+        )
+
+
+class WarmupConfig(BaseModel):
+    """Warm-up searches run before serial and concurrent searches, excluded from the metrics.
+
+    warmup_duration and warmup_queries are limits, warm-up stops at whichever is reached first, 0 disables one.
+    cold_cache_pass evicts the collection from the caches of the database, see VectorDB.evict_cache, then runs
+    one serial search of the entire test data right after loading, before any warm-up, its results are recorded
+    in Metric.cold_*.
+    """
+
+    warmup_duration: int = config.WARMUP_DURATION
+    warmup_queries: int = config.WARMUP_QUERIES
+    cold_cache_pass: bool = False
 
 
 class CaseConfig(BaseModel):
@@ -152,6 +188,9 @@ class CaseConfig(BaseModel):
     custom_case: dict | None = None
     k: int | None = config.K_DEFAULT
     concurrency_search_config: ConcurrencySearchConfig = ConcurrencySearchConfig()
+    warmup_config: WarmupConfig = WarmupConfig()
+    search_repeats: int = config.SEARCH_REPEATS  # repetitions of the search stages of performance cases
+    explain_sample_rate: float = config.EXPLAIN_SAMPLE_RATE  # fraction of serial searches whose plan is sampled
 
     '''
     @property
@@ -292,6 +331,26 @@ class TestResult(BaseModel):
             case_config["custom_case"] = custom_case
         return case_config
 
+    @classmethod
+    def parse_task_config(cls, task_config: dict, full_path: pathlib.Path) -> dict:
+        """restore the db specific configs of a serialized TaskConfig"""
+        case_config = task_config.get("case_config")
+        db = DB(task_config.get("db"))
+
+        task_config["db_config"] = db.config_cls(**task_config["db_config"])
+
+        # Safely instantiate DBCaseConfig (fallback to EmptyDBCaseConfig on None)
+        raw_case_cfg = task_config.get("db_case_config") or {}
+        index_value = raw_case_cfg.get("index", None)
+        try:
+            task_config["db_case_config"] = db.case_config_cls(index_type=index_value)(**raw_case_cfg)
+        except Exception:
+            log.exception(f"Couldn't get class for index '{index_value}' ({full_path})")
+            task_config["db_case_config"] = EmptyDBCaseConfig(**raw_case_cfg)
+
+        task_config["case_config"] = cls.get_case_config(case_config=case_config)
+        return task_config
+
     @classmethod
     def read_file(cls, full_path: pathlib.Path, trans_unit: bool = False) -> Self:
         if not full_path.exists():
@@ -303,23 +362,7 @@ class TestResult(BaseModel):
             if "task_label" not in test_result:
                 test_result["task_label"] = test_result["run_id"]
             for case_result in test_result["results"]:
-                task_config = case_result.get("task_config")
-                case_config = task_config.get("case_config")
-                db = DB(task_config.get("db"))
-
-                task_config["db_config"] = db.config_cls(**task_config["db_config"])
-
-                # Safely instantiate DBCaseConfig (fallback to EmptyDBCaseConfig on None)
-                raw_case_cfg = task_config.get("db_case_config") or {}
-                index_value = raw_case_cfg.get("index", None)
-                try:
-                    task_config["db_case_config"] = db.case_config_cls(index_type=index_value)(**raw_case_cfg)
-                except Exception:
-                    log.exception(f"Couldn't get class for index '{index_value}' ({full_path})")
-                    task_config["db_case_config"] = EmptyDBCaseConfig(**raw_case_cfg)
-
-                task_config["case_config"] = cls.get_case_config(case_config=case_config)
-                case_result["task_config"] = task_config
+                case_result["task_config"] = cls.parse_task_config(case_result.get("task_config"), full_path)
 
                 if trans_unit:
                     cur_max_count = case_result["metrics"]["max_load_count"]
@@ -433,6 +476,21 @@ class TestResult(BaseModel):
                 ),
             )
 
+        repeated = [f for f in filtered_results if f.metrics.repeat_stats]
+        if repeated:
+            fmt.append("")
+            fmt.append("Search repetitions: mean ± stddev [confidence interval of the mean]")
+            for f in repeated:
+                stats = [
+                    f"{name}={st['mean']} ± {st['std']} [{st['ci_low']}, {st['ci_high']}]"
+                    for name, st in f.metrics.repeat_stats.items()
+                ]
+                n = int(max(st["n"] for st in f.metrics.repeat_stats.values()))
+                fmt.append(
+                    f"{f.task_config.db.name} | {f.task_config.db_config.db_label} "
+                    f"{f.task_config.case_config.case_name} | n={n}, {', '.join(stats)}"
+                )
+
         tmp_logger = logging.getLogger("no_color")
         for f in fmt:
             tmp_logger.info(f)